@@ -10,12 +10,18 @@ python check_data.py [-p, --problem] <problem_file_name> [-s, --solution] <solut
 * check a problem file
 * check a solution file
 * write summary.json, data_errors.txt, ignored_errors.txt, solution_errors.txt
+* data_errors.txt and solution_errors.txt have one JSON record per failed check, with at most max_errors_per_check failures
 * solution check does not check feasibility of the solution or compute objective
 * it is mainly about formatting
+
+python check_data.py [-b, --batch] <manifest_file_name> [-w, --workers] <num_workers> [-o, --output_dir] <output_dir>
+* check the problem/solution pairs listed in a manifest CSV file with columns problem, solution (optional), name (optional)
+* run the pairs on num_workers worker processes
+* write the output files of each pair to <output_dir>/<name>, and batch_summary.csv to <output_dir>
 '''
 
 import argparse, pathlib
-from datautilities import validation, utils
+from datautilities import validation, utils, batchcheck
 
 config_file = 'config.json'
 summary_csv_file = 'summary.csv'
@@ -52,6 +58,10 @@ if __name__ == '__main__':
     parser.add_argument("-i", "--ignored_errors", default=ignored_errors_file, help="Ignored errors output file")
     parser.add_argument("-u", "--solution_errors", default=solution_errors_file, help="Solution errors output file")
     parser.add_argument("-r", "--scrubbed_problem", default=None, help="File path name to write scrubbed problem file")
+    parser.add_argument("-b", "--batch", default=None, help="Manifest CSV file of problem/solution pairs to check - ignores the problem and solution arguments")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes for batch mode")
+    parser.add_argument("-o", "--output_dir", default="batch_output", help="Output directory for batch mode")
+    parser.add_argument("-a", "--batch_summary", default="batch_summary.csv", help="Batch summary output file in the output directory - CSV format")
 
     args = parser.parse_args()
 
@@ -63,7 +73,11 @@ if __name__ == '__main__':
     else:
         problem = args.problem_opt
 
-    if problem is not None:
+    if args.batch is not None:
+        batchcheck.check_data_batch(
+            args.batch, args.configuration, args.output_dir, args.workers, args.batch_summary,
+            [args.summary_csv, args.summary_json, args.data_errors, args.ignored_errors, args.solution_errors])
+    elif problem is not None:
         if args.scrubbed_problem is not None: # if scrubbing, ignore other arguments
             validation.scrub_data(problem, args.configuration, args.scrubbed_problem)
         else:
@@ -1,35 +1,527 @@
+import os, json, hashlib, tempfile, shutil, threading, importlib.metadata
+from multiprocessing import shared_memory
 import numpy
+from datautilities import utils
+from datautilities.errors import ModelError
+
+# compact dtypes for integer solution arrays, and the evaluator work arrays derived from them
+# on/off status values are 0 or 1, checked by the data model for solution files read through it
+# shunt steps are small integers
+status_dtype = numpy.int8
+shunt_step_dtype = numpy.int16
+
+def get_compact_int_array(values, dtype):
+    '''
+    integer array of values with dtype,
+    raising ModelError if a value is out of the range of dtype rather than silently wrapping
+    '''
+
+    arr = numpy.array(values, dtype=int)
+    info = numpy.iinfo(dtype)
+    if arr.size > 0 and (numpy.amin(arr) < info.min or numpy.amax(arr) > info.max):
+        raise ModelError('integer solution values out of range [{}, {}] of {}'.format(info.min, info.max, numpy.dtype(dtype).name))
+    return arr.astype(dtype)
+
+# version of the binary layout written by InputData.save
+# increment this when the layout or the set of InputData attributes changes
+input_data_format_version = 2
+
+def get_package_version():
+
+    try:
+        return importlib.metadata.version('C3DataUtilities')
+    except importlib.metadata.PackageNotFoundError:
+        return 'unknown'
+
+def get_file_hash(file_name):
+
+    h = hashlib.sha256()
+    with open(file_name, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def get_input_data_cached(problem_file, cache_dir, mmap=True):
+    '''
+    returns InputData for problem_file, from a binary cache in cache_dir if present,
+    otherwise built from the problem json and written to the cache.
+    the cache key is the hash of the problem file content, the package version, and the binary layout version.
+    the problem file is assumed to be valid.
+    '''
+
+    key = '{}_{}_{}'.format(get_file_hash(problem_file), get_package_version(), input_data_format_version)
+    path = os.path.join(cache_dir, key)
+    input_data = InputData()
+    if os.path.isdir(path):
+        input_data.load(path, mmap=mmap)
+        return input_data
+    with open(problem_file, 'r') as f:
+        input_data.set_from_json_dict(json.load(f))
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=cache_dir)
+    try:
+        input_data.save(tmp_path)
+        os.rename(tmp_path, path)
+    except OSError:
+        # another process wrote the same entry first
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return input_data
+
+# alignment of arrays in the shared memory block written by InputData.to_shared_memory
+shared_memory_alignment = 64
+
+def get_aligned_size(num_bytes):
+
+    return -(-num_bytes // shared_memory_alignment) * shared_memory_alignment
+
+def attach_shared_memory(name):
+
+    try:
+        # python >= 3.13. the block belongs to the process that created it
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # earlier versions register the block with the resource tracker,
+        # which is shared with the creating process when the workers are multiprocessing children
+        return shared_memory.SharedMemory(name=name)
+
+def get_json_column(items, key, dtype):
+    '''
+    array of the values of key over a list of json dicts
+    '''
+
+    return numpy.array([x[key] for x in items], dtype=dtype)
+
+def get_json_items_in_order(items, uids):
+    '''
+    reorder a list of json dicts to match uids
+    '''
+
+    data_map = {x['uid']:x for x in items}
+    return [data_map[i] for i in uids]
+
+# sections of InputData set after the structure, in build order,
+# with the other sections each one reads when it is built
+input_section_deps = {
+    'scalars': [],
+    'bus': [],
+    'sh': [],
+    'sd': [],
+    'acl': [],
+    'dcl': [],
+    'xfr': [],
+    'prz': ['bus', 'sd'],
+    'qrz': ['bus', 'sd'],
+    't': [],
+    'k': ['acl', 'dcl', 'xfr'],
+    'sd_t': [],
+    'sd_t_cost': ['sd'],
+    'prz_t': [],
+    'qrz_t': [],
+    }
+
+# attribute name prefixes of each section, checked in order, so more specific prefixes come first.
+# attributes set by the structure (num_*, *_uid, *_map, all_is_*, t_num) are always present
+input_section_attr_prefixes = [
+    ('sd_t_cost', ['sd_t_num_block', 'sd_t_block_']),
+    ('sd_t', ['sd_t_']),
+    ('prz_t', ['prz_t_']),
+    ('qrz_t', ['qrz_t_']),
+    ('scalars', ['c_']),
+    ('bus', ['bus_']),
+    ('sh', ['sh_']),
+    ('sd', ['sd_', 'pr_sd', 'cs_sd', 'num_pq']),
+    ('acl', ['acl_']),
+    ('dcl', ['dcl_']),
+    ('xfr', ['xfr_']),
+    ('prz', ['prz_']),
+    ('qrz', ['qrz_']),
+    ('t', ['t_']),
+    ('k', ['k_']),
+    ]
+
+def get_input_section(name):
+    '''
+    section of InputData setting attribute name, or None if not known
+    '''
+
+    for section, prefixes in input_section_attr_prefixes:
+        if any(name.startswith(i) for i in prefixes):
+            return section
+    return None
+
+# element types in the order of their uids in the uid table, i.e. in all_uid
+uid_comps = ['bus', 'acl', 'dcl', 'xfr', 'sh', 'sd', 'prz', 'qrz', 'k']
+
+def get_uid_buffer(uids):
+    '''
+    returns (buffer, ptr): the utf-8 encoded uids concatenated into one uint8 array,
+    with uid i in buffer[ptr[i]:ptr[i+1]]
+    '''
+
+    encoded = [i.encode('utf-8') for i in uids]
+    ptr = numpy.zeros(shape=(len(encoded) + 1, ), dtype=numpy.int64)
+    numpy.cumsum([len(i) for i in encoded], out=ptr[1:])
+    buffer = numpy.frombuffer(b''.join(encoded), dtype=numpy.uint8).copy()
+    return buffer, ptr
+
+class UidTable(object):
+    '''
+    interned uids of all elements, in all_uid order.
+    the code of a uid is its position in the table.
+    uid strings are decoded from the buffer only when looked up by code, e.g. for violation reports,
+    and the uid -> code dict is built on the first lookup by uid.
+    '''
+
+    def __init__(self, buffer, ptr):
+
+        self.buffer = buffer
+        self.ptr = ptr
+        self.codes = None
+
+    def __len__(self):
+
+        return self.ptr.size - 1
+
+    def get_uid(self, code):
+
+        return self.buffer[self.ptr[code]:self.ptr[code + 1]].tobytes().decode('utf-8')
+
+    def get_codes(self):
+
+        if self.codes is None:
+            data = self.buffer.tobytes()
+            ptr = self.ptr.tolist()
+            self.codes = {data[ptr[i]:ptr[i + 1]].decode('utf-8'):i for i in range(len(ptr) - 1)}
+        return self.codes
+
+class UidArray(object):
+    '''
+    uids of some elements of a UidTable, given by their codes.
+    indexing with an integer returns the uid string, indexing with anything else returns another UidArray
+    '''
+
+    def __init__(self, table, codes):
+
+        self.table = table
+        self.codes = codes
+
+    @property
+    def size(self):
+
+        return self.codes.size
+
+    def __len__(self):
+
+        return self.codes.size
+
+    def __getitem__(self, i):
+
+        if isinstance(i, (int, numpy.integer)):
+            return self.table.get_uid(self.codes[i])
+        return UidArray(self.table, self.codes[i])
+
+    def __iter__(self):
+
+        for i in self.codes:
+            yield self.table.get_uid(i)
+
+    def __array__(self, dtype=None):
+
+        return numpy.array(list(self), dtype=(str if dtype is None else dtype))
+
+    def tolist(self):
+
+        return list(self)
+
+class UidMap(object):
+    '''
+    uid -> index of the element among the num elements with codes start, start + 1, ... in a UidTable
+    '''
+
+    def __init__(self, table, start, num):
+
+        self.table = table
+        self.start = start
+        self.num = num
+
+    def __len__(self):
+
+        return self.num
+
+    def get(self, uid, default=None):
+
+        code = self.table.get_codes().get(uid)
+        if code is None or code < self.start or code >= self.start + self.num:
+            return default
+        return code - self.start
+
+    def __getitem__(self, uid):
+
+        i = self.get(uid)
+        if i is None:
+            raise KeyError(uid)
+        return i
+
+    def __contains__(self, uid):
+
+        return self.get(uid) is not None
 
 class InputData(object):
 
     def __init__(self):
         
         pass
+
+    def __getattr__(self, name):
+        '''
+        called only when name is not set.
+        if sections are pending from a lazy set_from_*, build the section of name, then look again
+        '''
+
+        lazy = self.__dict__.get('lazy')
+        if lazy is None or name.startswith('__') or len(lazy['pending']) == 0:
+            raise AttributeError("'InputData' object has no attribute '{}'".format(name))
+        section = get_input_section(name)
+        if section is None or section not in lazy['pending']:
+            # unknown attribute, or not set by its section - build everything before giving up
+            self.set_all_sections()
+        else:
+            self.set_section(section)
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            raise AttributeError("'InputData' object has no attribute '{}'".format(name)) from None
     
-    def set_from_data_model(self, data):
+    def set_from_data_model(self, data, lazy=False):
+        '''
+        lazy = False: set all sections now
+        lazy = True: set the structure now, and each other section on first access to one of its attributes,
+          along with the sections it depends on (see input_section_deps).
+          consumers that only touch e.g. bus and branch data do not pay for sd_t_cost or k.
+          data is kept until all sections are built.
+        '''
 
         self.set_structure(data)
-        self.set_scalars(data)
-        self.set_bus(data)
-        self.set_sh(data)
-        self.set_sd(data)
-        self.set_acl(data)
-        self.set_dcl(data)
-        self.set_xfr(data)
-        self.set_prz(data)
-        self.set_qrz(data)
-        self.set_t(data)
-        self.set_k(data)
-        self.set_sd_t(data)
-        self.set_sd_t_cost(data)
-        self.set_prz_t(data)
-        self.set_qrz_t(data)
+        self.set_sections(data, {i: getattr(self, 'set_{}'.format(i)) for i in input_section_deps.keys()}, lazy)
+
+    def set_sections(self, data, builders, lazy):
+        '''
+        builders[section] is the method setting section from data
+        '''
+
+        if not lazy:
+            for i in input_section_deps.keys():
+                builders[i](data)
+            return
+        self.lazy = {
+            'data': data,
+            'builders': builders,
+            'pending': set(builders.keys()),
+            'building': set(),
+            'lock': threading.RLock()}
+
+    def set_section(self, section):
+        '''
+        build a pending section and the pending sections it depends on.
+        safe to call from concurrent threads, e.g. eval steps running in parallel
+        '''
+
+        lazy = self.lazy
+        with lazy['lock']:
+            if section not in lazy['pending']:
+                return
+            if section in lazy['building']:
+                raise ValueError('InputData section {} read one of its own attributes before setting it'.format(section))
+            lazy['building'].add(section)
+            for i in input_section_deps[section]:
+                self.set_section(i)
+            lazy['builders'][section](lazy['data'])
+            lazy['building'].remove(section)
+            lazy['pending'].remove(section)
+            if len(lazy['pending']) == 0:
+                # drop the source data
+                lazy['data'] = None
+                lazy['builders'] = None
+
+    def set_all_sections(self):
+
+        lazy = self.__dict__.get('lazy')
+        if lazy is None:
+            return
+        with lazy['lock']:
+            for i in input_section_deps.keys():
+                self.set_section(i)
+
+    def get_flat_arrays(self):
+        '''
+        returns (manifest, arrays) describing self as a flat set of named arrays, as written by save and to_shared_memory
+
+        arrays are kept as is
+        lists of arrays (e.g. bus_prz_list) become the concatenated values and a pointer array
+        lists of lists of arrays (e.g. sd_t_block_c_list) are flattened to lists of arrays plus an outer pointer array
+        uid table, uid arrays, and uid maps are dropped - they are rebuilt from uid_buffer and uid_ptr by set_from_flat_arrays
+        '''
+
+        self.set_all_sections()
+        manifest = {
+            'format_version': input_data_format_version,
+            'package_version': get_package_version(),
+            'scalars': {},
+            'arrays': [],
+            'lists': [],
+            'nested_lists': []}
+        arrays = {}
+        for k, v in self.__dict__.items():
+            if k == 'shared_memory':
+                pass
+            elif isinstance(v, (UidTable, UidArray, UidMap)):
+                # rebuilt from uid_buffer and uid_ptr by set_from_flat_arrays
+                pass
+            elif isinstance(v, numpy.ndarray):
+                arrays[k] = v
+                manifest['arrays'].append(k)
+            elif isinstance(v, dict):
+                pass
+            elif isinstance(v, list) and all(isinstance(i, list) for i in v) and len(v) > 0:
+                outer_ptr = numpy.zeros(shape=(len(v) + 1, ), dtype=int)
+                numpy.cumsum([len(i) for i in v], out=outer_ptr[1:])
+                arrays['{}.outer_ptr'.format(k)] = outer_ptr
+                self.set_flat_list(arrays, k, [j for i in v for j in i])
+                manifest['nested_lists'].append(k)
+            elif isinstance(v, list):
+                self.set_flat_list(arrays, k, v)
+                manifest['lists'].append(k)
+            elif isinstance(v, (int, float, numpy.integer, numpy.floating)):
+                manifest['scalars'][k] = v.item() if isinstance(v, numpy.generic) else v
+            else:
+                raise ValueError('InputData cannot write attribute {} of type {}'.format(k, type(v)))
+        return manifest, arrays
+
+    def set_flat_list(self, arrays, name, values_list):
+
+        ptr = numpy.zeros(shape=(len(values_list) + 1, ), dtype=int)
+        numpy.cumsum([i.size for i in values_list], out=ptr[1:])
+        values = numpy.concatenate(values_list) if len(values_list) > 0 else numpy.zeros(shape=(0, ), dtype=float)
+        arrays['{}.ptr'.format(name)] = ptr
+        arrays['{}.values'.format(name)] = values
+
+    def set_from_flat_arrays(self, manifest, get_array, source):
+        '''
+        inverse of get_flat_arrays. get_array(name) returns the array with that name.
+        list elements are views into the values arrays
+        '''
+
+        if manifest['format_version'] != input_data_format_version:
+            raise ValueError('InputData format version {} in {} does not match current version {}'.format(
+                manifest['format_version'], source, input_data_format_version))
+        for k, v in manifest['scalars'].items():
+            setattr(self, k, v)
+        for k in manifest['arrays']:
+            setattr(self, k, get_array(k))
+        for k in manifest['lists']:
+            setattr(self, k, self.get_flat_list(get_array, k))
+        for k in manifest['nested_lists']:
+            outer_ptr = get_array('{}.outer_ptr'.format(k))
+            arrays = self.get_flat_list(get_array, k)
+            setattr(self, k, [arrays[outer_ptr[i]:outer_ptr[i + 1]] for i in range(outer_ptr.size - 1)])
+        self.set_map(None)
+
+    def get_flat_list(self, get_array, name):
+
+        ptr = get_array('{}.ptr'.format(name))
+        values = get_array('{}.values'.format(name))
+        return [values[ptr[i]:ptr[i + 1]] for i in range(ptr.size - 1)]
+
+    def save(self, path):
+        '''
+        write to directory path, one .npy file per array of get_flat_arrays and a manifest.json
+        '''
+
+        manifest, arrays = self.get_flat_arrays()
+        os.makedirs(path, exist_ok=True)
+        for k, v in arrays.items():
+            numpy.save(os.path.join(path, '{}.npy'.format(k)), v)
+        with open(os.path.join(path, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=4)
+
+    def load(self, path, mmap=True):
+        '''
+        read from directory path written by save
+        if mmap, arrays are read-only memory maps of the files, and list elements are views into them
+        '''
+
+        with open(os.path.join(path, 'manifest.json'), 'r') as f:
+            manifest = json.load(f)
+        mmap_mode = 'r' if mmap else None
+        self.set_from_flat_arrays(
+            manifest, (lambda k: numpy.load(os.path.join(path, '{}.npy'.format(k)), mmap_mode=mmap_mode)), path)
+
+    def to_shared_memory(self, name=None):
+        '''
+        copy the arrays of get_flat_arrays into one new shared memory block, preceded by the manifest.
+        returns the multiprocessing.shared_memory.SharedMemory block. pass block.name to attach in the workers.
+        the caller owns the block: call block.close() and block.unlink() when the workers are done.
+
+        layout: 8 byte manifest length, manifest json, then each array at an offset aligned to shared_memory_alignment.
+        the manifest lists [offset, dtype, shape] of each array under 'shared_arrays'
+        '''
+
+        manifest, arrays = self.get_flat_arrays()
+        manifest['shared_arrays'] = {}
+        offset = 0
+        for k, v in arrays.items():
+            if v.dtype.hasobject:
+                raise ValueError('InputData cannot put array {} of dtype {} in shared memory'.format(k, v.dtype))
+            manifest['shared_arrays'][k] = [offset, v.dtype.str, list(v.shape)]
+            offset += get_aligned_size(v.nbytes)
+        # array offsets are relative to the end of the header, which is only known once the manifest is written
+        manifest_bytes = json.dumps(manifest).encode('utf-8')
+        header_size = get_aligned_size(8 + len(manifest_bytes))
+        block = shared_memory.SharedMemory(name=name, create=True, size=header_size + max(offset, 1))
+        block.buf[0:8] = len(manifest_bytes).to_bytes(8, 'little')
+        block.buf[8:(8 + len(manifest_bytes))] = manifest_bytes
+        for k, v in arrays.items():
+            start, dtype, shape = manifest['shared_arrays'][k]
+            numpy.ndarray(shape=shape, dtype=dtype, buffer=block.buf, offset=(header_size + start))[...] = v
+        return block
+
+    def attach(self, name):
+        '''
+        set self from the shared memory block written by to_shared_memory, without copying.
+        arrays are read-only views into the block, which stays open as long as self does
+        '''
+
+        block = attach_shared_memory(name)
+        manifest_size = int.from_bytes(bytes(block.buf[0:8]), 'little')
+        manifest = json.loads(bytes(block.buf[8:(8 + manifest_size)]).decode('utf-8'))
+        header_size = get_aligned_size(8 + manifest_size)
+
+        def get_array(k):
+            start, dtype, shape = manifest['shared_arrays'][k]
+            arr = numpy.ndarray(shape=shape, dtype=dtype, buffer=block.buf, offset=(header_size + start))
+            arr.flags.writeable = False
+            return arr
+
+        self.set_from_flat_arrays(manifest, get_array, name)
+        self.shared_memory = block
+
+    def set_from_json_dict(self, data, lazy=False):
+        '''
+        set the same arrays as set_from_data_model, but directly from the decoded problem json dict,
+        without constructing the pydantic data model.
+        data is assumed to be valid, e.g. having passed InputDataFile validation in some other run.
+        lazy is as in set_from_data_model.
+        '''
+
+        self.set_structure_from_json_dict(data)
+        self.set_sections(
+            data, {i: getattr(self, 'set_{}_from_json_dict'.format(i)) for i in input_section_deps.keys()}, lazy)
 
     def set_structure(self, data):
 
         self.set_num(data)
         self.set_uid(data)
-        self.num_all = self.all_uid.size
+        self.num_all = self.uid_ptr.size - 1
         self.set_range(data)
         self.set_map(data)
         self.set_type_indicator(data)
@@ -52,90 +544,62 @@ class InputData(object):
     def set_uid(self, data):
 
         # establish an order of elements in each type
-        self.bus_uid = numpy.array([i.uid for i in data.network.bus], dtype=str)
-        self.acl_uid = numpy.array([i.uid for i in data.network.ac_line], dtype=str)
-        self.dcl_uid = numpy.array([i.uid for i in data.network.dc_line], dtype=str)
-        self.xfr_uid = numpy.array([i.uid for i in data.network.two_winding_transformer], dtype=str)
-        self.sh_uid = numpy.array([i.uid for i in data.network.shunt], dtype=str)
-        self.sd_uid = numpy.array([i.uid for i in data.network.simple_dispatchable_device], dtype=str)
-        self.pr_uid = numpy.array(
-            [i.uid for i in data.network.simple_dispatchable_device if i.device_type == 'producer'], dtype=str)
-        self.cs_uid = numpy.array(
-            [i.uid for i in data.network.simple_dispatchable_device if i.device_type == 'consumer'], dtype=str)
-        self.prz_uid = numpy.array([i.uid for i in data.network.active_zonal_reserve], dtype=str)
-        self.qrz_uid = numpy.array([i.uid for i in data.network.reactive_zonal_reserve], dtype=str)
-        self.k_uid = numpy.array([i.uid for i in data.reliability.contingency], dtype=str)
-        self.all_uid = numpy.concatenate((self.bus_uid,
-            self.acl_uid,
-            self.dcl_uid,
-            self.xfr_uid,
-            self.sh_uid,
-            self.sd_uid,
-            self.prz_uid,
-            self.qrz_uid,
-            self.k_uid))
+        sd = data.network.simple_dispatchable_device
+        self.set_uid_buffer(
+            [[i.uid for i in data.network.bus],
+             [i.uid for i in data.network.ac_line],
+             [i.uid for i in data.network.dc_line],
+             [i.uid for i in data.network.two_winding_transformer],
+             [i.uid for i in data.network.shunt],
+             [i.uid for i in sd],
+             [i.uid for i in data.network.active_zonal_reserve],
+             [i.uid for i in data.network.reactive_zonal_reserve],
+             [i.uid for i in data.reliability.contingency]],
+            [i.device_type for i in sd])
+
+    def set_uid_buffer(self, comp_uids, sd_device_type):
+        '''
+        comp_uids[j] is the list of uids of type uid_comps[j]
+        uid strings are held once, in uid_buffer. the uid arrays and maps are views set by set_map
+        '''
+
+        self.uid_buffer, self.uid_ptr = get_uid_buffer([i for j in comp_uids for i in j])
+        sd_start = sum([len(comp_uids[j]) for j in range(uid_comps.index('sd'))])
+        self.pr_uid_code = numpy.array(
+            [sd_start + i for i in range(len(sd_device_type)) if sd_device_type[i] == 'producer'], dtype=numpy.int32)
+        self.cs_uid_code = numpy.array(
+            [sd_start + i for i in range(len(sd_device_type)) if sd_device_type[i] == 'consumer'], dtype=numpy.int32)
 
     def set_range(self, data):
 
         # ranges
-        self.t_num = numpy.array(list(range(self.num_t)), dtype=int)
+        self.t_num = numpy.arange(self.num_t, dtype=int)
 
     def set_map(self, data):
 
-        # maps
-        self.bus_map = {self.bus_uid[i]:i for i in range(self.num_bus)}
-        self.acl_map = {self.acl_uid[i]:i for i in range(self.num_acl)}
-        self.dcl_map = {self.dcl_uid[i]:i for i in range(self.num_dcl)}
-        self.xfr_map = {self.xfr_uid[i]:i for i in range(self.num_xfr)}
-        self.sh_map = {self.sh_uid[i]:i for i in range(self.num_sh)}
-        self.sd_map = {self.sd_uid[i]:i for i in range(self.num_sd)}
-        self.prz_map = {self.prz_uid[i]:i for i in range(self.num_prz)}
-        self.qrz_map = {self.qrz_uid[i]:i for i in range(self.num_qrz)}
-        self.k_map = {self.k_uid[i]:i for i in range(self.num_k)}
-        self.all_map = {self.all_uid[i]:i for i in range(self.num_all)}
+        # uid arrays and maps, as views of the uid table
+        self.uid_table = UidTable(self.uid_buffer, self.uid_ptr)
+        start = 0
+        for comp in uid_comps:
+            num = getattr(self, 'num_{}'.format(comp))
+            setattr(self, '{}_uid'.format(comp), UidArray(self.uid_table, numpy.arange(start, start + num, dtype=numpy.int32)))
+            setattr(self, '{}_map'.format(comp), UidMap(self.uid_table, start, num))
+            start += num
+        self.pr_uid = UidArray(self.uid_table, self.pr_uid_code)
+        self.cs_uid = UidArray(self.uid_table, self.cs_uid_code)
+        self.all_uid = UidArray(self.uid_table, numpy.arange(self.num_all, dtype=numpy.int32))
+        self.all_map = UidMap(self.uid_table, 0, self.num_all)
 
     def set_type_indicator(self, data):
 
         # boolean type indicators
-        
         start = 0
-        end = 0
-
-        end += self.num_bus
-        self.all_is_bus = numpy.array([(start <= i and i < end) for i in range(self.num_all)], dtype=bool)
-        start += self.num_bus
-
-        end += self.num_acl
-        self.all_is_acl = numpy.array([(start <= i and i < end) for i in range(self.num_all)], dtype=bool)
-        start += self.num_acl
-
-        end += self.num_dcl
-        self.all_is_dcl = numpy.array([(start <= i and i < end) for i in range(self.num_all)], dtype=bool)
-        start += self.num_dcl
-
-        end += self.num_xfr
-        self.all_is_xfr = numpy.array([(start <= i and i < end) for i in range(self.num_all)], dtype=bool)
-        start += self.num_xfr
-
-        end += self.num_sh
-        self.all_is_sh = numpy.array([(start <= i and i < end) for i in range(self.num_all)], dtype=bool)
-        start += self.num_sh
-
-        end += self.num_sd
-        self.all_is_sd = numpy.array([(start <= i and i < end) for i in range(self.num_all)], dtype=bool)
-        start += self.num_sd
-
-        end += self.num_prz
-        self.all_is_prz = numpy.array([(start <= i and i < end) for i in range(self.num_all)], dtype=bool)
-        start += self.num_prz
-
-        end += self.num_qrz
-        self.all_is_qrz = numpy.array([(start <= i and i < end) for i in range(self.num_all)], dtype=bool)
-        start += self.num_qrz
-
-        end += self.num_k
-        self.all_is_k = numpy.array([(start <= i and i < end) for i in range(self.num_all)], dtype=bool)
-        start += self.num_k
+        for comp in uid_comps:
+            end = start + getattr(self, 'num_{}'.format(comp))
+            all_is_comp = numpy.zeros(shape=(self.num_all, ), dtype=bool)
+            all_is_comp[start:end] = True
+            setattr(self, 'all_is_{}'.format(comp), all_is_comp)
+            start = end
 
     def set_scalars(self, data):
 
@@ -190,42 +654,13 @@ class InputData(object):
         self.sd_p_shutdown_ramp_dn_max = numpy.array([data_map[i].p_shutdown_ramp_ub for i in self.sd_uid], dtype=float)
 
         # downtime-dependent startup cost data
-        startup_states = {i:sorted(data_map[i].startup_states, key=(lambda x: x[0])) for i in self.sd_uid} # sort startup states so that cost is increasing within each sd
-        self.sd_num_startup_state = numpy.array([len(startup_states[i]) for i in self.sd_uid], dtype=int)
-        self.sd_startup_state_d_max_list = [numpy.array([s[1] for s in startup_states[i]], dtype=float) for i in self.sd_uid]
-        self.sd_startup_state_c_list = [numpy.array([s[0] for s in startup_states[i]], dtype=float) for i in self.sd_uid]
-        #self.sd_startup_state_d_max = numpy.array([s[1] for i in self.sd_uid for s in startup_states[i]])
-        #self.sd_startup_state_c = numpy.array([s[0] for i in self.sd_uid for s in startup_states[i]])
-
-        # max startups constraint data
-        self.sd_num_max_startup_constr = numpy.array([len(data_map[i].startups_ub) for i in self.sd_uid], dtype=int)
-        self.sd_max_startup_constr_a_start_list = [
-            numpy.array([s[0] for s in data_map[i].startups_ub], dtype=float) for i in self.sd_uid]
-        self.sd_max_startup_constr_a_end_list = [
-            numpy.array([s[1] for s in data_map[i].startups_ub], dtype=float) for i in self.sd_uid]
-        self.sd_max_startup_constr_max_startup_list = [
-            numpy.array([s[2] for s in data_map[i].startups_ub], dtype=int) for i in self.sd_uid]
-        # self.sd_max_startup_constr_t_start_list = [
-        #     numpy.array([ for a in sd_max_startup_constr_a_start_list[i]])
-        #     for i in self.sd_uid]
-
-        # max energy constraint data
-        self.sd_num_max_energy_constr = numpy.array([len(data_map[i].energy_req_ub) for i in self.sd_uid], dtype=int)
-        self.sd_max_energy_constr_a_start_list = [
-            numpy.array([s[0] for s in data_map[i].energy_req_ub], dtype=float) for i in self.sd_uid]
-        self.sd_max_energy_constr_a_end_list = [
-            numpy.array([s[1] for s in data_map[i].energy_req_ub], dtype=float) for i in self.sd_uid]
-        self.sd_max_energy_constr_max_energy_list = [
-            numpy.array([s[2] for s in data_map[i].energy_req_ub], dtype=float) for i in self.sd_uid]
+        self.set_sd_startup_state([data_map[i].startup_states for i in self.sd_uid])
 
-        # min energy constraint data
-        self.sd_num_min_energy_constr = numpy.array([len(data_map[i].energy_req_lb) for i in self.sd_uid], dtype=int)
-        self.sd_min_energy_constr_a_start_list = [
-            numpy.array([s[0] for s in data_map[i].energy_req_lb], dtype=float) for i in self.sd_uid]
-        self.sd_min_energy_constr_a_end_list = [
-            numpy.array([s[1] for s in data_map[i].energy_req_lb], dtype=float) for i in self.sd_uid]
-        self.sd_min_energy_constr_min_energy_list = [
-            numpy.array([s[2] for s in data_map[i].energy_req_lb], dtype=float) for i in self.sd_uid]
+        # max startups, max energy, min energy constraint data
+        self.set_sd_multi_interval_constr(
+            [data_map[i].startups_ub for i in self.sd_uid],
+            [data_map[i].energy_req_ub for i in self.sd_uid],
+            [data_map[i].energy_req_lb for i in self.sd_uid])
 
         # prior state data
         self.sd_u_on_0 = numpy.array([data_map[i].initial_status.on_status for i in self.sd_uid], dtype=int)
@@ -238,13 +673,6 @@ class InputData(object):
         self.sd_is_pqe = numpy.array([data_map[i].q_linear_cap for i in self.sd_uid], dtype=int)
         self.sd_is_pqa = numpy.array([data_map[i].q_bound_cap for i in self.sd_uid], dtype=int)
         self.sd_is_pqi = numpy.array([data_map[i].q_bound_cap for i in self.sd_uid], dtype=int)
-        self.sd_is_pqae = self.sd_is_pqa + self.sd_is_pqe
-        self.sd_is_pqie = self.sd_is_pqi + self.sd_is_pqe
-        self.num_pqe = numpy.sum(self.sd_is_pqe)
-        self.num_pqa = numpy.sum(self.sd_is_pqa)
-        self.num_pqi = numpy.sum(self.sd_is_pqi)
-        self.num_pqae = numpy.sum(self.sd_is_pqae)
-        self.num_pqie = numpy.sum(self.sd_is_pqie)
 
         # reserves:
         self.sd_p_rgu_max = numpy.array([data_map[i].p_reg_res_up_ub for i in self.sd_uid], dtype=float)
@@ -269,6 +697,73 @@ class InputData(object):
             [data_map[i].beta_ub if data_map[i].q_bound_cap else 0.0 for i in self.sd_uid], dtype=float)
         self.sd_beta_pqi = numpy.array(
             [data_map[i].beta_lb if data_map[i].q_bound_cap else 0.0 for i in self.sd_uid], dtype=float)
+        self.set_sd_p_q()
+
+    def set_sd_startup_state(self, sd_startup_states):
+        '''
+        sd_startup_states[i] is the list of (cost, d_max) startup states of sd i
+        '''
+
+        startup_states = [sorted(i, key=(lambda x: x[0])) for i in sd_startup_states] # sort startup states so that cost is increasing within each sd
+        self.sd_num_startup_state = numpy.array([len(i) for i in startup_states], dtype=int)
+        self.sd_startup_state_d_max_list = [numpy.array([s[1] for s in i], dtype=float) for i in startup_states]
+        self.sd_startup_state_c_list = [numpy.array([s[0] for s in i], dtype=float) for i in startup_states]
+        #self.sd_startup_state_d_max = numpy.array([s[1] for i in self.sd_uid for s in startup_states[i]])
+        #self.sd_startup_state_c = numpy.array([s[0] for i in self.sd_uid for s in startup_states[i]])
+
+        # flattened startup state data for vectorized evaluation
+        # states of sd i are in positions sd_startup_state_ptr[i]:sd_startup_state_ptr[i+1], sorted so that d_max is increasing
+        # sd_startup_state_c_min[j] is the min cost over states of the same sd with d_max >= sd_startup_state_d_max[j]
+        self.sd_startup_state_ptr = numpy.zeros(shape=(self.num_sd + 1, ), dtype=int)
+        numpy.cumsum(self.sd_num_startup_state, out=self.sd_startup_state_ptr[1:])
+        self.sd_startup_state_d_max = numpy.zeros(shape=(self.sd_startup_state_ptr[-1], ), dtype=float)
+        self.sd_startup_state_c_min = numpy.zeros(shape=(self.sd_startup_state_ptr[-1], ), dtype=float)
+        for i in range(self.num_sd):
+            start = self.sd_startup_state_ptr[i]
+            end = self.sd_startup_state_ptr[i + 1]
+            perm = numpy.argsort(self.sd_startup_state_d_max_list[i], kind='stable')
+            self.sd_startup_state_d_max[start:end] = self.sd_startup_state_d_max_list[i][perm]
+            self.sd_startup_state_c_min[start:end] = numpy.minimum.accumulate(
+                self.sd_startup_state_c_list[i][perm][::-1])[::-1]
+
+    def set_sd_multi_interval_constr(self, sd_startups_ub, sd_energy_req_ub, sd_energy_req_lb):
+        '''
+        each argument is a list over sd of the lists of (a_start, a_end, max or min) tuples
+        '''
+
+        # max startups constraint data
+        self.sd_num_max_startup_constr = numpy.array([len(i) for i in sd_startups_ub], dtype=int)
+        self.sd_max_startup_constr_a_start_list = [numpy.array([s[0] for s in i], dtype=float) for i in sd_startups_ub]
+        self.sd_max_startup_constr_a_end_list = [numpy.array([s[1] for s in i], dtype=float) for i in sd_startups_ub]
+        self.sd_max_startup_constr_max_startup_list = [numpy.array([s[2] for s in i], dtype=int) for i in sd_startups_ub]
+        # self.sd_max_startup_constr_t_start_list = [
+        #     numpy.array([ for a in sd_max_startup_constr_a_start_list[i]])
+        #     for i in self.sd_uid]
+
+        # max energy constraint data
+        self.sd_num_max_energy_constr = numpy.array([len(i) for i in sd_energy_req_ub], dtype=int)
+        self.sd_max_energy_constr_a_start_list = [numpy.array([s[0] for s in i], dtype=float) for i in sd_energy_req_ub]
+        self.sd_max_energy_constr_a_end_list = [numpy.array([s[1] for s in i], dtype=float) for i in sd_energy_req_ub]
+        self.sd_max_energy_constr_max_energy_list = [numpy.array([s[2] for s in i], dtype=float) for i in sd_energy_req_ub]
+
+        # min energy constraint data
+        self.sd_num_min_energy_constr = numpy.array([len(i) for i in sd_energy_req_lb], dtype=int)
+        self.sd_min_energy_constr_a_start_list = [numpy.array([s[0] for s in i], dtype=float) for i in sd_energy_req_lb]
+        self.sd_min_energy_constr_a_end_list = [numpy.array([s[1] for s in i], dtype=float) for i in sd_energy_req_lb]
+        self.sd_min_energy_constr_min_energy_list = [numpy.array([s[2] for s in i], dtype=float) for i in sd_energy_req_lb]
+
+    def set_sd_p_q(self):
+        '''
+        combined p-q linking data, from the p-q indicators and optionals
+        '''
+
+        self.sd_is_pqae = self.sd_is_pqa + self.sd_is_pqe
+        self.sd_is_pqie = self.sd_is_pqi + self.sd_is_pqe
+        self.num_pqe = numpy.sum(self.sd_is_pqe)
+        self.num_pqa = numpy.sum(self.sd_is_pqa)
+        self.num_pqi = numpy.sum(self.sd_is_pqi)
+        self.num_pqae = numpy.sum(self.sd_is_pqae)
+        self.num_pqie = numpy.sum(self.sd_is_pqie)
         self.sd_q_p0_pqae = self.sd_q_p0_pqe + self.sd_q_p0_pqa
         self.sd_q_p0_pqie = self.sd_q_p0_pqe + self.sd_q_p0_pqi
         self.sd_beta_pqae = self.sd_beta_pqe + self.sd_beta_pqa
@@ -361,6 +856,13 @@ class InputData(object):
         self.prz_c_nsc = numpy.array([data_map[i].NSYN_vio_cost for i in self.prz_uid], dtype=float)
         self.prz_c_rru = numpy.array([data_map[i].RAMPING_RESERVE_UP_vio_cost for i in self.prz_uid], dtype=float)
         self.prz_c_rrd = numpy.array([data_map[i].RAMPING_RESERVE_DOWN_vio_cost for i in self.prz_uid], dtype=float)
+        self.set_prz_bus_sd()
+
+    def set_prz_bus_sd(self):
+        '''
+        buses and sds in each prz, from bus_prz_list
+        '''
+
         prz_bus_list = [[] for i in self.prz_uid]
         for i in range(self.num_bus):
             for j in self.bus_prz_list[i]:
@@ -379,6 +881,13 @@ class InputData(object):
         data_map = {x.uid:x for x in data.network.reactive_zonal_reserve}
         self.qrz_c_qru = numpy.array([data_map[i].REACT_UP_vio_cost for i in self.qrz_uid])
         self.qrz_c_qrd = numpy.array([data_map[i].REACT_DOWN_vio_cost for i in self.qrz_uid])
+        self.set_qrz_bus_sd()
+
+    def set_qrz_bus_sd(self):
+        '''
+        buses and sds in each qrz, from bus_qrz_list
+        '''
+
         qrz_bus_list = [[] for i in self.qrz_uid]
         for i in range(self.num_bus):
             for j in self.bus_qrz_list[i]:
@@ -395,6 +904,10 @@ class InputData(object):
     def set_t(self, data):
 
         self.t_d = numpy.array(data.time_series_input.general.interval_duration, dtype=float)
+        self.set_t_a()
+
+    def set_t_a(self):
+
         self.t_a_end = numpy.cumsum(self.t_d)
         self.t_a_start = numpy.zeros(shape=(self.num_t, ), dtype=float)
         self.t_a_start[1:self.num_t] = self.t_a_end[0:(self.num_t - 1)]
@@ -402,31 +915,27 @@ class InputData(object):
 
     def set_k(self, data):
 
-        k_out_device_uid = numpy.array([k.components[0] for k in data.reliability.contingency])
-        self.k_out_device = numpy.array([self.all_map[k_out_device_uid[i]] for i in range(self.num_k)], dtype=int)
-        self.k_out_is_acl = numpy.array([self.all_is_acl[self.k_out_device[i]] for i in range(self.num_k)], dtype=int)
-        self.k_out_is_dcl = numpy.array([self.all_is_dcl[self.k_out_device[i]] for i in range(self.num_k)], dtype=int)
-        self.k_out_is_xfr = numpy.array([self.all_is_xfr[self.k_out_device[i]] for i in range(self.num_k)], dtype=int)
-        self.k_out_acl = numpy.array(
-            [self.acl_map[k_out_device_uid[i]] if self.k_out_is_acl[i] else 0 for i in range(self.num_k)], dtype=int)
-        self.k_out_dcl = numpy.array(
-            [self.dcl_map[k_out_device_uid[i]] if self.k_out_is_dcl[i] else 0 for i in range(self.num_k)], dtype=int)
-        self.k_out_xfr = numpy.array(
-            [self.xfr_map[k_out_device_uid[i]] if self.k_out_is_xfr[i] else 0 for i in range(self.num_k)], dtype=int)
-        self.k_out_fbus_is_acl = numpy.array(
-            [self.acl_fbus[self.k_out_acl[i]] if self.k_out_is_acl[i] else 0 for i in range(self.num_k)], dtype=int)
-        self.k_out_tbus_is_acl = numpy.array(
-            [self.acl_tbus[self.k_out_acl[i]] if self.k_out_is_acl[i] else 0 for i in range(self.num_k)], dtype=int)
-        self.k_out_fbus_is_dcl = numpy.array(
-            [self.dcl_fbus[self.k_out_dcl[i]] if self.k_out_is_dcl[i] else 0 for i in range(self.num_k)], dtype=int)
-        self.k_out_tbus_is_dcl = numpy.array(
-            [self.dcl_tbus[self.k_out_dcl[i]] if self.k_out_is_dcl[i] else 0 for i in range(self.num_k)], dtype=int)
-        self.k_out_fbus_is_xfr = numpy.array(
-            [self.xfr_fbus[self.k_out_xfr[i]] if self.k_out_is_xfr[i] else 0 for i in range(self.num_k)], dtype=int)
-        self.k_out_tbus_is_xfr = numpy.array(
-            [self.xfr_tbus[self.k_out_xfr[i]] if self.k_out_is_xfr[i] else 0 for i in range(self.num_k)], dtype=int)
-        self.k_out_fbus = self.k_out_fbus_is_acl + self.k_out_fbus_is_dcl + self.k_out_fbus_is_xfr
-        self.k_out_tbus = self.k_out_tbus_is_acl + self.k_out_tbus_is_dcl + self.k_out_tbus_is_xfr
+        self.set_k_out([k.components[0] for k in data.reliability.contingency])
+
+    def set_k_out(self, k_out_device_uid):
+
+        self.k_out_device = numpy.array([self.all_map[i] for i in k_out_device_uid], dtype=int)
+        self.k_out_fbus = numpy.zeros(shape=(self.num_k, ), dtype=int)
+        self.k_out_tbus = numpy.zeros(shape=(self.num_k, ), dtype=int)
+        for comp in ['acl', 'dcl', 'xfr']:
+            k_out_is_comp = getattr(self, 'all_is_{}'.format(comp))[self.k_out_device]
+            k_out_comp = numpy.zeros(shape=(self.num_k, ), dtype=int)
+            k_out_comp[k_out_is_comp] = self.k_out_device[k_out_is_comp] - getattr(self, '{}_map'.format(comp)).start
+            k_out_fbus_is_comp = numpy.zeros(shape=(self.num_k, ), dtype=int)
+            k_out_fbus_is_comp[k_out_is_comp] = getattr(self, '{}_fbus'.format(comp))[k_out_comp[k_out_is_comp]]
+            k_out_tbus_is_comp = numpy.zeros(shape=(self.num_k, ), dtype=int)
+            k_out_tbus_is_comp[k_out_is_comp] = getattr(self, '{}_tbus'.format(comp))[k_out_comp[k_out_is_comp]]
+            setattr(self, 'k_out_is_{}'.format(comp), k_out_is_comp.astype(int))
+            setattr(self, 'k_out_{}'.format(comp), k_out_comp)
+            setattr(self, 'k_out_fbus_is_{}'.format(comp), k_out_fbus_is_comp)
+            setattr(self, 'k_out_tbus_is_{}'.format(comp), k_out_tbus_is_comp)
+            self.k_out_fbus += k_out_fbus_is_comp
+            self.k_out_tbus += k_out_tbus_is_comp
 
     def set_sd_t(self, data):
 
@@ -490,7 +999,14 @@ class InputData(object):
         '''
 
         data_map = {x.uid:x for x in data.time_series_input.simple_dispatchable_device}
-        cost_blocks = [data_map[i].cost for i in self.sd_uid]
+        self.set_sd_t_cost_blocks([data_map[i].cost for i in self.sd_uid])
+
+    def set_sd_t_cost_blocks(self, cost_blocks):
+        '''
+        cost_blocks[i][t] is the list of (c, p_max) cost blocks of sd i in interval t
+        '''
+
+        cost_blocks = list(cost_blocks)
         for i in range(self.num_sd): # negate the cost value for consumer blocks. keep producer blocks as is
             if self.sd_is_cs[i]:
                 cost_blocks[i] = [[((-1.0) * t_b_c[0], t_b_c[1]) for t_b_c in t_c] for t_c in cost_blocks[i]]
@@ -523,12 +1039,323 @@ class InputData(object):
             numpy.array([data_map[i].REACT_DOWN for i in self.qrz_uid], dtype=float),
             newshape=(self.num_qrz, self.num_t))
 
+    def set_structure_from_json_dict(self, data):
+
+        network = data['network']
+        sd = network['simple_dispatchable_device']
+        self.num_bus = len(network['bus'])
+        self.num_acl = len(network['ac_line'])
+        self.num_dcl = len(network['dc_line'])
+        self.num_xfr = len(network['two_winding_transformer'])
+        self.num_sh = len(network['shunt'])
+        self.num_sd = len(sd)
+        self.num_pr = len([i for i in sd if i['device_type'] == 'producer'])
+        self.num_cs = len([i for i in sd if i['device_type'] == 'consumer'])
+        self.num_prz = len(network['active_zonal_reserve'])
+        self.num_qrz = len(network['reactive_zonal_reserve'])
+        self.num_t = len(data['time_series_input']['general']['interval_duration'])
+        self.num_k = len(data['reliability']['contingency'])
+
+        self.set_uid_buffer(
+            [[x['uid'] for x in network['bus']],
+             [x['uid'] for x in network['ac_line']],
+             [x['uid'] for x in network['dc_line']],
+             [x['uid'] for x in network['two_winding_transformer']],
+             [x['uid'] for x in network['shunt']],
+             [x['uid'] for x in sd],
+             [x['uid'] for x in network['active_zonal_reserve']],
+             [x['uid'] for x in network['reactive_zonal_reserve']],
+             [x['uid'] for x in data['reliability']['contingency']]],
+            [x['device_type'] for x in sd])
+
+        self.num_all = self.uid_ptr.size - 1
+        self.set_range(data)
+        self.set_map(data)
+        self.set_type_indicator(data)
+
+    def set_scalars_from_json_dict(self, data):
+
+        violation_cost = data['network']['violation_cost']
+        self.c_p = float(violation_cost['p_bus_vio_cost'])
+        self.c_q = float(violation_cost['p_bus_vio_cost'])
+        self.c_s = float(violation_cost['s_vio_cost'])
+
+    def set_bus_from_json_dict(self, data):
+
+        items = data['network']['bus']
+        initial_status = [x['initial_status'] for x in items]
+        self.bus_v_max = get_json_column(items, 'vm_ub', float)
+        self.bus_v_min = get_json_column(items, 'vm_lb', float)
+        self.bus_v_0 = get_json_column(initial_status, 'vm', float)
+        self.bus_theta_0 = get_json_column(initial_status, 'va', float)
+        self.bus_num_prz = numpy.array([len(x['active_reserve_uids']) for x in items], dtype=int)
+        self.bus_prz_list = [numpy.array([self.prz_map[j] for j in x['active_reserve_uids']], dtype=int) for x in items]
+        self.bus_num_qrz = numpy.array([len(x['reactive_reserve_uids']) for x in items], dtype=int)
+        self.bus_qrz_list = [numpy.array([self.qrz_map[j] for j in x['reactive_reserve_uids']], dtype=int) for x in items]
+
+    def set_sh_from_json_dict(self, data):
+
+        items = data['network']['shunt']
+        self.sh_bus = numpy.array([self.bus_map[x['bus']] for x in items], dtype=int)
+        self.sh_g_st = get_json_column(items, 'gs', float)
+        self.sh_b_st = get_json_column(items, 'bs', float)
+        self.sh_u_st_max = get_json_column(items, 'step_ub', int)
+        self.sh_u_st_min = get_json_column(items, 'step_lb', int)
+        self.sh_u_st_0 = numpy.array([x['initial_status']['step'] for x in items], dtype=int)
+
+    def set_sd_from_json_dict(self, data):
+
+        items = data['network']['simple_dispatchable_device']
+        initial_status = [x['initial_status'] for x in items]
+        device_type = [x['device_type'] for x in items]
+        self.sd_bus = numpy.array([self.bus_map[x['bus']] for x in items], dtype=int)
+        self.sd_is_pr = numpy.array([1 if i == 'producer' else 0 for i in device_type], dtype=int)
+        self.sd_is_cs = numpy.array([1 if i == 'consumer' else 0 for i in device_type], dtype=int)
+        self.pr_sd = numpy.flatnonzero(self.sd_is_pr)
+        self.cs_sd = numpy.flatnonzero(self.sd_is_cs)
+        self.sd_c_su = get_json_column(items, 'startup_cost', float)
+        self.sd_c_sd = get_json_column(items, 'shutdown_cost', float)
+        self.sd_c_on = get_json_column(items, 'on_cost', float)
+        self.sd_d_up_min = get_json_column(items, 'in_service_time_lb', float)
+        self.sd_d_dn_min = get_json_column(items, 'down_time_lb', float)
+        self.sd_p_ramp_up_max = get_json_column(items, 'p_ramp_up_ub', float)
+        self.sd_p_ramp_dn_max = get_json_column(items, 'p_ramp_down_ub', float)
+        self.sd_p_startup_ramp_up_max = get_json_column(items, 'p_startup_ramp_ub', float)
+        self.sd_p_shutdown_ramp_dn_max = get_json_column(items, 'p_shutdown_ramp_ub', float)
+
+        self.set_sd_startup_state([x['startup_states'] for x in items])
+        self.set_sd_multi_interval_constr(
+            [x['startups_ub'] for x in items],
+            [x['energy_req_ub'] for x in items],
+            [x['energy_req_lb'] for x in items])
+
+        self.sd_u_on_0 = get_json_column(initial_status, 'on_status', int)
+        self.sd_p_0 = get_json_column(initial_status, 'p', float)
+        self.sd_q_0 = get_json_column(initial_status, 'q', float)
+        self.sd_d_dn_0 = get_json_column(initial_status, 'accu_down_time', float)
+        self.sd_d_up_0 = get_json_column(initial_status, 'accu_up_time', float)
+
+        self.sd_is_pqe = get_json_column(items, 'q_linear_cap', int)
+        self.sd_is_pqa = get_json_column(items, 'q_bound_cap', int)
+        self.sd_is_pqi = get_json_column(items, 'q_bound_cap', int)
+
+        self.sd_p_rgu_max = get_json_column(items, 'p_reg_res_up_ub', float)
+        self.sd_p_rgd_max = get_json_column(items, 'p_reg_res_down_ub', float)
+        self.sd_p_scr_max = get_json_column(items, 'p_syn_res_ub', float)
+        self.sd_p_nsc_max = get_json_column(items, 'p_nsyn_res_ub', float)
+        self.sd_p_rru_on_max = get_json_column(items, 'p_ramp_res_up_online_ub', float)
+        self.sd_p_rrd_on_max = get_json_column(items, 'p_ramp_res_down_online_ub', float)
+        self.sd_p_rru_off_max = get_json_column(items, 'p_ramp_res_up_offline_ub', float)
+        self.sd_p_rrd_off_max = get_json_column(items, 'p_ramp_res_down_offline_ub', float)
+
+        self.sd_q_p0_pqe = numpy.array([x['q_0'] if x['q_linear_cap'] else 0.0 for x in items], dtype=float)
+        self.sd_q_p0_pqa = numpy.array([x['q_0_ub'] if x['q_bound_cap'] else 0.0 for x in items], dtype=float)
+        self.sd_q_p0_pqi = numpy.array([x['q_0_lb'] if x['q_bound_cap'] else 0.0 for x in items], dtype=float)
+        self.sd_beta_pqe = numpy.array([x['beta'] if x['q_linear_cap'] else 0.0 for x in items], dtype=float)
+        self.sd_beta_pqa = numpy.array([x['beta_ub'] if x['q_bound_cap'] else 0.0 for x in items], dtype=float)
+        self.sd_beta_pqi = numpy.array([x['beta_lb'] if x['q_bound_cap'] else 0.0 for x in items], dtype=float)
+        self.set_sd_p_q()
+
+    def set_acl_from_json_dict(self, data):
+
+        items = data['network']['ac_line']
+        self.acl_fbus = numpy.array([self.bus_map[x['fr_bus']] for x in items], dtype=int)
+        self.acl_tbus = numpy.array([self.bus_map[x['to_bus']] for x in items], dtype=int)
+        self.acl_r_sr = get_json_column(items, 'r', float)
+        self.acl_x_sr = get_json_column(items, 'x', float)
+        self.acl_g_sr = self.acl_r_sr / (self.acl_r_sr**2 + self.acl_x_sr**2)
+        self.acl_b_sr = - self.acl_x_sr / (self.acl_r_sr**2 + self.acl_x_sr**2)
+        self.acl_b_ch = get_json_column(items, 'b', float)
+        self.acl_s_max = get_json_column(items, 'mva_ub_nom', float)
+        self.acl_s_max_ctg = get_json_column(items, 'mva_ub_em', float)
+        self.acl_c_su = get_json_column(items, 'connection_cost', float)
+        self.acl_c_sd = get_json_column(items, 'disconnection_cost', float)
+        self.acl_u_on_0 = numpy.array([x['initial_status']['on_status'] for x in items], dtype=int)
+        self.acl_g_fr = numpy.array([x['g_fr'] if x['additional_shunt'] == 1 else 0.0 for x in items], dtype=float)
+        self.acl_b_fr = numpy.array([x['b_fr'] if x['additional_shunt'] == 1 else 0.0 for x in items], dtype=float)
+        self.acl_g_to = numpy.array([x['g_to'] if x['additional_shunt'] == 1 else 0.0 for x in items], dtype=float)
+        self.acl_b_to = numpy.array([x['b_to'] if x['additional_shunt'] == 1 else 0.0 for x in items], dtype=float)
+
+    def set_dcl_from_json_dict(self, data):
+
+        items = data['network']['dc_line']
+        initial_status = [x['initial_status'] for x in items]
+        self.dcl_fbus = numpy.array([self.bus_map[x['fr_bus']] for x in items], dtype=int)
+        self.dcl_tbus = numpy.array([self.bus_map[x['to_bus']] for x in items], dtype=int)
+        self.dcl_p_max = get_json_column(items, 'pdc_ub', float)
+        self.dcl_q_fr_max = get_json_column(items, 'qdc_fr_ub', float)
+        self.dcl_q_fr_min = get_json_column(items, 'qdc_fr_lb', float)
+        self.dcl_q_to_max = get_json_column(items, 'qdc_to_ub', float)
+        self.dcl_q_to_min = get_json_column(items, 'qdc_to_lb', float)
+        self.dcl_p_0 = get_json_column(initial_status, 'pdc_fr', float)
+        self.dcl_q_fr_0 = get_json_column(initial_status, 'qdc_fr', float)
+        self.dcl_q_to_0 = get_json_column(initial_status, 'qdc_to', float)
+
+    def set_xfr_from_json_dict(self, data):
+
+        items = data['network']['two_winding_transformer']
+        initial_status = [x['initial_status'] for x in items]
+        self.xfr_fbus = numpy.array([self.bus_map[x['fr_bus']] for x in items], dtype=int)
+        self.xfr_tbus = numpy.array([self.bus_map[x['to_bus']] for x in items], dtype=int)
+        self.xfr_r_sr = get_json_column(items, 'r', float)
+        self.xfr_x_sr = get_json_column(items, 'x', float)
+        self.xfr_g_sr = self.xfr_r_sr / (self.xfr_r_sr**2 + self.xfr_x_sr**2)
+        self.xfr_b_sr = - self.xfr_x_sr / (self.xfr_r_sr**2 + self.xfr_x_sr**2)
+        self.xfr_b_ch = get_json_column(items, 'b', float)
+        self.xfr_tau_max = get_json_column(items, 'tm_ub', float)
+        self.xfr_tau_min = get_json_column(items, 'tm_lb', float)
+        self.xfr_phi_max = get_json_column(items, 'ta_ub', float)
+        self.xfr_phi_min = get_json_column(items, 'ta_lb', float)
+        self.xfr_s_max = get_json_column(items, 'mva_ub_nom', float)
+        self.xfr_s_max_ctg = get_json_column(items, 'mva_ub_em', float)
+        self.xfr_c_su = get_json_column(items, 'connection_cost', float)
+        self.xfr_c_sd = get_json_column(items, 'disconnection_cost', float)
+        self.xfr_u_on_0 = get_json_column(initial_status, 'on_status', int)
+        self.xfr_tau_0 = get_json_column(initial_status, 'tm', float)
+        self.xfr_phi_0 = get_json_column(initial_status, 'ta', float)
+        self.xfr_g_fr = numpy.array([x['g_fr'] if x['additional_shunt'] == 1 else 0.0 for x in items], dtype=float)
+        self.xfr_b_fr = numpy.array([x['b_fr'] if x['additional_shunt'] == 1 else 0.0 for x in items], dtype=float)
+        self.xfr_g_to = numpy.array([x['g_to'] if x['additional_shunt'] == 1 else 0.0 for x in items], dtype=float)
+        self.xfr_b_to = numpy.array([x['b_to'] if x['additional_shunt'] == 1 else 0.0 for x in items], dtype=float)
+
+    def set_prz_from_json_dict(self, data):
+
+        items = data['network']['active_zonal_reserve']
+        self.prz_sigma_rgu = get_json_column(items, 'REG_UP', float)
+        self.prz_sigma_rgd = get_json_column(items, 'REG_DOWN', float)
+        self.prz_sigma_scr = get_json_column(items, 'SYN', float)
+        self.prz_sigma_nsc = get_json_column(items, 'NSYN', float)
+        self.prz_c_rgu = get_json_column(items, 'REG_UP_vio_cost', float)
+        self.prz_c_rgd = get_json_column(items, 'REG_DOWN_vio_cost', float)
+        self.prz_c_scr = get_json_column(items, 'SYN_vio_cost', float)
+        self.prz_c_nsc = get_json_column(items, 'NSYN_vio_cost', float)
+        self.prz_c_rru = get_json_column(items, 'RAMPING_RESERVE_UP_vio_cost', float)
+        self.prz_c_rrd = get_json_column(items, 'RAMPING_RESERVE_DOWN_vio_cost', float)
+        self.set_prz_bus_sd()
+
+    def set_qrz_from_json_dict(self, data):
+
+        items = data['network']['reactive_zonal_reserve']
+        self.qrz_c_qru = get_json_column(items, 'REACT_UP_vio_cost', None)
+        self.qrz_c_qrd = get_json_column(items, 'REACT_DOWN_vio_cost', None)
+        self.set_qrz_bus_sd()
+
+    def set_t_from_json_dict(self, data):
+
+        self.t_d = numpy.array(data['time_series_input']['general']['interval_duration'], dtype=float)
+        self.set_t_a()
+
+    def set_k_from_json_dict(self, data):
+
+        self.set_k_out([k['components'][0] for k in data['reliability']['contingency']])
+
+    def set_sd_t_from_json_dict(self, data):
+
+        items = get_json_items_in_order(data['time_series_input']['simple_dispatchable_device'], self.sd_uid)
+        shape = (self.num_sd, self.num_t)
+        self.sd_t_u_on_max = numpy.reshape(get_json_column(items, 'on_status_ub', int), newshape=shape)
+        self.sd_t_u_on_min = numpy.reshape(get_json_column(items, 'on_status_lb', int), newshape=shape)
+        self.sd_t_p_max = numpy.reshape(get_json_column(items, 'p_ub', float), newshape=shape)
+        self.sd_t_p_min = numpy.reshape(get_json_column(items, 'p_lb', float), newshape=shape)
+        self.sd_t_q_max = numpy.reshape(get_json_column(items, 'q_ub', float), newshape=shape)
+        self.sd_t_q_min = numpy.reshape(get_json_column(items, 'q_lb', float), newshape=shape)
+        self.sd_t_c_rgu = numpy.reshape(get_json_column(items, 'p_reg_res_up_cost', float), newshape=shape)
+        self.sd_t_c_rgd = numpy.reshape(get_json_column(items, 'p_reg_res_down_cost', float), newshape=shape)
+        self.sd_t_c_scr = numpy.reshape(get_json_column(items, 'p_syn_res_cost', float), newshape=shape)
+        self.sd_t_c_nsc = numpy.reshape(get_json_column(items, 'p_nsyn_res_cost', float), newshape=shape)
+        self.sd_t_c_rru_on = numpy.reshape(get_json_column(items, 'p_ramp_res_up_online_cost', float), newshape=shape)
+        self.sd_t_c_rrd_on = numpy.reshape(get_json_column(items, 'p_ramp_res_down_online_cost', float), newshape=shape)
+        self.sd_t_c_rru_off = numpy.reshape(get_json_column(items, 'p_ramp_res_up_offline_cost', float), newshape=shape)
+        self.sd_t_c_rrd_off = numpy.reshape(get_json_column(items, 'p_ramp_res_down_offline_cost', float), newshape=shape)
+        self.sd_t_c_qru = numpy.reshape(get_json_column(items, 'q_res_up_cost', float), newshape=shape)
+        self.sd_t_c_qrd = numpy.reshape(get_json_column(items, 'q_res_down_cost', float), newshape=shape)
+
+    def set_sd_t_cost_from_json_dict(self, data):
+
+        items = get_json_items_in_order(data['time_series_input']['simple_dispatchable_device'], self.sd_uid)
+        self.set_sd_t_cost_blocks([x['cost'] for x in items])
+
+    def set_prz_t_from_json_dict(self, data):
+
+        items = get_json_items_in_order(data['time_series_input']['active_zonal_reserve'], self.prz_uid)
+        self.prz_t_p_rru_min = numpy.reshape(
+            get_json_column(items, 'RAMPING_RESERVE_UP', float), newshape=(self.num_prz, self.num_t))
+        self.prz_t_p_rrd_min = numpy.reshape(
+            get_json_column(items, 'RAMPING_RESERVE_DOWN', float), newshape=(self.num_prz, self.num_t))
+
+    def set_qrz_t_from_json_dict(self, data):
+
+        items = get_json_items_in_order(data['time_series_input']['reactive_zonal_reserve'], self.qrz_uid)
+        self.qrz_t_q_qru_min = numpy.reshape(
+            get_json_column(items, 'REACT_UP', float), newshape=(self.num_qrz, self.num_t))
+        self.qrz_t_q_qrd_min = numpy.reshape(
+            get_json_column(items, 'REACT_DOWN', float), newshape=(self.num_qrz, self.num_t))
+
+# solution time series sections read by OutputData.set_from_json_file
+# section: (component, [(record field, OutputData attribute, dtype), ...])
+output_sections = {
+    'bus': ('bus', [('vm', 'bus_t_v', float), ('va', 'bus_t_theta', float)]),
+    'shunt': ('sh', [('step', 'sh_t_u_st', shunt_step_dtype)]),
+    'simple_dispatchable_device': ('sd', [
+        ('on_status', 'sd_t_u_on', status_dtype),
+        ('p_on', 'sd_t_p_on', float),
+        ('q', 'sd_t_q', float),
+        ('p_reg_res_up', 'sd_t_p_rgu', float),
+        ('p_reg_res_down', 'sd_t_p_rgd', float),
+        ('p_syn_res', 'sd_t_p_scr', float),
+        ('p_nsyn_res', 'sd_t_p_nsc', float),
+        ('p_ramp_res_up_online', 'sd_t_p_rru_on', float),
+        ('p_ramp_res_down_online', 'sd_t_p_rrd_on', float),
+        ('p_ramp_res_up_offline', 'sd_t_p_rru_off', float),
+        ('p_ramp_res_down_offline', 'sd_t_p_rrd_off', float),
+        ('q_res_up', 'sd_t_q_qru', float),
+        ('q_res_down', 'sd_t_q_qrd', float)]),
+    'ac_line': ('acl', [('on_status', 'acl_t_u_on', status_dtype)]),
+    'dc_line': ('dcl', [('pdc_fr', 'dcl_t_p', float), ('qdc_fr', 'dcl_t_q_fr', float), ('qdc_to', 'dcl_t_q_to', float)]),
+    'two_winding_transformer': ('xfr', [('on_status', 'xfr_t_u_on', status_dtype), ('tm', 'xfr_t_tau', float), ('ta', 'xfr_t_phi', float)]),
+}
+
 class OutputData(object):
 
     def __init__(self):
 
         pass
 
+    def set_from_json_file(self, input_data, file_name):
+        '''
+        set the same arrays as set_from_data_model, reading the solution file one record at a time.
+        the arrays are allocated from the input_data dimensions and each record fills one row,
+        so memory use stays near the size of the arrays rather than the decoded file.
+        records with uids not in input_data are ignored, as in set_from_data_model.
+        '''
+
+        filled = {}
+        for section, (comp, fields) in output_sections.items():
+            num = getattr(input_data, 'num_{}'.format(comp))
+            for field, attr, dtype in fields:
+                setattr(self, attr, numpy.zeros(shape=(num, input_data.num_t), dtype=dtype))
+            filled[section] = numpy.zeros(shape=(num, ), dtype=bool)
+
+        for section, record in utils.iter_json_section_records(file_name, 'time_series_output'):
+            if section not in output_sections:
+                continue
+            comp, fields = output_sections[section]
+            i = getattr(input_data, '{}_map'.format(comp)).get(record['uid'])
+            if i is None:
+                continue
+            for field, attr, dtype in fields:
+                if numpy.issubdtype(dtype, numpy.integer):
+                    getattr(self, attr)[i, :] = get_compact_int_array(record[field], dtype)
+                else:
+                    getattr(self, attr)[i, :] = record[field]
+            filled[section][i] = True
+
+        for section, (comp, fields) in output_sections.items():
+            if not numpy.all(filled[section]):
+                uid = getattr(input_data, '{}_uid'.format(comp))
+                raise ModelError('solution section {} is missing uids: {}'.format(
+                    section, list(uid[numpy.logical_not(filled[section])])))
+
     def set_from_data_model(self, input_data, output_data_model):
         
         self.set_bus_t(input_data, output_data_model)
@@ -552,14 +1379,14 @@ class OutputData(object):
 
         data_map = {x.uid:x for x in output_data_model.time_series_output.shunt}
         self.sh_t_u_st = numpy.reshape(
-            numpy.array([data_map[i].step for i in input_data.sh_uid], dtype=int),
+            get_compact_int_array([data_map[i].step for i in input_data.sh_uid], shunt_step_dtype),
             newshape=(input_data.num_sh, input_data.num_t))
 
     def set_sd_t(self, input_data, output_data_model):
 
         data_map = {x.uid:x for x in output_data_model.time_series_output.simple_dispatchable_device}
         self.sd_t_u_on = numpy.reshape(
-            numpy.array([data_map[i].on_status for i in input_data.sd_uid], dtype=int),
+            get_compact_int_array([data_map[i].on_status for i in input_data.sd_uid], status_dtype),
             newshape=(input_data.num_sd, input_data.num_t))
         self.sd_t_p_on = numpy.reshape(
             numpy.array([data_map[i].p_on for i in input_data.sd_uid], dtype=float),
@@ -602,7 +1429,7 @@ class OutputData(object):
 
         data_map = {x.uid:x for x in output_data_model.time_series_output.ac_line}
         self.acl_t_u_on = numpy.reshape(
-            numpy.array([data_map[i].on_status for i in input_data.acl_uid], dtype=int), # , dtype=numpy.int8) # could help, but not much
+            get_compact_int_array([data_map[i].on_status for i in input_data.acl_uid], status_dtype),
             newshape=(input_data.num_acl, input_data.num_t))
 
     def set_dcl_t(self, input_data, output_data_model):
@@ -627,7 +1454,7 @@ class OutputData(object):
 
         data_map = {x.uid:x for x in output_data_model.time_series_output.two_winding_transformer}
         self.xfr_t_u_on = numpy.reshape(
-            numpy.array([data_map[i].on_status for i in input_data.xfr_uid], dtype=int),
+            get_compact_int_array([data_map[i].on_status for i in input_data.xfr_uid], status_dtype),
             newshape=(input_data.num_xfr, input_data.num_t))
         self.xfr_t_tau = numpy.reshape(
             numpy.array([data_map[i].tm for i in input_data.xfr_uid], dtype=float),
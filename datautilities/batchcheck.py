@@ -0,0 +1,163 @@
+'''
+Batch data checker
+
+Runs check_data on many problem/solution pairs listed in a manifest file,
+on a pool of worker processes that import the packages once and share git info read once for the batch.
+
+The manifest is a CSV file with a header row and columns
+  problem - problem file name, required
+  solution - solution file name, optional, may be empty
+  name - name of the pair, optional, default the row number
+Relative file names are relative to the directory of the manifest.
+
+For each pair, the check_data output files and the printed output (check_data.log)
+are written to a directory <output_dir>/<name>.
+A failure of one pair is recorded for that pair and does not stop the batch.
+One row per pair is written to the batch summary CSV file in output_dir:
+name, pass, error, time, then the check_data summary flattened as in summary.csv.
+'''
+
+import os, csv, time, traceback, contextlib, multiprocessing
+import concurrent.futures
+from datautilities import utils, validation
+
+log_file = 'check_data.log'
+
+def read_manifest(manifest_file):
+    '''
+    returns a list of pairs {'name': name, 'problem': problem file, 'solution': solution file or None}
+    '''
+
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_file))
+    with open(manifest_file, 'r', newline='') as f:
+        rows = list(csv.DictReader(f))
+    pairs = []
+    for i, r in enumerate(rows):
+        problem = (r.get('problem') or '').strip()
+        solution = (r.get('solution') or '').strip()
+        name = (r.get('name') or '').strip()
+        if problem == '':
+            raise ValueError('manifest row {} has no problem file: {}'.format(i, r))
+        pairs.append({
+            'name': name if name != '' else str(i),
+            'problem': os.path.join(manifest_dir, problem),
+            'solution': os.path.join(manifest_dir, solution) if solution != '' else None})
+    names = [p['name'] for p in pairs]
+    if len(set(names)) < len(names):
+        raise ValueError('manifest pair names are not unique: {}'.format(
+            sorted(set([n for n in names if names.count(n) > 1]))))
+    return pairs
+
+def check_pair(pair, config_file, output_dir, output_files, git_info):
+    '''
+    run check_data on one pair, writing its outputs to output_dir/<name>
+    returns the batch summary row for the pair
+    '''
+
+    pair_dir = os.path.join(output_dir, pair['name'])
+    os.makedirs(pair_dir, exist_ok=True)
+    files = [os.path.join(pair_dir, f) for f in output_files]
+    error = None
+    start_time = time.time()
+    with open(os.path.join(pair_dir, log_file), 'w') as f:
+        with contextlib.redirect_stdout(f):
+            try:
+                validation.check_data(pair['problem'], pair['solution'], config_file, *files, git_info=git_info)
+            except Exception as e:
+                print(traceback.format_exc())
+                error = get_error(e)
+    end_time = time.time()
+    try:
+        summary = validation.read_json(files[1])
+    except Exception:
+        summary = {}
+    return get_row(pair, error, end_time - start_time, summary)
+
+def get_error(e):
+    '''
+    short description of exception e for the batch summary.
+    for a ModelError collecting the errors of several checks, the number of errors and the failed checks,
+    otherwise the first line of the exception message
+    '''
+
+    errors = getattr(e, 'errors', None)
+    if errors:
+        checks = [r.check for r in errors if getattr(r, 'check', None) is not None]
+        return '{}: {} errors ({})'.format(type(e).__name__, len(errors), ', '.join(checks))
+    return '{}: {}'.format(type(e).__name__, str(e).splitlines()[0] if str(e) else '')
+
+def get_row(pair, error, run_time, summary):
+
+    row = {
+        'name': pair['name'],
+        'pass': 1 if error is None else 0,
+        'error': '' if error is None else error,
+        'time': run_time}
+    row.update(summary)
+    row['problem_data_file'] = pair['problem']
+    row['solution_data_file'] = pair['solution']
+    return row
+
+def check_data_batch(
+        manifest_file, config_file, output_dir, num_workers=1,
+        batch_summary_file='batch_summary.csv',
+        output_files=['summary.csv', 'summary.json', 'data_errors.txt', 'ignored_errors.txt', 'solution_errors.txt']):
+    '''
+    run check_data on the pairs in manifest_file
+
+    num_workers = 1: run the pairs in serial in this process
+    num_workers > 1: run the pairs on a pool of num_workers processes
+    output_files = per pair file names for the check_data outputs
+      summary csv, summary json, data errors, ignored errors, solution errors
+    returns the batch summary table, a pandas DataFrame with one row per pair, in manifest order
+    '''
+
+    pairs = read_manifest(manifest_file)
+    os.makedirs(output_dir, exist_ok=True)
+    try:
+        git_info = utils.get_git_info_all()
+    except Exception:
+        print('git info error ignored\n')
+        print(traceback.format_exc())
+        git_info = {}
+    print('batch of {} pairs, num workers: {}'.format(len(pairs), num_workers))
+
+    start_time = time.time()
+    rows = []
+    if num_workers <= 1:
+        for p in pairs:
+            rows.append(check_pair(p, config_file, output_dir, output_files, git_info))
+            print_row(rows[-1])
+    else:
+        # validation defers these imports to the functions that use them.
+        # import them here, before the pool forks, so the workers start with them already imported
+        from datautilities import evaluation
+        import pandas, networkx, pydantic, datamodel.input.data, datamodel.output.data
+        if 'fork' in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context('fork')
+        else:
+            mp_context = None
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers, mp_context=mp_context) as executor:
+            futures = [
+                executor.submit(check_pair, p, config_file, output_dir, output_files, git_info)
+                for p in pairs]
+            for p, f in zip(pairs, futures):
+                try:
+                    rows.append(f.result())
+                except Exception as e:
+                    # e.g. the worker process died
+                    rows.append(get_row(p, get_error(e), None, {}))
+                print_row(rows[-1])
+    end_time = time.time()
+
+    import pandas
+    table = pandas.json_normalize(rows)
+    table.to_csv(os.path.join(output_dir, batch_summary_file), index=False)
+    print('batch pass: {}, fail: {}, time: {}'.format(
+        sum([r['pass'] for r in rows]), sum([1 - r['pass'] for r in rows]), end_time - start_time))
+    return table
+
+def print_row(row):
+
+    print('pair: {}, pass: {}, time: {}{}'.format(
+        row['name'], row['pass'], row['time'], '' if row['pass'] else ', error: {}'.format(row['error'])))
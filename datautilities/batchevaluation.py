@@ -0,0 +1,249 @@
+'''
+Evaluation of a batch of solutions to the same problem.
+
+The solution arrays are stacked with a leading solution index s, e.g. bus_t_v[s, i, t],
+and the constraint and cost families that depend only on the solution arrays
+(simple bounds, reserve nonnegativity and cost, branch switching)
+are evaluated for all solutions in one pass over the stacked arrays.
+The remaining eval steps (dispatchable device trajectories, balance, connectedness, contingencies, objective)
+are run per solution by a single SolutionEvaluator, reusing its work arrays and matrices.
+Results are the same as evaluating each solution with its own SolutionEvaluator.
+'''
+
+import numpy
+from datautilities import utils, evaluation
+
+# solution arrays, as set by SolutionEvaluator.set_solution
+solution_array_names = [
+    'bus_t_v', 'bus_t_theta', 'sh_t_u_st', 'sd_t_u_on', 'sd_t_p_on', 'sd_t_q',
+    'sd_t_p_rgu', 'sd_t_p_rgd', 'sd_t_p_scr', 'sd_t_p_nsc', 'sd_t_p_rru_on', 'sd_t_p_rrd_on', 'sd_t_p_rru_off', 'sd_t_p_rrd_off',
+    'sd_t_q_qru', 'sd_t_q_qrd', 'acl_t_u_on', 'dcl_t_p', 'dcl_t_q_fr', 'dcl_t_q_to', 'xfr_t_u_on', 'xfr_t_tau', 'xfr_t_phi']
+
+class BatchSolutionEvaluator(object):
+
+    @utils.timeit
+    def __init__(self, problem, solutions, config={}):
+        '''
+        problem - arraydata.InputData
+        solutions - list of arraydata.OutputData for problem
+        '''
+
+        self.config = config
+        self.problem = problem
+        self.solutions = solutions
+        self.num_sol = len(solutions)
+        self.set_solution_stack()
+        self.set_batch_steps()
+        self.evaluator = None
+        if self.num_sol > 0:
+            self.evaluator = evaluation.SolutionEvaluator(problem, solutions[0], config=config)
+
+    @utils.timeit
+    def set_solution_stack(self):
+        '''
+        stack the solution arrays, with the solution index first
+        '''
+
+        for name in solution_array_names:
+            setattr(self, name, numpy.stack([getattr(sol, name) for sol in self.solutions]))
+
+    def set_batch_steps(self):
+        '''
+        batch steps, each replacing the SolutionEvaluator eval step with the same name
+        and writing the same summary items
+
+        ub/lb - eval_*_max: viol = max(0, x - ub), eval_*_min: viol = max(0, lb - x)
+          x is a stacked solution array, ub/lb is a problem array by component or by component and interval
+        nonneg - viol = -min(0, x)
+        cost - z = c * x * t_d, c by sd and interval
+        su/sd - AC branch startups/shutdowns from diff of u_on, with costs
+        '''
+
+        self.batch_steps = [
+            # simple dispatchable device on/off bounds
+            {'name': 'eval_sd_t_u_on_max', 'kind': 'ub', 'x': 'sd_t_u_on', 'bound': 'sd_t_u_on_max', 'comp': 'sd'},
+            {'name': 'eval_sd_t_u_on_min', 'kind': 'lb', 'x': 'sd_t_u_on', 'bound': 'sd_t_u_on_min', 'comp': 'sd'},
+
+            # bus voltage
+            {'name': 'eval_bus_t_v_max', 'kind': 'ub', 'x': 'bus_t_v', 'bound': 'bus_v_max', 'comp': 'bus'},
+            {'name': 'eval_bus_t_v_min', 'kind': 'lb', 'x': 'bus_t_v', 'bound': 'bus_v_min', 'comp': 'bus'},
+
+            # shunts
+            {'name': 'eval_sh_t_u_st_max', 'kind': 'ub', 'x': 'sh_t_u_st', 'bound': 'sh_u_st_max', 'comp': 'sh'},
+            {'name': 'eval_sh_t_u_st_min', 'kind': 'lb', 'x': 'sh_t_u_st', 'bound': 'sh_u_st_min', 'comp': 'sh'},
+
+            # DC line bounds, p min is -p max
+            {'name': 'eval_dcl_t_p_max', 'kind': 'ub', 'x': 'dcl_t_p', 'bound': 'dcl_p_max', 'comp': 'dcl'},
+            {'name': 'eval_dcl_t_p_min', 'kind': 'lb', 'x': 'dcl_t_p', 'bound': 'dcl_p_max', 'comp': 'dcl', 'negate_bound': True},
+            {'name': 'eval_dcl_t_q_fr_max', 'kind': 'ub', 'x': 'dcl_t_q_fr', 'bound': 'dcl_q_fr_max', 'comp': 'dcl'},
+            {'name': 'eval_dcl_t_q_fr_min', 'kind': 'lb', 'x': 'dcl_t_q_fr', 'bound': 'dcl_q_fr_min', 'comp': 'dcl'},
+            {'name': 'eval_dcl_t_q_to_max', 'kind': 'ub', 'x': 'dcl_t_q_to', 'bound': 'dcl_q_to_max', 'comp': 'dcl'},
+            {'name': 'eval_dcl_t_q_to_min', 'kind': 'lb', 'x': 'dcl_t_q_to', 'bound': 'dcl_q_to_min', 'comp': 'dcl'},
+
+            # transformer controls
+            {'name': 'eval_xfr_t_tau_max', 'kind': 'ub', 'x': 'xfr_t_tau', 'bound': 'xfr_tau_max', 'comp': 'xfr'},
+            {'name': 'eval_xfr_t_tau_min', 'kind': 'lb', 'x': 'xfr_t_tau', 'bound': 'xfr_tau_min', 'comp': 'xfr'},
+            {'name': 'eval_xfr_t_phi_max', 'kind': 'ub', 'x': 'xfr_t_phi', 'bound': 'xfr_phi_max', 'comp': 'xfr'},
+            {'name': 'eval_xfr_t_phi_min', 'kind': 'lb', 'x': 'xfr_t_phi', 'bound': 'xfr_phi_min', 'comp': 'xfr'},
+
+            # AC branch switching
+            {'name': 'eval_acl_t_u_su', 'kind': 'su', 'comp': 'acl'},
+            {'name': 'eval_acl_t_u_sd', 'kind': 'sd', 'comp': 'acl'},
+            {'name': 'eval_xfr_t_u_su', 'kind': 'su', 'comp': 'xfr'},
+            {'name': 'eval_xfr_t_u_sd', 'kind': 'sd', 'comp': 'xfr'},
+        ]
+
+        # reserve nonnegativity and cost
+        for r in ['p_rgu', 'p_rgd', 'p_scr', 'p_nsc', 'p_rru_on', 'p_rru_off', 'p_rrd_on', 'p_rrd_off', 'q_qru', 'q_qrd']:
+            self.batch_steps.append(
+                {'name': 'eval_sd_t_{}_nonneg'.format(r), 'kind': 'nonneg', 'x': 'sd_t_{}'.format(r), 'comp': 'sd'})
+        for r in ['p_rgu', 'p_rgd', 'p_scr', 'p_nsc', 'p_rru_on', 'p_rrd_on', 'p_rru_off', 'p_rrd_off', 'q_qru', 'q_qrd']:
+            product = r[2:]
+            self.batch_steps.append(
+                {'name': 'eval_sd_t_z_{}'.format(product), 'kind': 'cost', 'x': 'sd_t_{}'.format(r),
+                 'c': 'sd_t_c_{}'.format(product), 'key': 'sd_t_z_{}'.format(product)})
+
+    @utils.timeit
+    def run(self):
+        '''
+        evaluate all solutions
+        returns a list with one dict per solution, with keys z, feas, summary, infeas_summary
+        '''
+
+        self.sol_batch_results = [{} for s in range(self.num_sol)]
+        if self.num_sol == 0:
+            self.sol_results = []
+            return self.sol_results
+
+        for step in self.batch_steps:
+            getattr(self, 'eval_batch_{}'.format(step['kind']))(step)
+
+        # check that the batch steps write everything that the steps they replace do
+        eval_steps = self.evaluator.eval_steps
+        batch_step_names = set([step['name'] for step in self.batch_steps])
+        for step in eval_steps:
+            if step['name'] in batch_step_names:
+                assert(set(step['writes']).issubset(self.sol_batch_results[0].keys()))
+        other_steps = [step['name'] for step in eval_steps if step['name'] not in batch_step_names]
+
+        self.sol_results = []
+        for s in range(self.num_sol):
+            self.evaluator.set_next_solution(self.solutions[s])
+            for k, v in self.sol_batch_results[s].items():
+                setattr(self.evaluator, k, v)
+            for name in other_steps:
+                getattr(self.evaluator, name)()
+            self.sol_results.append({
+                'z': self.evaluator.get_obj(),
+                'feas': self.evaluator.get_feas(),
+                'summary': self.evaluator.get_summary(),
+                'infeas_summary': self.evaluator.get_infeas_summary(),
+            })
+        return self.sol_results
+
+    def get_obj(self):
+
+        return [r['z'] for r in self.sol_results]
+
+    def get_feas(self):
+
+        return [r['feas'] for r in self.sol_results]
+
+    def get_summary(self):
+
+        return [r['summary'] for r in self.sol_results]
+
+    def get_infeas_summary(self):
+
+        return [r['infeas_summary'] for r in self.sol_results]
+
+    def get_idx_lists(self, comp):
+
+        return [getattr(self.problem, '{}_uid'.format(comp)), self.problem.t_num]
+
+    def get_bound(self, step):
+        '''
+        bound with dimensions (1, num_comp, 1) or (1, num_comp, num_t), to broadcast against (num_sol, num_comp, num_t)
+        '''
+
+        bound = getattr(self.problem, step['bound'])
+        if step.get('negate_bound', False):
+            bound = numpy.negative(bound)
+        if bound.ndim == 1:
+            bound = numpy.reshape(bound, newshape=(1, bound.size, 1))
+        else:
+            bound = numpy.reshape(bound, newshape=((1, ) + bound.shape))
+        return bound
+
+    def set_sol_batch_viol(self, key, viol):
+
+        for s in range(self.num_sol):
+            self.sol_batch_results[s][key] = viol[s]
+
+    def eval_batch_ub(self, step):
+
+        x = getattr(self, step['x'])
+        arr = numpy.subtract(x, self.get_bound(step))
+        numpy.maximum(arr, 0, out=arr)
+        self.set_sol_batch_viol(
+            'viol_{}'.format(step['name'][5:]), utils.get_max_batch(arr, idx_lists=self.get_idx_lists(step['comp'])))
+
+    def eval_batch_lb(self, step):
+
+        x = getattr(self, step['x'])
+        arr = numpy.subtract(self.get_bound(step), x)
+        numpy.maximum(arr, 0, out=arr)
+        self.set_sol_batch_viol(
+            'viol_{}'.format(step['name'][5:]), utils.get_max_batch(arr, idx_lists=self.get_idx_lists(step['comp'])))
+
+    def eval_batch_nonneg(self, step):
+
+        x = getattr(self, step['x'])
+        arr = numpy.minimum(0.0, x)
+        viol = utils.get_min_batch(arr, idx_lists=self.get_idx_lists(step['comp']))
+        for v in viol:
+            v['val'] = (-1.0) * v['val']
+        self.set_sol_batch_viol('viol_{}'.format(step['name'][5:]), viol)
+
+    def eval_batch_cost(self, step):
+
+        x = getattr(self, step['x'])
+        arr = numpy.multiply(numpy.reshape(getattr(self.problem, step['c']), newshape=((1, ) + x.shape[1:])), x)
+        numpy.multiply(numpy.reshape(self.problem.t_d, newshape=(1, 1, self.problem.num_t)), arr, out=arr)
+        for s in range(self.num_sol):
+            # sum each solution separately so the summation order is the same as in SolutionEvaluator
+            self.sol_batch_results[s]['sum_{}'.format(step['key'])] = numpy.sum(arr[s])
+            self.sol_batch_results[s]['t_sum_{}'.format(step['key'])] = numpy.sum(arr[s], axis=0)
+
+    def eval_batch_su(self, step):
+
+        self.eval_batch_su_sd(step, 'su', 'up')
+
+    def eval_batch_sd(self, step):
+
+        self.eval_batch_su_sd(step, 'sd', 'dn')
+
+    def eval_batch_su_sd(self, step, su_sd, up_dn):
+
+        comp = step['comp']
+        num_comp = getattr(self.problem, 'num_{}'.format(comp))
+        u_on = getattr(self, '{}_t_u_on'.format(comp))
+        u_on_0 = numpy.broadcast_to(
+            numpy.reshape(getattr(self.problem, '{}_u_on_0'.format(comp)), newshape=(1, num_comp, 1)),
+            (self.num_sol, num_comp, 1))
+        idx_lists = self.get_idx_lists(comp)
+        viol_key = 'viol_{}_t_u_{}_max'.format(comp, su_sd)
+        if self.config['{}_switch_{}_allowed'.format(comp, up_dn)]:
+            self.set_sol_batch_viol(viol_key, utils.get_max_batch(numpy.zeros_like(u_on), idx_lists=idx_lists))
+        arr = numpy.diff(u_on, n=1, axis=2, prepend=u_on_0)
+        if su_sd == 'sd':
+            numpy.negative(arr, out=arr)
+        numpy.maximum(arr, 0, out=arr)
+        if not self.config['{}_switch_{}_allowed'.format(comp, up_dn)]:
+            self.set_sol_batch_viol(viol_key, utils.get_max_batch(arr, idx_lists=idx_lists))
+        cost = numpy.multiply(
+            numpy.reshape(getattr(self.problem, '{}_c_{}'.format(comp, su_sd)), newshape=(1, num_comp, 1)), arr)
+        for s in range(self.num_sol):
+            self.sol_batch_results[s]['sum_{}_t_u_{}'.format(comp, su_sd)] = numpy.sum(arr[s])
+            self.sol_batch_results[s]['sum_{}_t_z_{}'.format(comp, su_sd)] = numpy.sum(cost[s])
+            self.sol_batch_results[s]['t_sum_{}_t_z_{}'.format(comp, su_sd)] = numpy.sum(cost[s], axis=0)
@@ -1,6 +1,24 @@
 class ModelError(Exception):
+    '''
+    an error found by a data check
 
-    pass
+    optional structured fields, set by validation.get_check_error and validation.run_checks:
+    check = name of the failing check
+    description = the message without the failure records
+    failures = list of failure records, e.g. tuples of indices, uids, and values,
+      at most config['max_errors_per_check'] of them
+    num_failures = number of failures found, including any not kept in failures
+    errors = for a ModelError collecting the errors of several checks, the list of those ModelErrors
+    '''
+
+    def __init__(self, msg='', description=None, failures=None, num_failures=None, errors=None):
+
+        super(ModelError, self).__init__(msg)
+        self.check = None
+        self.description = description
+        self.failures = failures
+        self.num_failures = num_failures
+        self.errors = errors
 
 class GitError(Exception):
 
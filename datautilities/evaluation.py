@@ -2,25 +2,124 @@
 Evaluation of solutions to the GO Competition Challenge 3 problem.
 '''
 
-import time
+import time, threading, concurrent.futures
 import numpy, scipy, scipy.sparse, scipy.sparse.linalg
 from datautilities import arraydata, utils, ctgmodel
 
+class WorkArray(object):
+    '''
+    work array attribute of SolutionEvaluator.
+    each thread has its own arena of work arrays, so that eval steps running concurrently do not share scratch space.
+    a work array is allocated in the arena the first time it is used in the thread, with the shape and dtype from set_work_shapes,
+    and then reused by later eval steps and later solutions.
+    '''
+
+    def __init__(self, name):
+
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+
+        if obj is None:
+            return self
+        return obj.get_work_array(self.name)
+
+    def __set__(self, obj, value):
+
+        obj.get_work_arena().put(self.name, value)
+
+# work arrays of SolutionEvaluator: name: (problem dimension names of the shape, dtype)
+work_array_shapes = {
+    'bus_float': (('num_bus',), float),
+    'sh_float': (('num_sh',), float),
+    'sd_float': (('num_sd',), float),
+    'acl_float': (('num_acl',), float),
+    'dcl_float': (('num_dcl',), float),
+    'xfr_float': (('num_xfr',), float),
+    'prz_float': (('num_prz',), float),
+    'qrz_float': (('num_qrz',), float),
+    't_float': (('num_t',), float),
+    't_float_1': (('num_t',), float),
+    'k_float': (('num_k',), float),
+    'bus_int': (('num_bus',), int),
+    'sh_int': (('num_sh',), int),
+    'sd_int': (('num_sd',), int),
+    'acl_int': (('num_acl',), int),
+    'dcl_int': (('num_dcl',), int),
+    'xfr_int': (('num_xfr',), int),
+    'prz_int': (('num_prz',), int),
+    'qrz_int': (('num_qrz',), int),
+    't_int': (('num_t',), int),
+    't_int_1': (('num_t',), int),
+    't_int_2': (('num_t',), int),
+    'k_int': (('num_k',), int),
+    'sd_t_int': (('num_sd', 'num_t'), int),
+    'sd_t_float': (('num_sd', 'num_t'), float),
+    'sd_t_float_1': (('num_sd', 'num_t'), float),
+    'sd_t_float_2': (('num_sd', 'num_t'), float),
+    'pr_t_float': (('num_pr', 'num_t'), float),
+    'cs_t_float': (('num_cs', 'num_t'), float),
+    'bus_t_float': (('num_bus', 'num_t'), float),
+    'bus_t_float_1': (('num_bus', 'num_t'), float),
+    'sh_t_int': (('num_sh', 'num_t'), int),
+    'sh_t_float': (('num_sh', 'num_t'), float),
+    'dcl_t_float': (('num_dcl', 'num_t'), float),
+    'acl_t_int': (('num_acl', 'num_t'), arraydata.status_dtype), # status values and changes, in [-1, 1]
+    'acl_t_float': (('num_acl', 'num_t'), float),
+    'acl_t_float_1': (('num_acl', 'num_t'), float),
+    'acl_t_float_2': (('num_acl', 'num_t'), float),
+    'xfr_t_int': (('num_xfr', 'num_t'), arraydata.status_dtype), # status values and changes, in [-1, 1]
+    'xfr_t_float': (('num_xfr', 'num_t'), float),
+    'xfr_t_float_1': (('num_xfr', 'num_t'), float),
+    'xfr_t_float_2': (('num_xfr', 'num_t'), float),
+    'prz_t_float': (('num_prz', 'num_t'), float),
+    'prz_t_float_1': (('num_prz', 'num_t'), float),
+    'prz_t_float_2': (('num_prz', 'num_t'), float),
+    'qrz_t_float': (('num_qrz', 'num_t'), float),
+    'qrz_t_float_1': (('num_qrz', 'num_t'), float),
+    'qrz_t_float_2': (('num_qrz', 'num_t'), float),
+    }
+
 class SolutionEvaluator(object):
 
     @utils.timeit
     def __init__(self, problem, solution, config={}):
         
         self.config = config
+        self.work_local = threading.local()
+        self.work_arenas = []
+        self.work_arenas_lock = threading.Lock()
         self.set_summary()
+        self.set_eval_steps()
         self.set_problem(problem)
         self.set_solution(solution)
         self.set_solution_zero()
-        self.set_work_zero()
+        self.set_work_shapes()
+        print('work memory per thread, if all work arrays are used: {}'.format(self.get_work_shapes_num_bytes()))
         self.set_matrices()
 
     @utils.timeit
-    def run(self):
+    def run(self, num_workers=None, targets=None, mode='all'):
+        '''
+        run the eval steps in self.eval_steps
+
+        num_workers = 1: run the steps in serial in the listed order
+        num_workers > 1: run the steps on a thread pool of num_workers threads.
+          numpy releases the GIL, so independent steps can run concurrently.
+          each step starts as soon as the earlier steps it depends on are done,
+          and the result is the same as in serial.
+        num_workers = None: take num_workers from config['eval_num_workers'], default 1
+
+        targets = None: run all steps
+        targets = list of attribute names, e.g. ['z'], ['feas'], ['viol_bus_t_p_balance_max']:
+          run only the steps needed to compute these (see get_eval_steps_for_targets).
+          summary items not needed for the targets are left at their initial values.
+
+        mode = 'all': run as above
+        mode = 'first_violation': only determine feasibility, stopping at the first hard constraint violation.
+          see run_first_violation. num_workers and targets are ignored.
+          returns {key: val} for the violated summary item, or {} if feasible.
+        '''
 
         # todo performance - which functions are expensive here and elsewhere - how bad does it get for larger data
 
@@ -28,177 +127,542 @@ class SolutionEvaluator(object):
         # * use the ones we have when config['do_proj']==True
         # * implement the SD ones
 
-        # simple dispatchable device
-        # on/off state
-        self.eval_sd_t_u_on_max()
-        self.eval_sd_t_u_on_min()
-        self.eval_sd_t_d_up_dn()
-        self.eval_sd_t_u_su_sd()
-        self.eval_sd_t_d_up_min()
-        self.eval_sd_t_d_dn_min()
-        self.eval_sd_t_z_on()
-        self.eval_sd_t_z_su()
-        self.eval_sd_t_z_sd()
-        self.eval_sd_max_startup()
-        self.eval_sd_t_z_sus()
-
-        # bus voltage
-        self.eval_bus_t_v_max()
-        self.eval_bus_t_v_min()
-        #self.proj_bus_t_v_max()
-        #self.proj_bus_t_v_min()
-
-        # shunts
-        # no proj needed because integer
-        self.eval_sh_t_u_st_max()
-        self.eval_sh_t_u_st_min()
-        self.eval_sh_t_p_q()
-
-        # DC line bounds
-        self.eval_dcl_t_p_max()
-        self.eval_dcl_t_p_min()
-        #self.proj_dcl_t_p_max()
-        #self.proj_dcl_t_p_min()
-        self.eval_dcl_t_q_fr_max()
-        self.eval_dcl_t_q_fr_min()
-        #self.proj_dcl_t_q_fr_max()
-        #self.proj_dcl_t_q_fr_min()
-        self.eval_dcl_t_q_to_max()
-        self.eval_dcl_t_q_to_min()
-        #self.proj_dcl_t_q_to_max()
-        #self.proj_dcl_t_q_to_min()
-
-        # transformer controls
-        self.eval_xfr_t_tau_max()
-        self.eval_xfr_t_tau_min()
-        #self.proj_xfr_t_tau_max()
-        #self.proj_xfr_t_tau_min()
-        self.eval_xfr_t_phi_max()
-        self.eval_xfr_t_phi_min()
-        #self.proj_xfr_t_phi_max()
-        #self.proj_xfr_t_phi_min()
-
-        # AC branch switching
-        self.eval_acl_t_u_su()
-        self.eval_acl_t_u_sd()
-        self.eval_xfr_t_u_su()
-        self.eval_xfr_t_u_sd()
-
-        # AC branch p/q
-        self.eval_acl_t_p_q_fr_to()
-        self.eval_xfr_t_p_q_fr_to()
-
-        # AC branch s max
-        self.eval_acl_t_s_max_fr_to()
-        self.eval_xfr_t_s_max_fr_to()
-
-        #self.eval_acl_t_u_su_sd_test()
+        if mode == 'first_violation':
+            return self.run_first_violation()
+        elif mode != 'all':
+            raise ValueError('unknown mode: {}'.format(mode))
 
-        # simple dispatchable device
-        # p_on, p_su, p_sd, q
-        # bounds and constraints - no projection yet
-        self.eval_sd_t_su_sd_trajectories()
-        self.eval_pr_t_p_on_max()
-        self.eval_cs_t_p_on_max()
-        self.eval_pr_t_p_on_min()
-        self.eval_cs_t_p_on_min()
-        self.eval_pr_t_p_off_max()
-        self.eval_cs_t_p_off_max()
-        self.eval_pr_t_p_off_min()
-        self.eval_cs_t_p_off_min()
-        self.eval_sd_t_p()
-        self.eval_sd_t_p_ramp_up_dn()
-        self.eval_sd_max_energy()
-        self.eval_sd_min_energy()
-        self.eval_sd_t_p_rgu_nonneg()
-        self.eval_sd_t_p_rgd_nonneg()
-        self.eval_sd_t_p_scr_nonneg()
-        self.eval_sd_t_p_nsc_nonneg()
-        self.eval_sd_t_p_rru_on_nonneg()
-        self.eval_sd_t_p_rru_off_nonneg()
-        self.eval_sd_t_p_rrd_on_nonneg()
-        self.eval_sd_t_p_rrd_off_nonneg()
-        self.eval_sd_t_q_qru_nonneg()
-        self.eval_sd_t_q_qrd_nonneg()
-        self.eval_sd_t_p_rgu_max()
-        self.eval_sd_t_p_rgd_max()
-        self.eval_sd_t_p_scr_max()
-        self.eval_sd_t_p_nsc_max()
-        self.eval_sd_t_p_rru_on_max()
-        self.eval_sd_t_p_rrd_on_max()
-        self.eval_sd_t_p_rru_off_max()
-        self.eval_sd_t_p_rrd_off_max()
-        self.eval_pr_t_q_max()
-        self.eval_pr_t_q_min()
-        self.eval_pr_t_q_p_max()
-        self.eval_pr_t_q_p_min()
-        self.eval_cs_t_q_max()
-        self.eval_cs_t_q_min()
-        self.eval_cs_t_q_p_max()
-        self.eval_cs_t_q_p_min()
-
-        # have to project p_on down onto [u_on*p_min, u_on*p_max] to make sense of reserves
-        # could account for ramping, max/min energy, and p-q constraints in projection
-        # on computing p_max_final and p_min_final, if p_min_final > p_max_final + tol, declare infeas
-        #self.proj_sd_t_p_on()
-        # then recompute p from p_on, p_su, p_sd based on projected p_on
-        #self.eval_sd_t_p()
-        # then project q
-        #self.proj_sd_t_q()
-
-        # simple dispatchable device
-        # dispatch costs
-        self.eval_sd_t_z_p()
-        # order needs to be: rgu -> scr -> nsc
-        # other reserve computations are mutually independent
-        self.eval_sd_t_z_rgu()
-        self.eval_sd_t_z_rgd()
-        self.eval_sd_t_z_scr()
-        self.eval_sd_t_z_nsc()
-        self.eval_sd_t_z_rru_on()
-        self.eval_sd_t_z_rrd_on()
-        self.eval_sd_t_z_rru_off()
-        self.eval_sd_t_z_rrd_off()
-        self.eval_sd_t_z_qru()
-        self.eval_sd_t_z_qrd()
+        if num_workers is None:
+            num_workers = self.config.get('eval_num_workers', 1)
+        if targets is None:
+            steps = list(range(len(self.eval_steps)))
+        else:
+            steps = self.get_eval_steps_for_targets(targets)
+        if num_workers <= 1:
+            for j in steps:
+                getattr(self, self.eval_steps[j]['name'])()
+        else:
+            self.run_parallel(num_workers, steps)
+
+    def run_first_violation(self):
+        '''
+        check the summary items with a tolerance one at a time, cheapest first,
+        running only the eval steps not already run for earlier items,
+        and stop at the first item violating its tolerance.
+        the cost of an item is the total cost of the eval steps it still needs.
+        sets feas and infeas, but not the objective.
+        returns {key: val} for the violated item, or {} if feasible.
+        '''
+
+        step_cost = [s.get('cost', 1) for s in self.eval_steps]
+        items = {i['key']: i['tol'] for i in self.summary_structure if i['tol'] is not None}
+        item_steps = {k: self.get_eval_steps_for_targets([k]) for k in items.keys()}
+        steps_done = set()
+        infeas_summary = {}
+        while len(item_steps) > 0:
+            key = min(
+                item_steps.keys(),
+                key=(lambda k: sum([step_cost[j] for j in item_steps[k] if j not in steps_done])))
+            for j in item_steps.pop(key):
+                if j not in steps_done:
+                    getattr(self, self.eval_steps[j]['name'])()
+                    steps_done.add(j)
+            val = getattr(self, key, None)
+            if self.item_violates_tol(val, items[key]):
+                infeas_summary = {key: val}
+                break
+        if len(infeas_summary) > 0:
+            self.feas = 0
+            self.infeas = 1
+        else:
+            self.feas = 1
+            self.infeas = 0
+        return infeas_summary
 
-        # simple dispatchable device
-        # max/min energy soft constraint violation costs
-        # todo - maybe
-
-        # bus p/q balance
-        self.eval_bus_t_p()
-        self.eval_bus_t_q()
-
-        # zonal reserve balance
-        self.eval_prz_t_z_rgu()
-        self.eval_prz_t_z_rgd()
-        self.eval_prz_t_z_scr()
-        self.eval_prz_t_z_nsc()
-        self.eval_prz_t_z_rru()
-        self.eval_prz_t_z_rrd()
-        self.eval_qrz_t_z_qru()
-        self.eval_qrz_t_z_qrd()
-
-        # connectedness - each time interval, base case and contingencies
-        self.eval_connectedness()
-
-        # contingency DC power flow solve
-        self.eval_post_contingency_model()
-
-        # objective - net market surplus
-        self.eval_t_k_z()
-        self.eval_t_z_base()
-        self.eval_t_z_k_worst_case()
-        self.eval_t_z_k_average_case()
-        self.eval_t_z()
-        self.eval_z_base()
-        self.eval_z_k_worst_case()
-        self.eval_z_k_average_case()
-        self.eval_z()
-
-        # feasibility determination
-        self.eval_infeas()
+    def run_parallel(self, num_workers, steps):
+        '''
+        run the eval steps with indices in steps on a thread pool,
+        respecting the dependencies from get_eval_step_deps
+        '''
+
+        step_deps = self.get_eval_step_deps()
+        steps_set = set(steps)
+        step_num_deps_remaining = {j: len([i for i in step_deps[j] if i in steps_set]) for j in steps}
+        step_dependents = {j: [] for j in steps}
+        for j in steps:
+            for i in step_deps[j]:
+                if i in steps_set:
+                    step_dependents[i].append(j)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+            running = {}
+            for j in steps:
+                if step_num_deps_remaining[j] == 0:
+                    running[executor.submit(getattr(self, self.eval_steps[j]['name']))] = j
+            while len(running) > 0:
+                done, not_done = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for f in done:
+                    i = running.pop(f)
+                    f.result() # raises any exception from the step
+                    for j in step_dependents[i]:
+                        step_num_deps_remaining[j] -= 1
+                        if step_num_deps_remaining[j] == 0:
+                            running[executor.submit(getattr(self, self.eval_steps[j]['name']))] = j
+
+    def get_eval_steps_for_targets(self, targets):
+        '''
+        return the indices, in serial order, of the eval steps needed to compute the attributes in targets.
+        a step is needed if it writes a target, or if it writes something read by a later needed step.
+        '''
+
+        step_reads = [set(s['reads']) for s in self.eval_steps]
+        step_writes = [set(s['writes']) for s in self.eval_steps]
+        all_writes = set().union(*step_writes)
+        unknown = [t for t in targets if t not in all_writes]
+        if len(unknown) > 0:
+            raise ValueError('targets not computed by any eval step: {}'.format(unknown))
+
+        required = set(targets)
+        steps = []
+        for j in reversed(range(len(self.eval_steps))):
+            if not step_writes[j].isdisjoint(required):
+                steps.append(j)
+                required.update(step_reads[j])
+        steps.reverse()
+        return steps
+
+    def get_eval_step_deps(self):
+        '''
+        return, for each eval step j, the list of earlier steps i that j depends on.
+        j depends on i if i writes something that j reads or writes,
+        or if i reads something that j writes.
+        work arrays are per thread (see WorkArray), so they do not create dependencies.
+        '''
+
+        step_reads = [set(s['reads']) for s in self.eval_steps]
+        step_writes = [set(s['writes']) for s in self.eval_steps]
+        step_deps = [
+            [i for i in range(j)
+             if (not step_writes[i].isdisjoint(step_reads[j]) or
+                 not step_writes[i].isdisjoint(step_writes[j]) or
+                 not step_reads[i].isdisjoint(step_writes[j]))]
+            for j in range(len(self.eval_steps))]
+        return step_deps
+
+    def set_eval_steps(self):
+        '''
+        eval steps, in serial order, with the evaluator attributes each one reads and writes.
+        problem data and config are constant and not listed.
+        cost is a rough relative run time, default 1, used to order the checks in first_violation mode.
+        the reads and writes determine which steps can run concurrently in run(),
+        so any change to the attributes used by an eval_* method needs to be reflected here.
+        '''
+
+        # the feasibility determination reads every summary item with a tolerance
+        infeas_reads = [i['key'] for i in self.summary_structure if i['tol'] is not None]
+
+        self.eval_steps = [
+            # simple dispatchable device
+            # on/off state
+            {'name': 'eval_sd_t_u_on_max',
+             'reads': ['sd_t_u_on'],
+             'writes': ['viol_sd_t_u_on_max']},
+            {'name': 'eval_sd_t_u_on_min',
+             'reads': ['sd_t_u_on'],
+             'writes': ['viol_sd_t_u_on_min']},
+            {'name': 'eval_sd_t_d_up_dn',
+             'reads': ['sd_t_u_on'],
+             'writes': ['sd_t_d_dn_start', 'sd_t_d_up_start']},
+            {'name': 'eval_sd_t_u_su_sd',
+             'reads': ['sd_t_u_on'],
+             'writes': ['sd_t_u_sd', 'sd_t_u_su', 'sum_sd_t_sd', 'sum_sd_t_su']},
+            {'name': 'eval_sd_t_d_up_min',
+             'reads': ['sd_t_d_up_start', 'sd_t_u_sd'],
+             'writes': ['viol_sd_t_d_up_min']},
+            {'name': 'eval_sd_t_d_dn_min',
+             'reads': ['sd_t_d_dn_start', 'sd_t_u_su'],
+             'writes': ['viol_sd_t_d_dn_min']},
+            {'name': 'eval_sd_t_z_on',
+             'reads': ['sd_t_u_on', 'sd_t_z'],
+             'writes': ['sd_t_z', 'sum_sd_t_z_on', 't_sum_sd_t_z_on']},
+            {'name': 'eval_sd_t_z_su',
+             'reads': ['sd_t_u_su', 'sd_t_z'],
+             'writes': ['sd_t_z', 'sum_sd_t_z_su', 't_sum_sd_t_z_su']},
+            {'name': 'eval_sd_t_z_sd',
+             'reads': ['sd_t_u_sd', 'sd_t_z'],
+             'writes': ['sd_t_z', 'sum_sd_t_z_sd', 't_sum_sd_t_z_sd']},
+            {'name': 'eval_sd_max_startup', 'cost': 5,
+             'reads': ['sd_t_u_su'],
+             'writes': ['viol_sd_max_startup_constr']},
+            {'name': 'eval_sd_t_z_sus',
+             'reads': ['sd_t_d_dn_start', 'sd_t_u_su'],
+             'writes': ['sum_sd_t_z_sus', 't_sum_sd_t_z_sus']},
+
+            # bus voltage
+            {'name': 'eval_bus_t_v_max',
+             'reads': ['bus_t_v'],
+             'writes': ['viol_bus_t_v_max']},
+            {'name': 'eval_bus_t_v_min',
+             'reads': ['bus_t_v'],
+             'writes': ['viol_bus_t_v_min']},
+            #self.proj_bus_t_v_max()
+            #self.proj_bus_t_v_min()
+
+            # shunts
+            # no proj needed because integer
+            {'name': 'eval_sh_t_u_st_max',
+             'reads': ['sh_t_u_st'],
+             'writes': ['viol_sh_t_u_st_max']},
+            {'name': 'eval_sh_t_u_st_min',
+             'reads': ['sh_t_u_st'],
+             'writes': ['viol_sh_t_u_st_min']},
+            {'name': 'eval_sh_t_p_q',
+             'reads': ['bus_t_v', 'sh_t_u_st'],
+             'writes': ['sh_t_p', 'sh_t_q']},
+
+            # DC line bounds
+            {'name': 'eval_dcl_t_p_max',
+             'reads': ['dcl_t_p'],
+             'writes': ['viol_dcl_t_p_max']},
+            {'name': 'eval_dcl_t_p_min',
+             'reads': ['dcl_t_p'],
+             'writes': ['viol_dcl_t_p_min']},
+            #self.proj_dcl_t_p_max()
+            #self.proj_dcl_t_p_min()
+            {'name': 'eval_dcl_t_q_fr_max',
+             'reads': ['dcl_t_q_fr'],
+             'writes': ['viol_dcl_t_q_fr_max']},
+            {'name': 'eval_dcl_t_q_fr_min',
+             'reads': ['dcl_t_q_fr'],
+             'writes': ['viol_dcl_t_q_fr_min']},
+            #self.proj_dcl_t_q_fr_max()
+            #self.proj_dcl_t_q_fr_min()
+            {'name': 'eval_dcl_t_q_to_max',
+             'reads': ['dcl_t_q_to'],
+             'writes': ['viol_dcl_t_q_to_max']},
+            {'name': 'eval_dcl_t_q_to_min',
+             'reads': ['dcl_t_q_to'],
+             'writes': ['viol_dcl_t_q_to_min']},
+            #self.proj_dcl_t_q_to_max()
+            #self.proj_dcl_t_q_to_min()
+
+            # transformer controls
+            {'name': 'eval_xfr_t_tau_max',
+             'reads': ['xfr_t_tau'],
+             'writes': ['viol_xfr_t_tau_max']},
+            {'name': 'eval_xfr_t_tau_min',
+             'reads': ['xfr_t_tau'],
+             'writes': ['viol_xfr_t_tau_min']},
+            #self.proj_xfr_t_tau_max()
+            #self.proj_xfr_t_tau_min()
+            {'name': 'eval_xfr_t_phi_max',
+             'reads': ['xfr_t_phi'],
+             'writes': ['viol_xfr_t_phi_max']},
+            {'name': 'eval_xfr_t_phi_min',
+             'reads': ['xfr_t_phi'],
+             'writes': ['viol_xfr_t_phi_min']},
+            #self.proj_xfr_t_phi_max()
+            #self.proj_xfr_t_phi_min()
+
+            # AC branch switching
+            {'name': 'eval_acl_t_u_su',
+             'reads': ['acl_t_u_on'],
+             'writes': ['sum_acl_t_u_su', 'sum_acl_t_z_su', 't_sum_acl_t_z_su', 'viol_acl_t_u_su_max']},
+            {'name': 'eval_acl_t_u_sd',
+             'reads': ['acl_t_u_on'],
+             'writes': ['sum_acl_t_u_sd', 'sum_acl_t_z_sd', 't_sum_acl_t_z_sd', 'viol_acl_t_u_sd_max']},
+            {'name': 'eval_xfr_t_u_su',
+             'reads': ['xfr_t_u_on'],
+             'writes': ['sum_xfr_t_u_su', 'sum_xfr_t_z_su', 't_sum_xfr_t_z_su', 'viol_xfr_t_u_su_max']},
+            {'name': 'eval_xfr_t_u_sd',
+             'reads': ['xfr_t_u_on'],
+             'writes': ['sum_xfr_t_u_sd', 'sum_xfr_t_z_sd', 't_sum_xfr_t_z_sd', 'viol_xfr_t_u_sd_max']},
+
+            # AC branch p/q
+            {'name': 'eval_acl_t_p_q_fr_to', 'cost': 3,
+             'reads': ['acl_t_u_on', 'bus_t_theta', 'bus_t_v'],
+             'writes': ['acl_t_p_fr', 'acl_t_p_to', 'acl_t_q_fr', 'acl_t_q_to']},
+            {'name': 'eval_xfr_t_p_q_fr_to', 'cost': 3,
+             'reads': ['bus_t_theta', 'bus_t_v', 'xfr_t_phi', 'xfr_t_tau', 'xfr_t_u_on'],
+             'writes': ['xfr_t_p_fr', 'xfr_t_p_to', 'xfr_t_q_fr', 'xfr_t_q_to']},
+
+            # AC branch s max
+            {'name': 'eval_acl_t_s_max_fr_to',
+             'reads': ['acl_t_p_fr', 'acl_t_p_to', 'acl_t_q_fr', 'acl_t_q_to'],
+             'writes': ['sum_acl_t_z_s', 't_sum_acl_t_z_s', 'viol_acl_t_s_max']},
+            {'name': 'eval_xfr_t_s_max_fr_to',
+             'reads': ['xfr_t_p_fr', 'xfr_t_p_to', 'xfr_t_q_fr', 'xfr_t_q_to'],
+             'writes': ['sum_xfr_t_z_s', 't_sum_xfr_t_z_s', 'viol_xfr_t_s_max']},
+
+            #self.eval_acl_t_u_su_sd_test()
+
+            # simple dispatchable device
+            # p_on, p_su, p_sd, q
+            # bounds and constraints - no projection yet
+            {'name': 'eval_sd_t_su_sd_trajectories', 'cost': 5,
+             'reads': ['sd_t_u_on', 'sd_t_u_sd', 'sd_t_u_su'],
+             'writes': ['sd_t_p_sd', 'sd_t_p_su', 'sd_t_u_on_su_sd']},
+            {'name': 'eval_pr_t_p_on_max',
+             'reads': ['sd_t_p_on', 'sd_t_p_rgu', 'sd_t_p_rru_on', 'sd_t_p_scr', 'sd_t_u_on'],
+             'writes': ['viol_pr_t_p_on_max']},
+            {'name': 'eval_cs_t_p_on_max',
+             'reads': ['sd_t_p_on', 'sd_t_p_rgd', 'sd_t_p_rrd_on', 'sd_t_u_on'],
+             'writes': ['viol_cs_t_p_on_max']},
+            {'name': 'eval_pr_t_p_on_min',
+             'reads': ['sd_t_p_on', 'sd_t_p_rgd', 'sd_t_p_rrd_on', 'sd_t_u_on'],
+             'writes': ['viol_pr_t_p_on_min']},
+            {'name': 'eval_cs_t_p_on_min',
+             'reads': ['sd_t_p_on', 'sd_t_p_rgu', 'sd_t_p_rru_on', 'sd_t_p_scr', 'sd_t_u_on'],
+             'writes': ['viol_cs_t_p_on_min']},
+            {'name': 'eval_pr_t_p_off_max',
+             'reads': ['sd_t_p_nsc', 'sd_t_p_rru_off', 'sd_t_p_sd', 'sd_t_p_su', 'sd_t_u_on'],
+             'writes': ['viol_pr_t_p_off_max']},
+            {'name': 'eval_cs_t_p_off_max',
+             'reads': ['sd_t_p_rrd_off', 'sd_t_p_sd', 'sd_t_p_su', 'sd_t_u_on'],
+             'writes': ['viol_cs_t_p_off_max']},
+            {'name': 'eval_pr_t_p_off_min',
+             'reads': ['sd_t_p_rrd_off'],
+             'writes': ['viol_pr_t_p_off_min']},
+            {'name': 'eval_cs_t_p_off_min',
+             'reads': ['sd_t_p_nsc', 'sd_t_p_rru_off'],
+             'writes': ['viol_cs_t_p_off_min']},
+            {'name': 'eval_sd_t_p',
+             'reads': ['sd_t_p_on', 'sd_t_p_sd', 'sd_t_p_su'],
+             'writes': ['sd_t_p']},
+            {'name': 'eval_sd_t_p_ramp_up_dn',
+             'reads': ['sd_t_p', 'sd_t_u_on', 'sd_t_u_su'],
+             'writes': ['viol_sd_t_p_ramp_dn_max', 'viol_sd_t_p_ramp_up_max']},
+            {'name': 'eval_sd_max_energy', 'cost': 5,
+             'reads': ['sd_t_p'],
+             'writes': ['viol_sd_max_energy_constr']},
+            {'name': 'eval_sd_min_energy', 'cost': 5,
+             'reads': ['sd_t_p'],
+             'writes': ['viol_sd_min_energy_constr']},
+            {'name': 'eval_sd_t_p_rgu_nonneg',
+             'reads': ['sd_t_p_rgu'],
+             'writes': ['viol_sd_t_p_rgu_nonneg']},
+            {'name': 'eval_sd_t_p_rgd_nonneg',
+             'reads': ['sd_t_p_rgd'],
+             'writes': ['viol_sd_t_p_rgd_nonneg']},
+            {'name': 'eval_sd_t_p_scr_nonneg',
+             'reads': ['sd_t_p_scr'],
+             'writes': ['viol_sd_t_p_scr_nonneg']},
+            {'name': 'eval_sd_t_p_nsc_nonneg',
+             'reads': ['sd_t_p_nsc'],
+             'writes': ['viol_sd_t_p_nsc_nonneg']},
+            {'name': 'eval_sd_t_p_rru_on_nonneg',
+             'reads': ['sd_t_p_rru_on'],
+             'writes': ['viol_sd_t_p_rru_on_nonneg']},
+            {'name': 'eval_sd_t_p_rru_off_nonneg',
+             'reads': ['sd_t_p_rru_off'],
+             'writes': ['viol_sd_t_p_rru_off_nonneg']},
+            {'name': 'eval_sd_t_p_rrd_on_nonneg',
+             'reads': ['sd_t_p_rrd_on'],
+             'writes': ['viol_sd_t_p_rrd_on_nonneg']},
+            {'name': 'eval_sd_t_p_rrd_off_nonneg',
+             'reads': ['sd_t_p_rrd_off'],
+             'writes': ['viol_sd_t_p_rrd_off_nonneg']},
+            {'name': 'eval_sd_t_q_qru_nonneg',
+             'reads': ['sd_t_q_qru'],
+             'writes': ['viol_sd_t_q_qru_nonneg']},
+            {'name': 'eval_sd_t_q_qrd_nonneg',
+             'reads': ['sd_t_q_qrd'],
+             'writes': ['viol_sd_t_q_qrd_nonneg']},
+            {'name': 'eval_sd_t_p_rgu_max',
+             'reads': ['sd_t_p_rgu', 'sd_t_u_on'],
+             'writes': ['viol_sd_t_p_rgu_max']},
+            {'name': 'eval_sd_t_p_rgd_max',
+             'reads': ['sd_t_p_rgd', 'sd_t_u_on'],
+             'writes': ['viol_sd_t_p_rgd_max']},
+            {'name': 'eval_sd_t_p_scr_max',
+             'reads': ['sd_t_p_rgu', 'sd_t_p_scr', 'sd_t_u_on'],
+             'writes': ['viol_sd_t_p_scr_max']},
+            {'name': 'eval_sd_t_p_nsc_max',
+             'reads': ['sd_t_p_nsc', 'sd_t_u_on'],
+             'writes': ['viol_sd_t_p_nsc_max']},
+            {'name': 'eval_sd_t_p_rru_on_max',
+             'reads': ['sd_t_p_rgu', 'sd_t_p_rru_on', 'sd_t_p_scr', 'sd_t_u_on'],
+             'writes': ['viol_sd_t_p_rru_on_max']},
+            {'name': 'eval_sd_t_p_rrd_on_max',
+             'reads': ['sd_t_p_rgd', 'sd_t_p_rrd_on', 'sd_t_u_on'],
+             'writes': ['viol_sd_t_p_rrd_on_max']},
+            {'name': 'eval_sd_t_p_rru_off_max',
+             'reads': ['sd_t_p_nsc', 'sd_t_p_rru_off', 'sd_t_u_on'],
+             'writes': ['viol_sd_t_p_rru_off_max']},
+            {'name': 'eval_sd_t_p_rrd_off_max',
+             'reads': ['sd_t_p_rrd_off', 'sd_t_u_on'],
+             'writes': ['viol_sd_t_p_rrd_off_max']},
+            {'name': 'eval_pr_t_q_max',
+             'reads': ['sd_t_q', 'sd_t_q_qru', 'sd_t_u_on_su_sd'],
+             'writes': ['viol_pr_t_q_max']},
+            {'name': 'eval_pr_t_q_min',
+             'reads': ['sd_t_q', 'sd_t_q_qrd', 'sd_t_u_on_su_sd'],
+             'writes': ['viol_pr_t_q_min']},
+            {'name': 'eval_pr_t_q_p_max',
+             'reads': ['sd_t_p', 'sd_t_q', 'sd_t_q_qru', 'sd_t_u_on_su_sd'],
+             'writes': ['viol_pr_t_q_p_max']},
+            {'name': 'eval_pr_t_q_p_min',
+             'reads': ['sd_t_p', 'sd_t_q', 'sd_t_q_qrd', 'sd_t_u_on_su_sd'],
+             'writes': ['viol_pr_t_q_p_min']},
+            {'name': 'eval_cs_t_q_max',
+             'reads': ['sd_t_q', 'sd_t_q_qrd', 'sd_t_u_on_su_sd'],
+             'writes': ['viol_cs_t_q_max']},
+            {'name': 'eval_cs_t_q_min',
+             'reads': ['sd_t_q', 'sd_t_q_qru', 'sd_t_u_on_su_sd'],
+             'writes': ['viol_cs_t_q_min']},
+            {'name': 'eval_cs_t_q_p_max',
+             'reads': ['sd_t_p', 'sd_t_q', 'sd_t_q_qrd', 'sd_t_u_on_su_sd'],
+             'writes': ['viol_cs_t_q_p_max']},
+            {'name': 'eval_cs_t_q_p_min',
+             'reads': ['sd_t_p', 'sd_t_q', 'sd_t_q_qru', 'sd_t_u_on_su_sd'],
+             'writes': ['viol_cs_t_q_p_min']},
+
+            # have to project p_on down onto [u_on*p_min, u_on*p_max] to make sense of reserves
+            # could account for ramping, max/min energy, and p-q constraints in projection
+            # on computing p_max_final and p_min_final, if p_min_final > p_max_final + tol, declare infeas
+            #self.proj_sd_t_p_on()
+            # then recompute p from p_on, p_su, p_sd based on projected p_on
+            #self.eval_sd_t_p()
+            # then project q
+            #self.proj_sd_t_q()
+
+            # simple dispatchable device
+            # dispatch costs
+            {'name': 'eval_sd_t_z_p', 'cost': 10,
+             'reads': ['sd_t_p'],
+             'writes': ['sum_cs_t_z_p', 'sum_pr_t_z_p', 't_sum_cs_t_z_p', 't_sum_pr_t_z_p']},
+            # order needs to be: rgu -> scr -> nsc
+            # other reserve computations are mutually independent
+            {'name': 'eval_sd_t_z_rgu',
+             'reads': ['sd_t_p_rgu'],
+             'writes': ['sum_sd_t_z_rgu', 't_sum_sd_t_z_rgu']},
+            {'name': 'eval_sd_t_z_rgd',
+             'reads': ['sd_t_p_rgd'],
+             'writes': ['sum_sd_t_z_rgd', 't_sum_sd_t_z_rgd']},
+            {'name': 'eval_sd_t_z_scr',
+             'reads': ['sd_t_p_scr'],
+             'writes': ['sum_sd_t_z_scr', 't_sum_sd_t_z_scr']},
+            {'name': 'eval_sd_t_z_nsc',
+             'reads': ['sd_t_p_nsc'],
+             'writes': ['sum_sd_t_z_nsc', 't_sum_sd_t_z_nsc']},
+            {'name': 'eval_sd_t_z_rru_on',
+             'reads': ['sd_t_p_rru_on'],
+             'writes': ['sum_sd_t_z_rru_on', 't_sum_sd_t_z_rru_on']},
+            {'name': 'eval_sd_t_z_rrd_on',
+             'reads': ['sd_t_p_rrd_on'],
+             'writes': ['sum_sd_t_z_rrd_on', 't_sum_sd_t_z_rrd_on']},
+            {'name': 'eval_sd_t_z_rru_off',
+             'reads': ['sd_t_p_rru_off'],
+             'writes': ['sum_sd_t_z_rru_off', 't_sum_sd_t_z_rru_off']},
+            {'name': 'eval_sd_t_z_rrd_off',
+             'reads': ['sd_t_p_rrd_off'],
+             'writes': ['sum_sd_t_z_rrd_off', 't_sum_sd_t_z_rrd_off']},
+            {'name': 'eval_sd_t_z_qru',
+             'reads': ['sd_t_q_qru'],
+             'writes': ['sum_sd_t_z_qru', 't_sum_sd_t_z_qru']},
+            {'name': 'eval_sd_t_z_qrd',
+             'reads': ['sd_t_q_qrd'],
+             'writes': ['sum_sd_t_z_qrd', 't_sum_sd_t_z_qrd']},
+
+            # simple dispatchable device
+            # max/min energy soft constraint violation costs
+
+            # bus p/q balance
+            {'name': 'eval_bus_t_p',
+             'reads': ['acl_t_p_fr', 'acl_t_p_to', 'bus_acl_fr_inj_mat', 'bus_acl_to_inj_mat', 'bus_dcl_fr_inj_mat',
+                       'bus_dcl_to_inj_mat', 'bus_sd_inj_mat', 'bus_sh_inj_mat', 'bus_xfr_fr_inj_mat', 'bus_xfr_to_inj_mat',
+                       'dcl_t_p', 'sd_t_p', 'sh_t_p', 'xfr_t_p_fr', 'xfr_t_p_to'],
+             'writes': ['sum_bus_t_z_p', 't_sum_bus_t_z_p', 'viol_bus_t_p_balance_max', 'viol_bus_t_p_balance_min']},
+            {'name': 'eval_bus_t_q',
+             'reads': ['acl_t_q_fr', 'acl_t_q_to', 'bus_acl_fr_inj_mat', 'bus_acl_to_inj_mat', 'bus_dcl_fr_inj_mat',
+                       'bus_dcl_to_inj_mat', 'bus_sd_inj_mat', 'bus_sh_inj_mat', 'bus_xfr_fr_inj_mat', 'bus_xfr_to_inj_mat',
+                       'dcl_t_q_fr', 'dcl_t_q_to', 'sd_t_q', 'sh_t_q', 'xfr_t_q_fr', 'xfr_t_q_to'],
+             'writes': ['sum_bus_t_z_q', 't_sum_bus_t_z_q', 'viol_bus_t_q_balance_max', 'viol_bus_t_q_balance_min']},
+
+            # zonal reserve balance
+            {'name': 'eval_prz_t_z_rgu',
+             'reads': ['prz_sd_inc_mat', 'sd_t_p', 'sd_t_p_rgu'],
+             'writes': ['prz_t_p_rgu_scr_nsc_net_req', 'sum_prz_t_z_rgu', 't_sum_prz_t_z_rgu',
+                        'viol_prz_t_p_rgu_balance']},
+            {'name': 'eval_prz_t_z_rgd',
+             'reads': ['prz_sd_inc_mat', 'sd_t_p', 'sd_t_p_rgd'],
+             'writes': ['sum_prz_t_z_rgd', 't_sum_prz_t_z_rgd', 'viol_prz_t_p_rgd_balance']},
+            {'name': 'eval_prz_t_z_scr',
+             'reads': ['prz_sd_inc_mat', 'prz_t_p_rgu_scr_nsc_net_req', 'sd_t_p', 'sd_t_p_scr'],
+             'writes': ['prz_t_p_rgu_scr_nsc_net_req', 'sum_prz_t_z_scr', 't_sum_prz_t_z_scr',
+                        'viol_prz_t_p_scr_balance']},
+            {'name': 'eval_prz_t_z_nsc',
+             'reads': ['prz_sd_inc_mat', 'prz_t_p_rgu_scr_nsc_net_req', 'sd_t_p', 'sd_t_p_nsc'],
+             'writes': ['prz_t_p_rgu_scr_nsc_net_req', 'sum_prz_t_z_nsc', 't_sum_prz_t_z_nsc',
+                        'viol_prz_t_p_nsc_balance']},
+            {'name': 'eval_prz_t_z_rru',
+             'reads': ['prz_sd_inc_mat', 'sd_t_p_rru_off', 'sd_t_p_rru_on'],
+             'writes': ['sum_prz_t_z_rru', 't_sum_prz_t_z_rru', 'viol_prz_t_p_rru_balance']},
+            {'name': 'eval_prz_t_z_rrd',
+             'reads': ['prz_sd_inc_mat', 'sd_t_p_rrd_off', 'sd_t_p_rrd_on'],
+             'writes': ['sum_prz_t_z_rrd', 't_sum_prz_t_z_rrd', 'viol_prz_t_p_rrd_balance']},
+            {'name': 'eval_qrz_t_z_qru',
+             'reads': ['qrz_sd_inc_mat', 'sd_t_q_qru'],
+             'writes': ['sum_qrz_t_z_qru', 't_sum_qrz_t_z_qru', 'viol_qrz_t_q_qru_balance']},
+            {'name': 'eval_qrz_t_z_qrd',
+             'reads': ['qrz_sd_inc_mat', 'sd_t_q_qrd'],
+             'writes': ['sum_qrz_t_z_qrd', 't_sum_qrz_t_z_qrd', 'viol_qrz_t_q_qrd_balance']},
+
+            # connectedness - each time interval, base case and contingencies
+            {'name': 'eval_connectedness', 'cost': 20,
+             'reads': ['acl_t_u_on', 'xfr_t_u_on'],
+             'writes': ['info_i_i_k_t_disconnected_ctg', 'info_i_i_t_disconnected_base',
+                        't_connected_components_base', 't_ctg_bridges', 'viol_t_connected_base', 'viol_t_connected_ctg']},
+
+            # contingency DC power flow solve
+            {'name': 'eval_post_contingency_model', 'cost': 100,
+             'reads': ['acl_t_q_fr', 'acl_t_q_to', 'acl_t_u_on', 'bus_acl_fr_inj_mat', 'bus_acl_to_inj_mat',
+                       'bus_dcl_fr_inj_mat', 'bus_dcl_to_inj_mat', 'bus_sd_inj_mat', 'bus_sh_inj_mat', 'bus_xfr_fr_inj_mat',
+                       'bus_xfr_to_inj_mat', 'dcl_t_p', 'sd_t_p', 'sh_t_p', 'viol_t_connected_base', 'viol_t_connected_ctg',
+                       'xfr_t_phi', 'xfr_t_q_fr', 'xfr_t_q_to', 'xfr_t_u_on'],
+             'writes': ['t_k_z', 'viol_acl_acl_t_s_max_ctg', 'viol_acl_dcl_t_s_max_ctg', 'viol_acl_xfr_t_s_max_ctg',
+                        'viol_xfr_acl_t_s_max_ctg', 'viol_xfr_dcl_t_s_max_ctg', 'viol_xfr_xfr_t_s_max_ctg']},
+
+            # objective - net market surplus
+            {'name': 'eval_t_k_z',
+             'reads': ['t_k_z'],
+             'writes': ['t_min_t_k_z']},
+            {'name': 'eval_t_z_base',
+             'reads': ['t_sum_acl_t_z_s', 't_sum_acl_t_z_sd', 't_sum_acl_t_z_su', 't_sum_bus_t_z_p',
+                       't_sum_bus_t_z_q', 't_sum_cs_t_z_p', 't_sum_pr_t_z_p', 't_sum_prz_t_z_nsc', 't_sum_prz_t_z_rgd',
+                       't_sum_prz_t_z_rgu', 't_sum_prz_t_z_rrd', 't_sum_prz_t_z_rru', 't_sum_prz_t_z_scr', 't_sum_qrz_t_z_qrd',
+                       't_sum_qrz_t_z_qru', 't_sum_sd_t_z_nsc', 't_sum_sd_t_z_on', 't_sum_sd_t_z_qrd', 't_sum_sd_t_z_qru',
+                       't_sum_sd_t_z_rgd', 't_sum_sd_t_z_rgu', 't_sum_sd_t_z_rrd_off', 't_sum_sd_t_z_rrd_on',
+                       't_sum_sd_t_z_rru_off', 't_sum_sd_t_z_rru_on', 't_sum_sd_t_z_scr', 't_sum_sd_t_z_sd', 't_sum_sd_t_z_su',
+                       't_sum_sd_t_z_sus', 't_sum_xfr_t_z_s', 't_sum_xfr_t_z_sd', 't_sum_xfr_t_z_su'],
+             'writes': ['t_z_base']},
+            {'name': 'eval_t_z_k_worst_case',
+             'reads': ['t_k_z'],
+             'writes': ['t_z_k_worst_case']},
+            {'name': 'eval_t_z_k_average_case',
+             'reads': ['t_k_z'],
+             'writes': ['t_z_k_average_case']},
+            {'name': 'eval_t_z',
+             'reads': ['t_z_base', 't_z_k_average_case', 't_z_k_worst_case'],
+             'writes': ['t_z']},
+            {'name': 'eval_z_base',
+             'reads': ['t_z_base'],
+             'writes': ['z_base']},
+            {'name': 'eval_z_k_worst_case',
+             'reads': ['t_z_k_worst_case'],
+             'writes': ['z_k_worst_case']},
+            {'name': 'eval_z_k_average_case',
+             'reads': ['t_z_k_average_case'],
+             'writes': ['z_k_average_case']},
+            {'name': 'eval_z',
+             'reads': ['t_z'],
+             'writes': ['z']},
+
+            # feasibility determination
+            {'name': 'eval_infeas',
+             'reads': infeas_reads,
+             'writes': ['feas', 'infeas']},
+        ]
 
     @utils.timeit
     def set_summary(self):
@@ -731,8 +1195,27 @@ class SolutionEvaluator(object):
         # set up the summary items based on the structure
         for i in self.summary_structure:
             assert(not hasattr(self, i['key']))
+        self.reset_summary()
+
+    def reset_summary(self):
+        '''
+        set the summary items to their initial values
+        '''
+
+        for i in self.summary_structure:
             setattr(self, i['key'], utils.make_empty_viol(val=i['val_type'](0), num_indices=i['num_indices']))
 
+    @utils.timeit
+    def set_next_solution(self, sol):
+        '''
+        prepare to evaluate another solution to the same problem,
+        reusing the work arrays and matrices
+        '''
+
+        self.reset_summary()
+        self.set_solution(sol)
+        self.set_solution_zero()
+
     @utils.timeit
     def set_problem(self, prob):
 
@@ -776,9 +1259,9 @@ class SolutionEvaluator(object):
         self.t_connected_components_base = numpy.zeros(shape=(self.problem.num_t, ), dtype=int)
         self.t_ctg_bridges = numpy.zeros(shape=(self.problem.num_t, ), dtype=int)
 
-        self.sd_t_u_su = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=int)
-        self.sd_t_u_sd = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=int)
-        self.sd_t_u_on_su_sd = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=int)
+        self.sd_t_u_su = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=arraydata.status_dtype)
+        self.sd_t_u_sd = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=arraydata.status_dtype)
+        self.sd_t_u_on_su_sd = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=arraydata.status_dtype)
         self.sd_t_z = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=float)
         self.sd_t_p = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=float)
         self.sd_t_d_up_start = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=float)
@@ -797,70 +1280,67 @@ class SolutionEvaluator(object):
         self.xfr_t_q_fr = numpy.zeros(shape=(self.problem.num_xfr, self.problem.num_t), dtype=float)
         self.xfr_t_q_to = numpy.zeros(shape=(self.problem.num_xfr, self.problem.num_t), dtype=float)
 
-    @utils.timeit
-    def set_work_zero(self):
+        # carried from rgu to scr to nsc, so not a work array
+        self.prz_t_p_rgu_scr_nsc_net_req = numpy.zeros(shape=(self.problem.num_prz, self.problem.num_t), dtype=float)
+
+    def set_work_shapes(self):
         '''
-        set working arrays
+        set the shape and dtype of each work array.
+        work arrays are not allocated here but in the work arena of each thread, on first use
         '''
-        
-        self.bus_float = numpy.zeros(shape=(self.problem.num_bus, ), dtype=float)
-        self.sh_float = numpy.zeros(shape=(self.problem.num_sh, ), dtype=float)
-        self.sd_float = numpy.zeros(shape=(self.problem.num_sd, ), dtype=float)
-        self.acl_float = numpy.zeros(shape=(self.problem.num_acl, ), dtype=float)
-        self.dcl_float = numpy.zeros(shape=(self.problem.num_dcl, ), dtype=float)
-        self.xfr_float = numpy.zeros(shape=(self.problem.num_xfr, ), dtype=float)
-        self.prz_float = numpy.zeros(shape=(self.problem.num_prz, ), dtype=float)
-        self.qrz_float = numpy.zeros(shape=(self.problem.num_qrz, ), dtype=float)
-        self.t_float = numpy.zeros(shape=(self.problem.num_t, ), dtype=float)
-        self.t_float_1 = numpy.zeros(shape=(self.problem.num_t, ), dtype=float)
-        self.k_float = numpy.zeros(shape=(self.problem.num_k, ), dtype=float)
-        
-        self.bus_int = numpy.zeros(shape=(self.problem.num_bus, ), dtype=int)
-        self.sh_int = numpy.zeros(shape=(self.problem.num_sh, ), dtype=int)
-        self.sd_int = numpy.zeros(shape=(self.problem.num_sd, ), dtype=int)
-        self.acl_int = numpy.zeros(shape=(self.problem.num_acl, ), dtype=int)
-        self.dcl_int = numpy.zeros(shape=(self.problem.num_dcl, ), dtype=int)
-        self.xfr_int = numpy.zeros(shape=(self.problem.num_xfr, ), dtype=int)
-        self.prz_int = numpy.zeros(shape=(self.problem.num_prz, ), dtype=int)
-        self.qrz_int = numpy.zeros(shape=(self.problem.num_qrz, ), dtype=int)
-        self.t_int = numpy.zeros(shape=(self.problem.num_t, ), dtype=int)
-        self.t_int_1 = numpy.zeros(shape=(self.problem.num_t, ), dtype=int)
-        self.t_int_2 = numpy.zeros(shape=(self.problem.num_t, ), dtype=int)
-        self.k_int = numpy.zeros(shape=(self.problem.num_k, ), dtype=int)
-
-        self.sd_t_int = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=int)
-        self.sd_t_float = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=float)
-        self.sd_t_float_1 = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=float)
-        self.sd_t_float_2 = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=float)
-
-        self.pr_t_float = numpy.zeros(shape=(self.problem.num_pr, self.problem.num_t), dtype=float)
-        self.cs_t_float = numpy.zeros(shape=(self.problem.num_cs, self.problem.num_t), dtype=float)
-
-        self.bus_t_float = numpy.zeros(shape=(self.problem.num_bus, self.problem.num_t), dtype=float)
-        self.bus_t_float_1 = numpy.zeros(shape=(self.problem.num_bus, self.problem.num_t), dtype=float)
-
-        self.sh_t_int = numpy.zeros(shape=(self.problem.num_sh, self.problem.num_t), dtype=int)
-        self.sh_t_float = numpy.zeros(shape=(self.problem.num_sh, self.problem.num_t), dtype=float)
-
-        self.dcl_t_float = numpy.zeros(shape=(self.problem.num_dcl, self.problem.num_t), dtype=float)
-
-        self.acl_t_int = numpy.zeros(shape=(self.problem.num_acl, self.problem.num_t), dtype=int)
-        self.acl_t_float = numpy.zeros(shape=(self.problem.num_acl, self.problem.num_t), dtype=float)
-        self.acl_t_float_1 = numpy.zeros(shape=(self.problem.num_acl, self.problem.num_t), dtype=float)
-        self.acl_t_float_2 = numpy.zeros(shape=(self.problem.num_acl, self.problem.num_t), dtype=float)
-
-        self.xfr_t_int = numpy.zeros(shape=(self.problem.num_xfr, self.problem.num_t), dtype=int)
-        self.xfr_t_float = numpy.zeros(shape=(self.problem.num_xfr, self.problem.num_t), dtype=float)
-        self.xfr_t_float_1 = numpy.zeros(shape=(self.problem.num_xfr, self.problem.num_t), dtype=float)
-        self.xfr_t_float_2 = numpy.zeros(shape=(self.problem.num_xfr, self.problem.num_t), dtype=float)
-
-        self.prz_t_float = numpy.zeros(shape=(self.problem.num_prz, self.problem.num_t), dtype=float)
-        self.prz_t_float_1 = numpy.zeros(shape=(self.problem.num_prz, self.problem.num_t), dtype=float)
-        self.prz_t_float_2 = numpy.zeros(shape=(self.problem.num_prz, self.problem.num_t), dtype=float)
-        self.qrz_t_float = numpy.zeros(shape=(self.problem.num_qrz, self.problem.num_t), dtype=float)
-        self.qrz_t_float_1 = numpy.zeros(shape=(self.problem.num_qrz, self.problem.num_t), dtype=float)
-        self.qrz_t_float_2 = numpy.zeros(shape=(self.problem.num_qrz, self.problem.num_t), dtype=float)
 
+        self.work_shapes = {
+            name: (tuple([getattr(self.problem, d) for d in dims]), dtype)
+            for name, (dims, dtype) in work_array_shapes.items()}
+
+    def get_work_arena(self):
+        '''
+        return the work arena of the current thread, creating it on first use in the thread
+        '''
+
+        arena = getattr(self.work_local, 'arena', None)
+        if arena is None:
+            arena = utils.BufferArena()
+            self.work_local.arena = arena
+            with self.work_arenas_lock:
+                self.work_arenas.append(arena)
+        return arena
+
+    def get_work_array(self, name):
+
+        shape, dtype = self.work_shapes[name]
+        return self.get_work_arena().get(name, shape, dtype)
+
+    def get_work_shapes_num_bytes(self):
+        '''
+        memory held in the work arena of one thread once every work array has been used
+        '''
+
+        return sum([
+            int(numpy.prod(shape)) * numpy.dtype(dtype).itemsize
+            for shape, dtype in self.work_shapes.values()])
+
+    def get_work_memory_info(self):
+        '''
+        memory held in work arrays, summed over the work arenas of all threads
+        '''
+
+        with self.work_arenas_lock:
+            info = [a.get_info() for a in self.work_arenas]
+        return {
+            'num_arenas': len(info),
+            'num_buffers': sum([i['num_buffers'] for i in info]),
+            'num_bytes': sum([i['num_bytes'] for i in info]),
+            'peak_num_bytes': sum([i['peak_num_bytes'] for i in info])}
+
+    def clear_work_arrays(self):
+        '''
+        release the work arrays of all threads. they are allocated again on next use
+        '''
+
+        with self.work_arenas_lock:
+            for a in self.work_arenas:
+                a.clear()
     @utils.timeit
     def set_matrices(self):
 
@@ -974,25 +1454,27 @@ class SolutionEvaluator(object):
 
         items = [i for i in items if i[1] is not None] # those that have a tolerance
 
-        items = [i for i in items if i[2] is not None] # those that have a summary item
-
-        # what type of summary item?
-        items_int = [i for i in items if isinstance(i[2], int)]
-        items_float = [i for i in items if isinstance(i[2], float)]
-        items_dict = [i for i in items if isinstance(i[2], dict)]
-
-        items_dict = [i for i in items_dict if i[2].get('val') is not None] # dict summary items should have a value
-
         # items violating the tolerance
-        items_int = [i for i in items_int if i[2] > i[1]]
-        items_float = [i for i in items_float if i[2] > i[1]]
-        items_dict = [i for i in items_dict if i[2]['val'] > i[1]]
-
-        items = items_int + items_float + items_dict
+        items = [i for i in items if self.item_violates_tol(i[2], i[1])]
         infeas_summary = {i[0]: i[2] for i in items}
 
         return infeas_summary
 
+    def item_violates_tol(self, val, tol):
+        '''
+        return True if the summary item val violates tol
+        val may be None, an int or float, or a dict with a 'val' entry
+        '''
+
+        if val is None:
+            return False
+        elif isinstance(val, int) or isinstance(val, float):
+            return val > tol
+        elif isinstance(val, dict):
+            return val.get('val') is not None and val['val'] > tol # dict summary items should have a value
+        else:
+            return False
+
     def eval_z(self):
 
         self.z = numpy.sum(self.t_z)
@@ -1640,7 +2122,7 @@ class SolutionEvaluator(object):
         numpy.add(self.sd_t_p_scr, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_pr)
         numpy.add(self.sd_t_p_rru_on, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_pr)
         numpy.maximum(self.sd_t_float, 0.0, out=self.sd_t_float, where=sd_t_is_pr)
-        self.pr_t_float[:] = self.sd_t_float[self.problem.pr_sd, :]
+        numpy.take(self.sd_t_float, self.problem.pr_sd, axis=0, out=self.pr_t_float)
         self.viol_pr_t_p_on_max = utils.get_max(self.pr_t_float, idx_lists=[self.problem.pr_uid, self.problem.t_num])
 
     def eval_cs_t_p_on_max(self):
@@ -1655,7 +2137,7 @@ class SolutionEvaluator(object):
         numpy.add(self.sd_t_p_rgd, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_cs)
         numpy.add(self.sd_t_p_rrd_on, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_cs)
         numpy.maximum(self.sd_t_float, 0.0, out=self.sd_t_float, where=sd_t_is_cs)
-        self.cs_t_float[:] = self.sd_t_float[self.problem.cs_sd, :]
+        numpy.take(self.sd_t_float, self.problem.cs_sd, axis=0, out=self.cs_t_float)
         self.viol_cs_t_p_on_max = utils.get_max(self.cs_t_float, idx_lists=[self.problem.cs_uid, self.problem.t_num])
 
     def eval_pr_t_p_off_max(self):
@@ -1672,7 +2154,7 @@ class SolutionEvaluator(object):
         numpy.add(self.sd_t_p_nsc, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_pr)
         numpy.add(self.sd_t_p_rru_off, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_pr)
         numpy.maximum(self.sd_t_float, 0.0, out=self.sd_t_float, where=sd_t_is_pr)
-        self.pr_t_float[:] = self.sd_t_float[self.problem.pr_sd, :]
+        numpy.take(self.sd_t_float, self.problem.pr_sd, axis=0, out=self.pr_t_float)
         self.viol_pr_t_p_off_max = utils.get_max(self.pr_t_float, idx_lists=[self.problem.pr_uid, self.problem.t_num])
 
     def eval_cs_t_p_off_max(self):
@@ -1688,7 +2170,7 @@ class SolutionEvaluator(object):
         numpy.add(self.sd_t_p_sd, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_cs)
         numpy.add(self.sd_t_p_rrd_off, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_cs)
         numpy.maximum(self.sd_t_float, 0.0, out=self.sd_t_float, where=sd_t_is_cs)
-        self.cs_t_float[:] = self.sd_t_float[self.problem.cs_sd, :]
+        numpy.take(self.sd_t_float, self.problem.cs_sd, axis=0, out=self.cs_t_float)
         self.viol_cs_t_p_off_max = utils.get_max(self.cs_t_float, idx_lists=[self.problem.cs_uid, self.problem.t_num])
 
     def eval_pr_t_p_on_min(self):
@@ -1703,7 +2185,7 @@ class SolutionEvaluator(object):
         numpy.add(self.sd_t_p_rgd, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_pr)
         numpy.add(self.sd_t_p_rrd_on, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_pr)
         numpy.maximum(self.sd_t_float, 0.0, out=self.sd_t_float, where=sd_t_is_pr)
-        self.pr_t_float[:] = self.sd_t_float[self.problem.pr_sd, :]
+        numpy.take(self.sd_t_float, self.problem.pr_sd, axis=0, out=self.pr_t_float)
         self.viol_pr_t_p_on_min = utils.get_max(self.pr_t_float, idx_lists=[self.problem.pr_uid, self.problem.t_num])
 
     def eval_cs_t_p_on_min(self):
@@ -1719,7 +2201,7 @@ class SolutionEvaluator(object):
         numpy.add(self.sd_t_p_scr, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_cs)
         numpy.add(self.sd_t_p_rru_on, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_cs)
         numpy.maximum(self.sd_t_float, 0.0, out=self.sd_t_float, where=sd_t_is_cs)
-        self.cs_t_float[:] = self.sd_t_float[self.problem.cs_sd, :]
+        numpy.take(self.sd_t_float, self.problem.cs_sd, axis=0, out=self.cs_t_float)
         self.viol_cs_t_p_on_min = utils.get_max(self.cs_t_float, idx_lists=[self.problem.cs_uid, self.problem.t_num])
 
     def eval_pr_t_p_off_min(self):
@@ -1731,7 +2213,7 @@ class SolutionEvaluator(object):
         sd_t_is_pr = numpy.reshape(self.problem.sd_is_pr == 1, newshape=(self.problem.num_sd, 1))
         self.sd_t_float[:] = 0.0
         numpy.maximum(self.sd_t_p_rrd_off, 0.0, out=self.sd_t_float, where=sd_t_is_pr)
-        self.pr_t_float[:] = self.sd_t_float[self.problem.pr_sd, :]
+        numpy.take(self.sd_t_float, self.problem.pr_sd, axis=0, out=self.pr_t_float)
         self.viol_pr_t_p_off_min = utils.get_max(self.pr_t_float, idx_lists=[self.problem.pr_uid, self.problem.t_num])
 
     def eval_cs_t_p_off_min(self):
@@ -1744,7 +2226,7 @@ class SolutionEvaluator(object):
         self.sd_t_float[:] = 0.0
         numpy.add(self.sd_t_p_nsc, self.sd_t_p_rru_off, out=self.sd_t_float, where=sd_t_is_cs)
         numpy.maximum(self.sd_t_float, 0.0, out=self.sd_t_float, where=sd_t_is_cs)
-        self.cs_t_float[:] = self.sd_t_float[self.problem.cs_sd, :]
+        numpy.take(self.sd_t_float, self.problem.cs_sd, axis=0, out=self.cs_t_float)
         self.viol_cs_t_p_off_min = utils.get_max(self.cs_t_float, idx_lists=[self.problem.cs_uid, self.problem.t_num])
 
     def eval_pr_t_q_max(self):
@@ -1758,7 +2240,7 @@ class SolutionEvaluator(object):
         numpy.subtract(self.sd_t_q, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_pr)
         numpy.add(self.sd_t_q_qru, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_pr)
         numpy.maximum(self.sd_t_float, 0.0, out=self.sd_t_float, where=sd_t_is_pr)
-        self.pr_t_float[:] = self.sd_t_float[self.problem.pr_sd, :]
+        numpy.take(self.sd_t_float, self.problem.pr_sd, axis=0, out=self.pr_t_float)
         self.viol_pr_t_q_max = utils.get_max(self.pr_t_float, idx_lists=[self.problem.pr_uid, self.problem.t_num])
         
     def eval_pr_t_q_min(self):
@@ -1772,7 +2254,7 @@ class SolutionEvaluator(object):
         numpy.subtract(self.sd_t_float, self.sd_t_q, out=self.sd_t_float, where=sd_t_is_pr)
         numpy.add(self.sd_t_q_qrd, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_pr)
         numpy.maximum(self.sd_t_float, 0.0, out=self.sd_t_float, where=sd_t_is_pr)
-        self.pr_t_float[:] = self.sd_t_float[self.problem.pr_sd, :]
+        numpy.take(self.sd_t_float, self.problem.pr_sd, axis=0, out=self.pr_t_float)
         self.viol_pr_t_q_min = utils.get_max(self.pr_t_float, idx_lists=[self.problem.pr_uid, self.problem.t_num])
         
     def eval_pr_t_q_p_max(self):
@@ -1830,7 +2312,7 @@ class SolutionEvaluator(object):
         numpy.subtract(self.sd_t_q, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_cs)
         numpy.add(self.sd_t_q_qrd, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_cs)
         numpy.maximum(self.sd_t_float, 0.0, out=self.sd_t_float, where=sd_t_is_cs)
-        self.cs_t_float[:] = self.sd_t_float[self.problem.cs_sd, :]
+        numpy.take(self.sd_t_float, self.problem.cs_sd, axis=0, out=self.cs_t_float)
         self.viol_cs_t_q_max = utils.get_max(self.cs_t_float, idx_lists=[self.problem.cs_uid, self.problem.t_num])
         
     def eval_cs_t_q_min(self):
@@ -1844,7 +2326,7 @@ class SolutionEvaluator(object):
         numpy.subtract(self.sd_t_float, self.sd_t_q, out=self.sd_t_float, where=sd_t_is_cs)
         numpy.add(self.sd_t_q_qru, self.sd_t_float, out=self.sd_t_float, where=sd_t_is_cs)
         numpy.maximum(self.sd_t_float, 0.0, out=self.sd_t_float, where=sd_t_is_cs)
-        self.cs_t_float[:] = self.sd_t_float[self.problem.cs_sd, :]
+        numpy.take(self.sd_t_float, self.problem.cs_sd, axis=0, out=self.cs_t_float)
         self.viol_cs_t_q_min = utils.get_max(self.cs_t_float, idx_lists=[self.problem.cs_uid, self.problem.t_num])
         
     def eval_cs_t_q_p_max(self):
@@ -1906,8 +2388,8 @@ class SolutionEvaluator(object):
         '''
 
         # actual ramping (up, signed)
-        self.sd_t_float[:] = numpy.diff(
-            self.sd_t_p, axis=1, prepend=numpy.reshape(self.problem.sd_p_0, newshape=(self.problem.num_sd, 1)))
+        numpy.subtract(self.sd_t_p[:, 0], self.problem.sd_p_0, out=self.sd_t_float[:, 0])
+        numpy.subtract(self.sd_t_p[:, 1:], self.sd_t_p[:, :-1], out=self.sd_t_float[:, 1:])
 
         # ramp up maximum
         numpy.subtract(self.sd_t_u_on, self.sd_t_u_su, out=self.sd_t_int)
@@ -2083,11 +2565,11 @@ class SolutionEvaluator(object):
         print('sd_t_p_rgu sum: {}'.format(numpy.sum(self.sd_t_p_rgu)))
         print('prz_sigma_rgu max: {}'.format(numpy.amax(self.problem.prz_sigma_rgu)))
 
-        # start with 0 - prz_t_float_1 will be used by rgu, scr, and nsc
+        # start with 0 - prz_t_p_rgu_scr_nsc_net_req will be used by rgu, scr, and nsc
         # these functions should be called in that order
-        # prz_t_float_1 should not be used by other functions in between rgu, scr, and nsc
+        # prz_t_p_rgu_scr_nsc_net_req should not be used by other functions in between rgu, scr, and nsc
         # it will be the requirement less the provision of reserves for each type rgu, scr, nsc
-        self.prz_t_float_1[:] = 0.0 # here prz_t_float_1 should be b - A*x, where the constraint is A*x >= b - same in other products
+        self.prz_t_p_rgu_scr_nsc_net_req[:] = 0.0 # here prz_t_p_rgu_scr_nsc_net_req should be b - A*x, where the constraint is A*x >= b - same in other products
 
         # add rgu reserve requirement
         numpy.multiply(
@@ -2099,15 +2581,15 @@ class SolutionEvaluator(object):
             numpy.reshape(self.problem.prz_sigma_rgu, newshape=(self.problem.num_prz, 1)),
             self.prz_t_float_2, out=self.prz_t_float_2) # scale by sigma factor
         print('prz_t_p_rgu_req max: {}'.format(numpy.amax(self.prz_t_float_2)))
-        numpy.add(self.prz_t_float_1, self.prz_t_float_2, out=self.prz_t_float_1) # add req
+        numpy.add(self.prz_t_p_rgu_scr_nsc_net_req, self.prz_t_float_2, out=self.prz_t_p_rgu_scr_nsc_net_req) # add req
 
         # subtract pr/cs rgu reserve provisions
         self.prz_t_float_2[:] = 0.0
         utils.csr_mat_vec_add_to_vec(self.prz_sd_inc_mat, self.sd_t_p_rgu, out=self.prz_t_float_2) # add sd reserves to zone
-        numpy.subtract(self.prz_t_float_1, self.prz_t_float_2, out=self.prz_t_float_1) # subtract total reserves from req
+        numpy.subtract(self.prz_t_p_rgu_scr_nsc_net_req, self.prz_t_float_2, out=self.prz_t_p_rgu_scr_nsc_net_req) # subtract total reserves from req
 
         # evaluate shortfall
-        numpy.maximum(self.prz_t_float_1, 0.0, out=self.prz_t_float)
+        numpy.maximum(self.prz_t_p_rgu_scr_nsc_net_req, 0.0, out=self.prz_t_float)
         self.viol_prz_t_p_rgu_balance = utils.get_max(self.prz_t_float, idx_lists=[self.problem.prz_uid, self.problem.t_num])
         numpy.multiply(
             numpy.reshape(self.problem.prz_c_rgu, newshape=(self.problem.num_prz, 1)), self.prz_t_float, out=self.prz_t_float)
@@ -2156,8 +2638,8 @@ class SolutionEvaluator(object):
         print('sd_t_p_scr sum: {}'.format(numpy.sum(self.sd_t_p_scr)))
         print('prz_sigma_scr max: {}'.format(numpy.amax(self.problem.prz_sigma_scr)))
 
-        # start with prz_t_float_1 values from rgu eval, i.e. requirement less provision of rgu
-        # do not change prz_t_float_1
+        # start with prz_t_p_rgu_scr_nsc_net_req values from rgu eval, i.e. requirement less provision of rgu
+        # do not change prz_t_p_rgu_scr_nsc_net_req
 
         # add scr reserve requirement
         numpy.multiply(
@@ -2169,15 +2651,15 @@ class SolutionEvaluator(object):
             numpy.reshape(self.problem.prz_sigma_scr, newshape=(self.problem.num_prz, 1)),
             self.prz_t_float_2, out=self.prz_t_float_2) # scale by sigma factor
         print('prz_t_p_scr_req max: {}'.format(numpy.amax(self.prz_t_float_2)))
-        numpy.add(self.prz_t_float_1, self.prz_t_float_2, out=self.prz_t_float_1) # add req
+        numpy.add(self.prz_t_p_rgu_scr_nsc_net_req, self.prz_t_float_2, out=self.prz_t_p_rgu_scr_nsc_net_req) # add req
 
         # subtract pr/cs scr reserve provisions
         self.prz_t_float_2[:] = 0.0
         utils.csr_mat_vec_add_to_vec(self.prz_sd_inc_mat, self.sd_t_p_scr, out=self.prz_t_float_2) # add sd reserves to zone
-        numpy.subtract(self.prz_t_float_1, self.prz_t_float_2, out=self.prz_t_float_1) # subtract total reserves from req
+        numpy.subtract(self.prz_t_p_rgu_scr_nsc_net_req, self.prz_t_float_2, out=self.prz_t_p_rgu_scr_nsc_net_req) # subtract total reserves from req
 
         # evaluate shortfall
-        numpy.maximum(self.prz_t_float_1, 0.0, out=self.prz_t_float)
+        numpy.maximum(self.prz_t_p_rgu_scr_nsc_net_req, 0.0, out=self.prz_t_float)
         self.viol_prz_t_p_scr_balance = utils.get_max(self.prz_t_float, idx_lists=[self.problem.prz_uid, self.problem.t_num])
         numpy.multiply(
             numpy.reshape(self.problem.prz_c_scr, newshape=(self.problem.num_prz, 1)), self.prz_t_float, out=self.prz_t_float)
@@ -2191,8 +2673,8 @@ class SolutionEvaluator(object):
         print('sd_t_p_nsc sum: {}'.format(numpy.sum(self.sd_t_p_nsc)))
         print('prz_sigma_nsc max: {}'.format(numpy.amax(self.problem.prz_sigma_nsc)))
 
-        # start with prz_t_float_1 values from scr eval, i.e. requirement less provision of scr and rgu
-        # do not change prz_t_float_1
+        # start with prz_t_p_rgu_scr_nsc_net_req values from scr eval, i.e. requirement less provision of scr and rgu
+        # do not change prz_t_p_rgu_scr_nsc_net_req
 
         # add nsc reserve requirement
         numpy.multiply(
@@ -2204,15 +2686,15 @@ class SolutionEvaluator(object):
             numpy.reshape(self.problem.prz_sigma_nsc, newshape=(self.problem.num_prz, 1)),
             self.prz_t_float_2, out=self.prz_t_float_2) # scale by sigma factor
         print('prz_t_p_nsc_req max: {}'.format(numpy.amax(self.prz_t_float_2)))
-        numpy.add(self.prz_t_float_1, self.prz_t_float_2, out=self.prz_t_float_1) # add req
+        numpy.add(self.prz_t_p_rgu_scr_nsc_net_req, self.prz_t_float_2, out=self.prz_t_p_rgu_scr_nsc_net_req) # add req
 
         # subtract pr/cs nsc reserve provisions
         self.prz_t_float_2[:] = 0.0
         utils.csr_mat_vec_add_to_vec(self.prz_sd_inc_mat, self.sd_t_p_nsc, out=self.prz_t_float_2) # add sd reserves to zone
-        numpy.subtract(self.prz_t_float_1, self.prz_t_float_2, out=self.prz_t_float_1) # subtract total reserves from req
+        numpy.subtract(self.prz_t_p_rgu_scr_nsc_net_req, self.prz_t_float_2, out=self.prz_t_p_rgu_scr_nsc_net_req) # subtract total reserves from req
 
         # evaluate shortfall
-        numpy.maximum(self.prz_t_float_1, 0.0, out=self.prz_t_float)
+        numpy.maximum(self.prz_t_p_rgu_scr_nsc_net_req, 0.0, out=self.prz_t_float)
         self.viol_prz_t_p_nsc_balance = utils.get_max(self.prz_t_float, idx_lists=[self.problem.prz_uid, self.problem.t_num])
         numpy.multiply(
             numpy.reshape(self.problem.prz_c_nsc, newshape=(self.problem.num_prz, 1)), self.prz_t_float, out=self.prz_t_float)
@@ -2332,34 +2814,37 @@ class SolutionEvaluator(object):
         '''
         evaluate uptime and downtime at the start of each interval
         use this to evaluate min up/down time constraints and downtime-dependent startup costs
+
+        uptime at the end of t is a_end[t] less a_end at the end of the last interval t' <= t with u_on = 0,
+        or a_end[t] + d_up_0 if there is no such t', i.e. a cumulative sum of t_d reset at each shutdown.
+        a_end is nondecreasing, so the reset values are a running max over the intervals. same for downtime.
         '''
-        
-        sd_d_up_start = numpy.zeros(shape=(self.problem.num_sd, ), dtype=float)
-        sd_d_dn_start = numpy.zeros(shape=(self.problem.num_sd, ), dtype=float)
-        sd_d_up_end = numpy.zeros(shape=(self.problem.num_sd, ), dtype=float)
-        sd_d_dn_end = numpy.zeros(shape=(self.problem.num_sd, ), dtype=float)
 
-        sd_d_up_end[:] = self.problem.sd_d_up_0
-        sd_d_dn_end[:] = self.problem.sd_d_dn_0
-        
-        for t in range(self.problem.num_t):
-            sd_d_up_start[:] = sd_d_up_end
-            sd_d_dn_start[:] = sd_d_dn_end
-            numpy.add(
-                sd_d_up_start, self.problem.t_d[t],
-                out=sd_d_up_end, where=(self.sd_t_u_on[:,t] == 1))
-            numpy.add(
-                sd_d_dn_start, self.problem.t_d[t],
-                out=sd_d_dn_end, where=(self.sd_t_u_on[:,t] == 0))
-            sd_d_up_end[self.sd_t_u_on[:,t] == 0] = 0.0
-            sd_d_dn_end[self.sd_t_u_on[:,t] == 1] = 0.0
-            self.sd_t_d_up_start[:,t] = sd_d_up_start
-            self.sd_t_d_dn_start[:,t] = sd_d_dn_start
+        t_a_end = numpy.reshape(self.problem.t_a_end, newshape=(1, self.problem.num_t))
+
+        # uptime
+        self.sd_t_float[:] = numpy.reshape(-self.problem.sd_d_up_0, newshape=(self.problem.num_sd, 1))
+        numpy.copyto(self.sd_t_float, t_a_end, where=(self.sd_t_u_on == 0)) # reset at intervals with u_on = 0
+        numpy.maximum.accumulate(self.sd_t_float, axis=1, out=self.sd_t_float) # a_end at last reset
+        numpy.subtract(t_a_end, self.sd_t_float, out=self.sd_t_float)
+        numpy.multiply(self.sd_t_u_on, self.sd_t_float, out=self.sd_t_float) # uptime at end of t
+        self.sd_t_d_up_start[:, 0] = self.problem.sd_d_up_0
+        self.sd_t_d_up_start[:, 1:] = self.sd_t_float[:, :-1]
+
+        # downtime
+        self.sd_t_float[:] = numpy.reshape(-self.problem.sd_d_dn_0, newshape=(self.problem.num_sd, 1))
+        numpy.copyto(self.sd_t_float, t_a_end, where=(self.sd_t_u_on == 1)) # reset at intervals with u_on = 1
+        numpy.maximum.accumulate(self.sd_t_float, axis=1, out=self.sd_t_float) # a_end at last reset
+        numpy.subtract(t_a_end, self.sd_t_float, out=self.sd_t_float)
+        numpy.subtract(1, self.sd_t_u_on, out=self.sd_t_int)
+        numpy.multiply(self.sd_t_int, self.sd_t_float, out=self.sd_t_float) # downtime at end of t
+        self.sd_t_d_dn_start[:, 0] = self.problem.sd_d_dn_0
+        self.sd_t_d_dn_start[:, 1:] = self.sd_t_float[:, :-1]
         # print('up_start:')
         # print(self.sd_t_d_up_start)
         # print('dn_start:')
         # print(self.sd_t_d_dn_start)
-        
+
     def eval_sd_t_u_su_sd(self):
 
         self.sd_t_int[:] = numpy.diff(
@@ -2467,19 +2952,45 @@ class SolutionEvaluator(object):
 
     @utils.timeit
     def eval_sd_t_z_sus(self):
-        
-        for i in range(self.problem.num_sd):
-            self.t_float[:] = 0.0 # selecting no startup state, with no startup state cost adjustment, is allowed
-            for j in range(self.problem.sd_num_startup_state[i]):
-                # qualify for this startup state if self.sd_t_d_dn_start[i, :] <= max_prior_d_dn + tol
-                max_downtime = self.problem.sd_startup_state_d_max_list[i][j]
-                numpy.less_equal(self.sd_t_d_dn_start[i, :], max_downtime + self.config['time_eq_tol'], out=self.t_int)
-                # if qualify for this state what is cost?
-                cost = self.problem.sd_startup_state_c_list[i][j]
-                numpy.multiply(cost, self.t_int, out=self.t_float_1)
-                # take the better of qualified cost for this state and prior best cost
-                numpy.minimum(self.t_float, self.t_float_1, out=self.t_float)
-            self.sd_t_float[i, :] = self.t_float
+        '''
+        evaluate downtime-dependent startup cost adjustment
+
+        state j of sd i qualifies at t if sd_t_d_dn_start[i, t] <= d_max[j] + tol.
+        the states of each sd are sorted by d_max, so the qualifying states are the states from
+        the first j with d_max[j] + tol >= sd_t_d_dn_start[i, t] to the end of the sd, and the best cost
+        among them is c_min[j]. j is found by a bisection search over the flattened states of all sd,
+        vectorized over (sd, t), with one pass per bit of the max number of states.
+        '''
+
+        ptr = self.problem.sd_startup_state_ptr
+        num_state = ptr[-1]
+        # sentinel state at the end so that indexing is always in range
+        d_max = numpy.zeros(shape=(num_state + 1, ), dtype=float)
+        numpy.add(self.problem.sd_startup_state_d_max, self.config['time_eq_tol'], out=d_max[:num_state])
+        d_max[num_state] = numpy.inf
+        c_min = numpy.zeros(shape=(num_state + 1, ), dtype=float)
+        numpy.minimum(self.problem.sd_startup_state_c_min, 0.0, out=c_min[:num_state]) # selecting no startup state, with no startup state cost adjustment, is allowed
+
+        # search for j in [lo, hi)
+        lo = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=int)
+        hi = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=int)
+        lo[:] = numpy.reshape(ptr[:-1], newshape=(self.problem.num_sd, 1))
+        hi[:] = numpy.reshape(ptr[1:], newshape=(self.problem.num_sd, 1))
+        go_up = numpy.zeros(shape=(self.problem.num_sd, self.problem.num_t), dtype=bool)
+        num_iter = int(numpy.amax(self.problem.sd_num_startup_state, initial=0)).bit_length()
+        for it in range(num_iter):
+            numpy.add(lo, hi, out=self.sd_t_int)
+            numpy.floor_divide(self.sd_t_int, 2, out=self.sd_t_int) # mid
+            numpy.less(d_max[self.sd_t_int], self.sd_t_d_dn_start, out=go_up) # mid state does not qualify
+            numpy.logical_and(go_up, lo < hi, out=go_up)
+            numpy.copyto(hi, self.sd_t_int, where=numpy.logical_and(lo < hi, ~go_up))
+            numpy.add(self.sd_t_int, 1, out=self.sd_t_int)
+            numpy.copyto(lo, self.sd_t_int, where=go_up)
+
+        # lo is the first qualifying state, or the end of the sd if none qualifies
+        numpy.less(lo, numpy.reshape(ptr[1:], newshape=(self.problem.num_sd, 1)), out=go_up)
+        numpy.copyto(lo, num_state, where=~go_up)
+        self.sd_t_float[:] = c_min[lo]
         # cost adjustment applies only when starting up
         numpy.multiply(self.sd_t_u_su, self.sd_t_float, out=self.sd_t_float)
         self.sum_sd_t_z_sus = numpy.sum(self.sd_t_float)
@@ -2546,7 +3057,7 @@ class SolutionEvaluator(object):
         evaluate shunt p/q
         '''
 
-        self.sh_t_float[:] = self.bus_t_v[self.problem.sh_bus, :]
+        numpy.take(self.bus_t_v, self.problem.sh_bus, axis=0, out=self.sh_t_float)
         numpy.power(self.sh_t_float, 2, out=self.sh_t_float)
         numpy.multiply(
             numpy.reshape(self.problem.sh_g_st, newshape=(self.problem.num_sh, 1)), self.sh_t_u_st, out=self.sh_t_p)
@@ -3203,3 +3714,6 @@ class SolutionEvaluator(object):
             numpy.subtract(acl_t_u_on[:, t+1], acl_t_u_on[:, t], out=acl_int)
         end_time = time.time()
         print('su time loop: {}'.format(end_time - start_time))
+
+for name in work_array_shapes.keys():
+    setattr(SolutionEvaluator, name, WorkArray(name))
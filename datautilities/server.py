@@ -0,0 +1,190 @@
+'''
+Local evaluation server
+
+Keeps problems resident in memory so that evaluating a solution does not re-import packages,
+re-read git info, re-parse the problem file, and rebuild the problem arrays.
+
+Problems are held in an LRU cache keyed by the problem file path and modification time.
+Each cache entry holds the problem data model, the problem arrays, the problem summary,
+and a SolutionEvaluator that is reused for every solution to that problem.
+
+Requests are POST /evaluate with a JSON body:
+  {"problem": <problem_file_name>, "solution": <solution_file_name>}
+or
+  {"problem": <problem_file_name>, "solution_data": <solution data, as in a solution file>}
+The response body is the content that check_data would write to summary.json.
+If a problem or solution file cannot be read or fails a check,
+the response status is 400 and the summary has an "error" entry with the traceback.
+'''
+
+import os, json, time, traceback, collections
+import http.server
+from pydantic.error_wrappers import ValidationError
+from datamodel.input.data import InputDataFile
+from datamodel.output.data import OutputDataFile
+from datautilities import utils, arraydata, evaluation, validation
+from datautilities.errors import ModelError
+
+class ProblemCache(object):
+    '''
+    LRU cache of loaded and checked problems
+    '''
+
+    def __init__(self, config, max_size=1):
+
+        self.config = config
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()
+
+    def get(self, problem_file):
+        '''
+        returns the cache entry for problem_file, loading and checking the problem if needed
+        raises OSError or ValueError if the problem file cannot be read,
+        ValidationError or ModelError if the problem fails a check
+        '''
+
+        problem_file = os.path.abspath(problem_file)
+        key = (problem_file, os.stat(problem_file).st_mtime_ns)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+        entry = self.load(problem_file)
+        self.entries[key] = entry
+        # drop other versions of the same file, then the least recently used problems
+        for k in [k for k in self.entries.keys() if k[0] == problem_file and k != key]:
+            del self.entries[k]
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return entry
+
+    @utils.timeit
+    def load(self, problem_file):
+
+        data_model = InputDataFile.load(problem_file)
+        problem_data_array = validation.model_checks(data_model, self.config)
+        validation.connected(data_model, self.config)
+        problem_summary = validation.get_summary(data_model)
+        problem_summary['pass'] = 1
+        problem_data_array.set_all_sections()
+        return {
+            'data_model': data_model,
+            'problem_data_array': problem_data_array,
+            'summary': problem_summary,
+            'evaluator': None}
+
+class EvaluationServer(object):
+
+    def __init__(self, config, cache_size=1):
+
+        self.config = config
+        self.cache = ProblemCache(config, max_size=cache_size)
+        try:
+            self.git_info = utils.get_git_info_all()
+        except Exception:
+            print('git info error ignored\n')
+            print(traceback.format_exc())
+            self.git_info = {}
+
+    def evaluate(self, problem_file, solution_file=None, solution_data_dict=None):
+        '''
+        returns (summary, passed)
+        summary has the same content as the check_data summary.json
+        '''
+
+        summary = {
+            'problem_data_file': problem_file,
+            'solution_data_file': solution_file,
+            'git_info': self.git_info,
+            'problem': {},
+            'solution': {},
+            'evaluation': {}}
+
+        # OSError: the file is missing or unreadable. ValueError: the file is not valid JSON
+        try:
+            entry = self.cache.get(problem_file)
+        except (OSError, ValueError, ValidationError, ModelError):
+            summary['problem']['pass'] = 0
+            summary['error'] = traceback.format_exc()
+            return summary, False
+        summary['problem'] = entry['summary']
+
+        if solution_file is None and solution_data_dict is None:
+            return summary, True
+
+        try:
+            if solution_data_dict is None:
+                solution_data_model = OutputDataFile.load(solution_file)
+            else:
+                solution_data_model = OutputDataFile(**solution_data_dict)
+            validation.solution_model_checks(entry['data_model'], solution_data_model, self.config)
+        except (OSError, ValueError, ValidationError, ModelError):
+            summary['solution']['pass'] = 0
+            summary['error'] = traceback.format_exc()
+            return summary, False
+        summary['solution'] = validation.get_solution_summary(entry['data_model'], solution_data_model)
+        summary['solution']['pass'] = 1
+
+        start_time = time.time()
+        solution_data_array = arraydata.OutputData()
+        solution_data_array.set_from_data_model(entry['problem_data_array'], solution_data_model)
+        if entry['evaluator'] is None:
+            entry['evaluator'] = evaluation.SolutionEvaluator(
+                entry['problem_data_array'], solution_data_array, config=self.config)
+        else:
+            entry['evaluator'].set_next_solution(solution_data_array)
+        entry['evaluator'].run()
+        summary['evaluation'] = entry['evaluator'].get_summary()
+        end_time = time.time()
+        print('evaluate solution time: {}'.format(end_time - start_time))
+
+        return summary, True
+
+class EvaluationRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_POST(self):
+
+        if self.path != '/evaluate':
+            self.send_json(404, {'error': 'unknown path: {}'.format(self.path)})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length))
+            problem_file = request['problem']
+        except Exception:
+            self.send_json(400, {'error': traceback.format_exc()})
+            return
+        try:
+            summary, passed = self.server.evaluation_server.evaluate(
+                problem_file, request.get('solution'), request.get('solution_data'))
+        except Exception:
+            self.send_json(500, {'error': traceback.format_exc()})
+            return
+        self.send_json(200 if passed else 400, summary)
+
+    def send_json(self, status, data):
+
+        body = json.dumps(data, indent=4, cls=utils.NpEncoder).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def serve(config_file, host='127.0.0.1', port=8765, cache_size=1):
+    '''
+    serve requests one at a time until interrupted
+
+    requests are handled serially since InputDataFile.load and OutputDataFile.load change the working directory
+    '''
+
+    config = validation.read_json(config_file)
+    httpd = http.server.HTTPServer((host, port), EvaluationRequestHandler)
+    httpd.evaluation_server = EvaluationServer(config, cache_size=cache_size)
+    print('evaluation server listening on {}:{}'.format(host, port))
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
@@ -2,13 +2,15 @@
 Functions needed in various places in datautilities
 '''
 
-import os, sys, subprocess, traceback, pathlib, time, psutil, json
-import numpy, networkx
-from scipy.sparse import sparsetools
-
-import datamodel
+import os, sys, subprocess, traceback, pathlib, time, psutil, json, copy
+import numpy
 from datautilities.errors import GitError
 
+# networkx and datamodel are imported in the functions that use them, to keep imports fast
+
+# git info read by get_git_info_all, cached per process
+git_info_cache = {}
+
 def timeit(function):
     def timed(*args, **kw):
         start_time = time.time()
@@ -59,6 +61,7 @@ def get_data_utils_dir():
 
 def get_data_model_dir():
 
+    import datamodel
     return os.path.dirname(os.path.realpath(datamodel.__file__))
 
 def get_git_info(path): # todo get branch also
@@ -106,11 +109,206 @@ def get_git_info(path): # todo get branch also
     return repo
 
 def get_git_info_all():
+    '''
+    the git subprocesses run on the first call in a process. later calls return a copy of the cached result
+    '''
+
+    if 'all' not in git_info_cache:
+        git_info = {}
+        git_info['C3DataUtilities'] = get_git_info(get_data_utils_dir())
+        git_info['Bid-DS-data-model'] = get_git_info(get_data_model_dir())
+        git_info_cache['all'] = git_info
+    return copy.deepcopy(git_info_cache['all'])
+
+class JsonStream(object):
+    '''
+    minimal incremental reader of a json text file
+    reads the file in chunks and decodes one value at a time,
+    so a large file can be processed one record at a time without holding the whole decoded file in memory
+    '''
+
+    def __init__(self, f, chunk_size=(1 << 20)):
+
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self):
+        '''
+        drop the consumed part of the buffer and read the next chunk
+        returns False at end of file
+        '''
+
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        '''
+        next non-whitespace character, or '' at end of file
+        '''
+
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\n\r':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, c):
+
+        d = self.peek()
+        if d != c:
+            raise ValueError('json stream expected "{}", found "{}"'.format(c, d))
+        self.pos += 1
+
+    def skip_comma(self):
+
+        if self.peek() == ',':
+            self.pos += 1
+
+    def value(self):
+        '''
+        decode the next complete value
+        '''
+
+        return self.value_and_text()[0]
+
+    def value_and_text(self):
+        '''
+        decode the next complete value, returning the value and its text
+        '''
+
+        self.peek()
+        while True:
+            try:
+                val, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # value may be cut off at the end of the buffer
+                if self.fill():
+                    continue
+                raise
+            if (end == len(self.buf) or self.buf[end] in '.eE') and self.fill():
+                # a number may be cut off at the end of the buffer, e.g. 1.5 read as 1
+                continue
+            text = self.buf[self.pos:end]
+            self.pos = end
+            return val, text
+
+    def scalar_array_text(self):
+        '''
+        if the next value is an array of numbers, booleans and nulls, consume it and return its text,
+        otherwise return None and consume nothing
+        '''
+
+        if self.peek() != '[':
+            return None
+        while True:
+            end = self.buf.find(']', self.pos)
+            if end >= 0:
+                text = self.buf[self.pos:(end + 1)]
+                if '"' in text or '{' in text or '[' in text[1:]:
+                    return None
+                self.pos = end + 1
+                return text
+            if not self.fill():
+                return None
+
+def iter_json_section_records(file_name, key):
+    '''
+    for a json file of the form
+      {..., key: {section: [record, record, ...], ...}, ...}
+    yields (section, record) for each record of each section, in file order
+    other values are decoded and skipped
+    '''
+
+    with open(file_name, 'r') as f:
+        stream = JsonStream(f)
+        stream.expect('{')
+        while stream.peek() != '}':
+            k = stream.value()
+            stream.expect(':')
+            if k != key:
+                stream.value()
+            else:
+                stream.expect('{')
+                while stream.peek() != '}':
+                    section = stream.value()
+                    stream.expect(':')
+                    if stream.peek() != '[':
+                        stream.value()
+                    else:
+                        stream.expect('[')
+                        while stream.peek() != ']':
+                            yield section, stream.value()
+                            stream.skip_comma()
+                        stream.expect(']')
+                    stream.skip_comma()
+                stream.expect('}')
+            stream.skip_comma()
+        stream.expect('}')
+
+class BufferArena(object):
+    '''
+    scratch buffers handed out on demand and kept for reuse.
+    a buffer is keyed by (key, shape, dtype) and is allocated, zeroed, the first time it is requested.
+    later requests for the same key, shape, and dtype get the same buffer back, with whatever it holds.
+    '''
+
+    def __init__(self):
+
+        self.buffers = {}
+        self.num_bytes = 0
+        self.peak_num_bytes = 0
+
+    def get(self, key, shape, dtype):
+
+        buffer_key = (key, tuple(shape), numpy.dtype(dtype))
+        buffer = self.buffers.get(buffer_key)
+        if buffer is None:
+            buffer = numpy.zeros(shape=shape, dtype=dtype)
+            self.buffers[buffer_key] = buffer
+            self.num_bytes += buffer.nbytes
+            self.peak_num_bytes = max(self.peak_num_bytes, self.num_bytes)
+        return buffer
 
-    git_info = {}
-    git_info['C3DataUtilities'] = get_git_info(get_data_utils_dir())
-    git_info['Bid-DS-data-model'] = get_git_info(get_data_model_dir())
-    return git_info
+    def put(self, key, value):
+        '''
+        hand an existing array to the arena under key, replacing any buffer with the same key, shape, and dtype
+        '''
+
+        buffer_key = (key, value.shape, value.dtype)
+        old = self.buffers.get(buffer_key)
+        if old is not None:
+            self.num_bytes -= old.nbytes
+        self.buffers[buffer_key] = value
+        self.num_bytes += value.nbytes
+        self.peak_num_bytes = max(self.peak_num_bytes, self.num_bytes)
+
+    def clear(self):
+        '''
+        release all buffers. peak_num_bytes is kept
+        '''
+
+        self.buffers = {}
+        self.num_bytes = 0
+
+    def get_info(self):
+
+        return {
+            'num_buffers': len(self.buffers),
+            'num_bytes': self.num_bytes,
+            'peak_num_bytes': self.peak_num_bytes}
 
 def get_max(arr, idx_lists=None):
 
@@ -175,6 +373,39 @@ def get_max_min(arr, use_max=True, idx_lists=None):
             out['idx'] = idx
     return out
 
+def get_max_batch(arr, idx_lists=None):
+
+    return get_max_min_batch(arr, use_max=True, idx_lists=idx_lists)
+
+def get_min_batch(arr, idx_lists=None):
+
+    return get_max_min_batch(arr, use_max=False, idx_lists=idx_lists)
+
+def get_max_min_batch(arr, use_max=True, idx_lists=None):
+    '''
+    get_max_min(arr[s, ...]) for each s, in one pass over arr
+    arr has the solution index s first, idx_lists index the remaining dimensions
+    returns a list of the get_max_min outputs
+    '''
+
+    num_sol = arr.shape[0]
+    if idx_lists is None:
+        out = [make_empty_viol() for s in range(num_sol)]
+    else:
+        out = [make_empty_viol(num_indices=len(idx_lists)) for s in range(num_sol)]
+    arr_flat = numpy.reshape(arr, newshape=(num_sol, -1))
+    if arr_flat.shape[1] > 0:
+        if use_max:
+            arg = numpy.argmax(arr_flat, axis=1)
+        else:
+            arg = numpy.argmin(arr_flat, axis=1)
+        for s in range(num_sol):
+            arg_tuple = numpy.unravel_index(arg[s], shape=arr.shape[1:])
+            out[s]['val'] = arr_flat[s, arg[s]]
+            if idx_lists is not None:
+                out[s]['idx'] = {i:idx_lists[i][arg_tuple[i]] for i in range(len(idx_lists))}
+    return out
+
 def csr_mat_vec_add_to_vec(a, x, out):
     '''
     csr_mat_vec_add_to_vec(a, x, out)
@@ -296,6 +527,7 @@ def get_connected_components(vertices, od_pairs):
     pairs_sorted = sorted(pairs_o_lt_d)
     pairs_unique = sorted(list(set(pairs_sorted)))
 
+    import networkx
     g = networkx.Graph()
     g.add_nodes_from(sorted(list(set(vertices))))
     #g.add_edges_from(sorted(od_pairs))
@@ -373,6 +605,7 @@ def get_bridges(od_pairs):
     pairs_count_gt_1 = sorted([p for p in pairs_unique if pairs_unique_count[p] > 1])
 
     # get bridges on reduced graph
+    import networkx
     g = networkx.Graph()
     g.add_nodes_from(nodes)
     g.add_edges_from(pairs_unique)
@@ -460,6 +693,7 @@ def get_bridges_orig(od_pairs):
          for i in range(num_pairs_with_extra_edges)])
     pairs_augmented = sorted([(p[0], p[1], p[3]) for p in pairs_first] + extra_pairs)
     pairs_augmented_dict = {(p[0], p[1]): p[2] for p in pairs_augmented}
+    import networkx
     g = networkx.Graph()
     g.add_edges_from(sorted(pairs_augmented_dict.keys()))
     g_bridges = networkx.bridges(g)
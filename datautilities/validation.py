@@ -2,13 +2,14 @@
 
 '''
 
-import numpy, networkx, traceback, pprint, json, re, pandas, time
-from pydantic.error_wrappers import ValidationError
-from datamodel.input.data import InputDataFile
-from datamodel.output.data import OutputDataFile
-from datautilities import utils, arraydata, evaluation
+import numpy, traceback, pprint, json, re, time, multiprocessing, threading
+import concurrent.futures
+from datautilities import utils, arraydata
 from datautilities.errors import ModelError, GitError
 
+# pandas, networkx, pydantic, datamodel and evaluation (with scipy) are imported in the functions that use them,
+# so that e.g. check_data.py --help or a scrub run does not pay for importing them
+
 def write(file_name, mode, text):
 
     with open(file_name, mode) as f:
@@ -28,146 +29,98 @@ def write_json(data, file_name):
     with open(file_name, 'w') as f:
         json.dump(data, f)
 
-def get_p_q_linking_geometry(data, config):
+# p-q linking geometry codes - exactly one per device
+# narrowest possible description, e.g. a line is not a band
+p_q_linking_plane = 0
+p_q_linking_empty = 1
+p_q_linking_line = 2
+p_q_linking_band = 3
+p_q_linking_cone = 4
+
+p_q_linking_geometry_dtype = numpy.dtype([
+    # basic geometry code, p_q_linking_plane, ..., p_q_linking_cone
+    ('code', numpy.int8),
+    # line/band/cone slope of the upper and lower constraints: 1 sloped up, 0 horiz, -1 sloped down
+    ('upper_slope', numpy.int8),
+    ('lower_slope', numpy.int8),
+    # cone orientation, True opening right, False opening left
+    ('opening_right', bool),
+    # linking constraints, nan if not present
+    ('b', float),
+    ('qmax0', float),
+    ('qmin0', float),
+    ('bmax', float),
+    ('bmin', float),
+    # cone vertex
+    ('pvx', float),
+    ('qvx', float),
+    # too small nonzero slope errors
+    ('b_too_small', bool),
+    ('bmax_too_small', bool),
+    ('bmin_too_small', bool),
+    ('bdiff_too_small', bool),
+    ])
 
-    info = {
-        i.uid: {
-            # basic geometry - exactly one is True, others False
-            # narrowest possible description, e.g. a line is not a band
-            'plane': False,
-            'empty': False,
-            'line': False,
-            'band': False,
-            'cone': False,
-            # line/band/cone slope info
-            'upper_sloped_up': False,
-            'upper_horiz': False,
-            'upper_sloped_down': False,
-            'lower_sloped_up': False,
-            'lower_horiz': False,
-            'lower_sloped_down': False,
-            # cone orientation info
-            'opening_right': False,
-            'opening_left': False,
-            # line/band/cone constraints
-            'qmax0': None,
-            'qmin0': None,
-            'bmax': None,
-            'bmin': None,
-            # cone vertex
-            'pvx': None,
-            'qvx': None,
-            # too small nonzero slope errors
-            'b_too_small': False,
-            'bmax_too_small': False,
-            'bmin_too_small': False,
-            'bdiff_too_small': False,
-        }
-        for i in data.network.simple_dispatchable_device
-    }
+def get_p_q_linking_geometry(data, config):
+    '''
+    returns a structured array of dtype p_q_linking_geometry_dtype with one entry per simple dispatchable device,
+    in the order of data.network.simple_dispatchable_device
+    '''
 
-    # set info for each device
-    for i in data.network.simple_dispatchable_device:
-
-        # more convenient names to type
-        uid = i.uid
-        ineq = i.q_bound_cap
-        eq = i.q_linear_cap
-        b = i.beta if i.q_linear_cap == 1 else None
-        bmax = i.beta_ub if i.q_bound_cap == 1 else None
-        bmin = i.beta_lb if i.q_bound_cap == 1 else None
-        q0 = i.q_0 if i.q_linear_cap == 1 else None
-        qmax0 = i.q_0_ub if i.q_bound_cap == 1 else None
-        qmin0 = i.q_0_lb if i.q_bound_cap == 1 else None
-
-        # set info for this device
-        if ineq == 1: # inequality constraints, so not whole plane
-            if bmax != 0.0 and abs(bmax) < config['beta_zero_tol']:
-                info[uid]['bmax_too_small'] = True
-            if bmin != 0.0 and abs(bmin) < config['beta_zero_tol']:
-                info[uid]['bmin_too_small'] = True
-            info[uid]['qmax0'] = qmax0
-            info[uid]['qmin0'] = qmin0
-            info[uid]['bmax'] = bmax
-            info[uid]['bmin'] = bmin
-            if bmax == bmin: # upper and lower constraints parallel, so not cone
-                if qmin0 > qmax0: # empty
-                    info[uid]['empty'] = True
-                else: # not empty
-                    if qmin0 == qmax0: # line
-                        info[uid]['line'] = True
-                        if bmax == 0.0: # horiz
-                            info[uid]['upper_horiz'] = True
-                            info[uid]['lower_horiz'] = True
-                        else: # sloped
-                            if bmax > 0.0: # sloped up
-                                info[uid]['upper_sloped_up'] = True
-                                info[uid]['lower_sloped_up'] = True
-                            else: # sloped down
-                                info[uid]['upper_sloped_down'] = True
-                                info[uid]['lower_sloped_down'] = True
-                    else: # band
-                        info[uid]['band'] = True
-                        if bmax == 0.0: # horiz
-                            info[uid]['upper_horiz'] = True
-                            info[uid]['lower_horiz'] = True
-                        else: # sloped
-                            if bmax > 0.0: # sloped up
-                                info[uid]['upper_sloped_up'] = True
-                                info[uid]['lower_sloped_up'] = True
-                            else: # sloped down
-                                info[uid]['upper_sloped_down'] = True
-                                info[uid]['lower_sloped_down'] = True
-            else: # upper and lower constraints not parallel, so cone
-                if abs(bmax - bmin) < config['beta_zero_tol']:
-                    info[uid]['bdiff_too_small'] = True
-                info[uid]['cone'] = True
-                # p vertex
-                info[uid]['pvx'] = (qmin0 - qmax0) / (bmax - bmin)
-                # q vertex
-                if abs(bmax) < abs(bmin):
-                    info[uid]['qvx'] = qmax0 + bmax * info[uid]['pvx']
-                else:
-                    info[uid]['qvx'] = qmin0 + bmin * info[uid]['pvx']
-                if bmax > bmin: # opening right
-                    info[uid]['opening_right'] = True
-                else: # opening left
-                    info[uid]['opening_left'] = True
-                if bmax == 0.0: # upper constraint horiz
-                    info[uid]['upper_horiz'] = True
-                else: # upper constraint sloped
-                    if bmax > 0.0: # upper constraint sloped up
-                        info[uid]['upper_sloped_up'] = True
-                    else: # upper constraint sloped down
-                        info[uid]['upper_sloped_down'] = True
-                if bmin == 0.0: # lower constraint horiz
-                    info[uid]['lower_horiz'] = True
-                else: # lower constraint sloped
-                    if bmin > 0.0: # lower constraint sloped up
-                        info[uid]['lower_sloped_up'] = True
-                    else: # lower constraint sloped down
-                        info[uid]['lower_sloped_down'] = True
-        else: # no inequality constraints, so not empty, also not band and not cone
-            if eq == 1: # equality constraints, so line
-                if b != 0.0 and abs(b) < config['beta_zero_tol']:
-                    info[uid]['b_too_small'] = True
-                info[uid]['line'] = True
-                info[uid]['qmax0'] = q0
-                info[uid]['qmin0'] = q0
-                info[uid]['bmax'] = b
-                info[uid]['bmin'] = b
-                if b == 0.0: # horiz line
-                    info[uid]['upper_horiz'] = True
-                    info[uid]['lower_horiz'] = True
-                else: # sloped line
-                    if b > 0.0: # sloped up
-                        info[uid]['upper_sloped_up'] = True
-                        info[uid]['lower_sloped_up'] = True
-                    else: # sloped down
-                        info[uid]['upper_sloped_down'] = True
-                        info[uid]['lower_sloped_down'] = True
-            else: # no equality constraints, and no inequality constraints, so whole plane
-                info[uid]['plane'] = True
+    sds = data.network.simple_dispatchable_device
+    num_sd = len(sds)
+    nan = float('nan')
+    tol = config['beta_zero_tol']
+    ineq = numpy.array([i.q_bound_cap == 1 for i in sds], dtype=bool).reshape((num_sd, ))
+    eq = numpy.array([i.q_linear_cap == 1 for i in sds], dtype=bool).reshape((num_sd, ))
+    b = numpy.array([i.beta if i.q_linear_cap == 1 else nan for i in sds], dtype=float).reshape((num_sd, ))
+    q0 = numpy.array([i.q_0 if i.q_linear_cap == 1 else nan for i in sds], dtype=float).reshape((num_sd, ))
+    bmax = numpy.array([i.beta_ub if i.q_bound_cap == 1 else nan for i in sds], dtype=float).reshape((num_sd, ))
+    bmin = numpy.array([i.beta_lb if i.q_bound_cap == 1 else nan for i in sds], dtype=float).reshape((num_sd, ))
+    qmax0 = numpy.array([i.q_0_ub if i.q_bound_cap == 1 else nan for i in sds], dtype=float).reshape((num_sd, ))
+    qmin0 = numpy.array([i.q_0_lb if i.q_bound_cap == 1 else nan for i in sds], dtype=float).reshape((num_sd, ))
+
+    # inequality constraints take precedence over equality constraints
+    eq_only = eq & ~ineq
+    info = numpy.zeros(shape=(num_sd, ), dtype=p_q_linking_geometry_dtype)
+    info['b'] = b
+    info['qmax0'] = numpy.where(ineq, qmax0, q0)
+    info['qmin0'] = numpy.where(ineq, qmin0, q0)
+    info['bmax'] = numpy.where(ineq, bmax, b)
+    info['bmin'] = numpy.where(ineq, bmin, b)
+    info['pvx'] = nan
+    info['qvx'] = nan
+
+    with numpy.errstate(invalid='ignore'):
+        info['b_too_small'] = eq_only & (b != 0.0) & (numpy.absolute(b) < tol)
+        info['bmax_too_small'] = ineq & (bmax != 0.0) & (numpy.absolute(bmax) < tol)
+        info['bmin_too_small'] = ineq & (bmin != 0.0) & (numpy.absolute(bmin) < tol)
+
+        # upper and lower constraints parallel, so not cone
+        parallel = ineq & (bmax == bmin)
+        empty = parallel & (qmin0 > qmax0)
+        line = (parallel & ~empty & (qmin0 == qmax0)) | eq_only
+        band = parallel & ~empty & ~(qmin0 == qmax0)
+        cone = ineq & ~parallel
+        info['code'][empty] = p_q_linking_empty
+        info['code'][line] = p_q_linking_line
+        info['code'][band] = p_q_linking_band
+        info['code'][cone] = p_q_linking_cone
+
+        # slopes. for a line or band, the lower constraint is parallel to the upper constraint
+        sloped = line | band | cone
+        upper_slope = numpy.where(info['bmax'] == 0.0, 0, numpy.where(info['bmax'] > 0.0, 1, -1))
+        lower_slope = numpy.where(info['bmin'] == 0.0, 0, numpy.where(info['bmin'] > 0.0, 1, -1))
+        info['upper_slope'] = numpy.where(sloped, upper_slope, 0)
+        info['lower_slope'] = numpy.where(sloped, numpy.where(cone, lower_slope, upper_slope), 0)
+
+        # cone vertex and orientation
+        info['bdiff_too_small'] = cone & (numpy.absolute(bmax - bmin) < tol)
+        pvx = (qmin0 - qmax0) / (bmax - bmin)
+        qvx = numpy.where(numpy.absolute(bmax) < numpy.absolute(bmin), qmax0 + bmax * pvx, qmin0 + bmin * pvx)
+        info['pvx'][cone] = pvx[cone]
+        info['qvx'][cone] = qvx[cone]
+        info['opening_right'] = cone & (bmax > bmin)
 
     return info
 
@@ -176,6 +129,10 @@ def compute_max_min_p_from_max_min_p_q_and_linking(p_max, p_min, q_max, q_min, l
 
     feas, y_max, y_min = compute_max_min_p_from_max_min_p_q_and_linking(p_max, p_min, q_max, q_min, linking)
 
+    p_max, p_min, q_max, q_min = float arrays of the same shape,
+    linking = p_q_linking_geometry_dtype array broadcasting to that shape, e.g. one device per row.
+    for each entry:
+
     Let W be the set of (p,q) satisfying the linking constaints and
     p_min <= p <= p_max and q_min <= q <= q_max.
 
@@ -187,124 +144,59 @@ def compute_max_min_p_from_max_min_p_q_and_linking(p_max, p_min, q_max, q_min, l
 
     y_max =
       maximum value of p such that (p, q) is in W for some q if W is not empty
-      None else
 
     y_min =
       minimum value of p such that (p, q) is in W for some q if W is not empty
-      None else
 
     If feas is False, y_max and y_min will generally be floats with y_min > y_max.
     In some cases we will return y_max = -float('inf') and y_min = float('inf').
     This happens when the infeasibility is due to nonoverlapping constraints of the form
     q <= q_up and q >= q_lo with q_up < q_lo. In that case nothing about p_min or p_max
     can restore feasibility, so we set y_max = -float('inf') and y_min = float('inf').
+    If p_min > p_max, y_max = p_max and y_min = p_min.
     In any case, feas = True if and only if y_min <= y_max.
+    entries with linking code p_q_linking_plane are not cut, and then feas = (p_min <= p_max).
     '''
 
-    # assume feasible unless prove otherwise
-    feas = True
+    code = linking['code']
+    upper_slope = linking['upper_slope']
+    lower_slope = linking['lower_slope']
+    qmax0 = linking['qmax0']
+    qmin0 = linking['qmin0']
+    pvx = linking['pvx']
+    opening_right = linking['opening_right']
 
     # start with rectangle bounds on p, then cut them down
-    y_max = p_max
-    y_min = p_min
-
-    if p_min > p_max: # p bounds infeas
-        feas = False
-        return feas, y_max, y_min
-
-    if q_min > q_max: # q bounds infeas
-        y_max = -float('inf')
-        y_min = float('inf')
-        feas = False
-        return feas, y_max, y_min
-
-    if linking['empty']: # empty linking set is infeas
-        y_max = -float('inf')
-        y_min = float('inf')
-        feas = False
-        return feas, y_max, y_min
-
-    if linking['cone']: # cone
-        # print('pmax: {}, pmin: {}, qmax: {}, qmin: {}, geometry: {}'.format(p_max, p_min, q_max, q_min, linking))
-        # constraints on p implied by upper linking constraint and q_min
-        if linking['upper_sloped_up']: # if upper constraint slopes up, then it constrains p from below
-            y_min = max(y_min, (q_min - linking['qmax0']) / linking['bmax'])
-        elif linking['upper_sloped_down']: # if upper constraint slopes down, then it constrains p from above
-            y_max = min(y_max, (q_min - linking['qmax0']) / linking['bmax'])
-        elif linking['qmax0'] < q_min: # if upper constraint is horizontal, then q_min can make infeas
-            y_max = -float('inf')
-            y_min = float('inf')
-            feas = False
-            return feas, y_max, y_min
-        # constraints on p implied by lower linking constraint and q_max
-        if linking['lower_sloped_up']: # if lower constraint slopes up, then it constrains p from above
-            y_max = min(y_max, (q_max - linking['qmin0']) / linking['bmin'])
-        elif linking['lower_sloped_down']: # if lower constraint slopes down, then it constrains p from below
-            y_min = max(y_min, (q_max - linking['qmin0']) / linking['bmin'])
-        elif linking['qmin0'] > q_max: # if lower constraint is horizontal, then q_max can make infeas
-            y_max = -float('inf')
-            y_min = float('inf')
-            feas = False
-            return feas, y_max, y_min
-        # constraints on p implied by upper and lower linking constraints
-        if linking['opening_right']: # opening right, so vertex constrains p from below
-            y_min = max(y_min, linking['pvx'])
-        else: # opening left, so vertex constrains p from above
-            y_max = min(y_max, linking['pvx'])
-        # ready to return
-        if y_min > y_max:
-            feas = False
-        return feas, y_max, y_min
-
-    if linking['band']: # band
-        if linking['upper_horiz']: # horizontal band
-            if linking['qmax0'] < q_min:
-                y_max = -float('inf')
-                y_min = float('inf')
-                feas = False
-                return feas, y_max, y_min
-            if linking['qmin0'] > q_max:
-                y_max = -float('inf')
-                y_min = float('inf')
-                feas = False
-                return feas, y_max, y_min
-        else: # sloped band
-            if linking['upper_sloped_up']: # band sloping up
-                y_max = min(y_max, (q_max - linking['qmin0']) / linking['bmin'])
-                y_min = max(y_min, (q_min - linking['qmax0']) / linking['bmax'])
-            else: # band sloping down
-                y_max = min(y_max, (q_min - linking['qmax0']) / linking['bmax'])
-                y_min = max(y_min, (q_max - linking['qmin0']) / linking['bmin'])
-        # ready to return
-        if y_min > y_max:
-            feas = False
-        return feas, y_max, y_min
-
-    if linking['line']: # line
-        if linking['upper_horiz']: # horizontal line
-            if linking['qmin0'] > q_max:
-                y_max = -float('inf')
-                y_min = float('inf')
-                feas = False
-                return feas, y_max, y_min
-            if linking['qmax0'] < q_min:
-                y_max = -float('inf')
-                y_min = float('inf')
-                feas = False
-                return feas, y_max, y_min
-        else: # sloped line
-            if linking['upper_sloped_up']: # line sloping up
-                y_max = min(y_max, (q_max - linking['qmax0']) / linking['bmax'])
-                y_min = max(y_min, (q_min - linking['qmax0']) / linking['bmax'])
-            else: # line sloping down
-                y_max = min(y_max, (q_min - linking['qmax0']) / linking['bmax'])
-                y_min = max(y_min, (q_max - linking['qmax0']) / linking['bmax'])
-        # ready to return
-        if y_min > y_max:
-            feas = False
-        return feas, y_max, y_min
-
-    # if we have not returned yet, there is a problem
+    linked = (code != p_q_linking_plane)
+    p_feas = ~(p_min > p_max)
+    cut = linked & p_feas & ~(q_min > q_max) & (code != p_q_linking_empty)
+
+    # q bounds infeas or empty linking set or a horizontal constraint outside the q bounds
+    infeas = linked & p_feas & (~cut | ((upper_slope == 0) & (qmax0 < q_min)) | ((lower_slope == 0) & (qmin0 > q_max)))
+    cut &= ~infeas
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        # p where the upper constraint meets q_min, and where the lower constraint meets q_max
+        y_upper = (q_min - qmax0) / linking['bmax']
+        y_lower = (q_max - qmin0) / linking['bmin']
+
+    # an upper constraint sloping up constrains p from below, sloping down from above.
+    # a lower constraint sloping up constrains p from above, sloping down from below.
+    # a cone vertex constrains p from below if opening right, from above if opening left
+    y_max = numpy.array(p_max, dtype=float)
+    y_min = numpy.array(p_min, dtype=float)
+    y_min = numpy.where(cut & (upper_slope == 1) & (y_upper > y_min), y_upper, y_min)
+    y_max = numpy.where(cut & (upper_slope == -1) & (y_upper < y_max), y_upper, y_max)
+    y_max = numpy.where(cut & (lower_slope == 1) & (y_lower < y_max), y_lower, y_max)
+    y_min = numpy.where(cut & (lower_slope == -1) & (y_lower > y_min), y_lower, y_min)
+    cone = cut & (code == p_q_linking_cone)
+    y_min = numpy.where(cone & opening_right & (pvx > y_min), pvx, y_min)
+    y_max = numpy.where(cone & ~opening_right & (pvx < y_max), pvx, y_max)
+
+    y_max[infeas] = -float('inf')
+    y_min[infeas] = float('inf')
+    feas = (y_min <= y_max)
+    return feas, y_max, y_min
 
 def scrub_data(problem_file, config_file, scrubbed_problem_file):
 
@@ -319,31 +211,191 @@ def scrub_data(problem_file, config_file, scrubbed_problem_file):
     # output file
     print('scrubbed problem data file: {}\n'.format(scrubbed_problem_file))
 
-    # use json? or pydantic model? - json for now
-    use_json = True
-
-    if use_json:
+    # stream the json text? or json? or pydantic model? - stream for now
+    # streaming reads and writes the file in chunks, so memory does not grow with the file size,
+    # only with the number of distinct uids
+    use_stream = True
+    use_json = False
+
+    if use_stream:
+        with open(problem_file, 'r') as f_in, open(scrubbed_problem_file, 'w') as f_out:
+            uid_map = scrub_json_stream(utils.JsonStream(f_in), f_out, {})
+        print('number of scrubbed uids: {}'.format(len(uid_map)))
+    elif use_json:
         problem_data_dict = read_json(problem_file)
         scrubbed_problem_data_dict = scrub_problem_data_dict(problem_data_dict, config)
         write_json(scrubbed_problem_data_dict, scrubbed_problem_file)
     else:
+        from datamodel.input.data import InputDataFile
         problem_data_model = InputDataFile.load(problem_file)
         scrubbed_problem_data_model = scrub_problem_data_model(problem_data_model, config)
         scrubbed_problem_data_model.save(scrubbed_problem_file)
 
-def scrub_problem_data_dict(problem_data_dict, config):
+# keys of uid strings and lists of uid strings, in the problem and solution files
+scrub_uid_keys = ['uid', 'bus', 'fr_bus', 'to_bus', 'components', 'active_reserve_uids', 'reactive_reserve_uids']
+
+def get_scrubbed_uid(uid_map, uid):
+    '''
+    anonymized uid for uid
+    uids are numbered in the order they are first seen, so the mapping is deterministic for a given file,
+    and a uid and all its references map to the same anonymized uid
+    '''
+
+    scrubbed_uid = uid_map.get(uid)
+    if scrubbed_uid is None:
+        scrubbed_uid = 'uid_{}'.format(len(uid_map))
+        uid_map[uid] = scrubbed_uid
+    return scrubbed_uid
+
+def scrub_json_stream(stream, f, uid_map, key=None):
+    '''
+    copy the next json value from stream (utils.JsonStream) to the text file f,
+    replacing each uid string under a key in scrub_uid_keys by get_scrubbed_uid.
+    other values are copied as text.
+    key = key of the value in the enclosing object
+    returns uid_map
+    '''
+
+    c = stream.peek()
+    if c == '{':
+        stream.expect('{')
+        f.write('{')
+        num_items = 0
+        while stream.peek() != '}':
+            if num_items > 0:
+                f.write(',')
+            k, k_text = stream.value_and_text()
+            stream.expect(':')
+            f.write(k_text)
+            f.write(':')
+            scrub_json_stream(stream, f, uid_map, k)
+            stream.skip_comma()
+            num_items += 1
+        stream.expect('}')
+        f.write('}')
+    elif c == '[':
+        text = None
+        if key not in scrub_uid_keys:
+            # e.g. a time series, copied as one piece
+            text = stream.scalar_array_text()
+        if text is not None:
+            f.write(text)
+        else:
+            stream.expect('[')
+            f.write('[')
+            num_items = 0
+            while stream.peek() != ']':
+                if num_items > 0:
+                    f.write(',')
+                scrub_json_stream(stream, f, uid_map, key)
+                stream.skip_comma()
+                num_items += 1
+            stream.expect(']')
+            f.write(']')
+    else:
+        val, text = stream.value_and_text()
+        if key in scrub_uid_keys and isinstance(val, str):
+            text = json.dumps(get_scrubbed_uid(uid_map, val))
+        f.write(text)
+    return uid_map
+
+def scrub_problem_data_dict(problem_data_dict, config, uid_map=None):
+    '''
+    scrub problem_data_dict in place, as scrub_json_stream does for the file
+    '''
 
     # todo
-    # anonymize UIDs
     # ensure dispatchable device cost functions cover all p-values that may need to be evaluated
 
+    if uid_map is None:
+        uid_map = {}
+    scrub_json_value(problem_data_dict, uid_map)
     return problem_data_dict
 
+def scrub_json_value(value, uid_map, key=None):
+    '''
+    returns value with uids scrubbed, modifying dicts and lists in place
+    '''
+
+    if isinstance(value, dict):
+        for k in value.keys():
+            value[k] = scrub_json_value(value[k], uid_map, k)
+    elif isinstance(value, list):
+        for i in range(len(value)):
+            value[i] = scrub_json_value(value[i], uid_map, key)
+    elif key in scrub_uid_keys and isinstance(value, str):
+        value = get_scrubbed_uid(uid_map, value)
+    return value
+
 def scrub_problem_data_model(problem_data_model, config):
 
     return problem_data_model
 
-def check_data(problem_file, solution_file, config_file, summary_csv_file, summary_json_file, problem_errors_file, ignored_errors_file, solution_errors_file):
+class SolutionReader(object):
+    '''
+    reads a solution file and validates it with pydantic on a background thread.
+    each file is parsed once - the data model is validated from the dict read from the file.
+    get_data_dict and get_data_model wait for the result, raising any exception from the background thread.
+    close stops a reader whose result is not needed, e.g. after a problem check fails.
+    '''
+
+    def __init__(self, solution_file):
+
+        self.solution_file = solution_file
+        self.times = {}
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.data_dict_future = executor.submit(self.read_data_dict)
+        self.data_model_future = executor.submit(self.read_data_model)
+        executor.shutdown(wait=False)
+
+    def read_data_dict(self):
+
+        start_time = time.time()
+        data_dict = read_json(self.solution_file)
+        end_time = time.time()
+        self.times['read'] = end_time - start_time
+        return data_dict
+
+    def read_data_model(self):
+
+        from datamodel.output.data import OutputDataFile
+        data_dict = self.data_dict_future.result()
+        start_time = time.time()
+        data_model = OutputDataFile(**data_dict)
+        end_time = time.time()
+        self.times['load'] = end_time - start_time
+        return data_model
+
+    def get_data_dict(self):
+
+        return self.data_dict_future.result()
+
+    def get_data_model(self):
+
+        return self.data_model_future.result()
+
+    def close(self):
+        '''
+        cancel the validation if it has not started, and wait for the background thread to finish.
+        a read or validation already running cannot be interrupted, so this waits for it, but the thread
+        does not outlive the caller, e.g. to overlap the next pair in a batch
+        '''
+
+        self.data_model_future.cancel()
+        concurrent.futures.wait([self.data_dict_future, self.data_model_future])
+
+def check_data(problem_file, solution_file, config_file, summary_csv_file, summary_json_file, problem_errors_file, ignored_errors_file, solution_errors_file, git_info=None):
+    '''
+    git_info = None: read the git info here
+    git_info = dict: use this git info, e.g. read once for a batch of checks
+
+    problem and solution errors are written to problem_errors_file and solution_errors_file as json lines,
+    one record per failed check (see get_error_records)
+    '''
+
+    from pydantic.error_wrappers import ValidationError
+    from datamodel.input.data import InputDataFile
+    from datautilities import evaluation
 
     # read config
     config = read_json(config_file)
@@ -368,7 +420,8 @@ def check_data(problem_file, solution_file, config_file, summary_csv_file, summa
 
     # git info
     try:
-        git_info = utils.get_git_info_all()
+        if git_info is None:
+            git_info = utils.get_git_info_all()
         print('git info: {}\n'.format(git_info))
     except GitError:
         print('git info error ignored\n')
@@ -381,6 +434,11 @@ def check_data(problem_file, solution_file, config_file, summary_csv_file, summa
     else:
         summary['git_info'] = git_info
 
+    # read and validate the solution file in the background, while the problem is read and checked.
+    # if the problem fails a check, the reader is closed before raising
+    if solution_file is not None:
+        solution_reader = SolutionReader(solution_file)
+
     # read problem data file without validation (faster)
     start_time = time.time()
     try:
@@ -389,8 +447,9 @@ def check_data(problem_file, solution_file, config_file, summary_csv_file, summa
         summary['problem']['pass'] = 0
         write_summary(summary, summary_csv_file, summary_json_file)
         print('data read error - read without validation\n')
-        with open(problem_errors_file, 'a') as f:
-            f.write(traceback.format_exc())
+        write_error_records(problem_errors_file, e, 'read')
+        if solution_file is not None:
+            solution_reader.close()
         raise e
     print('after reading problem without validation, memory info: {}'.format(utils.get_memory_info()))
     end_time = time.time()
@@ -405,15 +464,17 @@ def check_data(problem_file, solution_file, config_file, summary_csv_file, summa
     # not sure yet about larger cases or solution data check or solution eval
     # have not yet implemented more expensive problem data checks - initial AC feas, independent device feas
     # have not yet implemented scrubber - i.e. UID anonymization
+    # validate the dict already read rather than parsing the file again, as InputDataFile.load would
     start_time = time.time()
     try:
-        data_model = InputDataFile.load(problem_file)
+        data_model = InputDataFile(**problem_data_dict)
     except ValidationError as e:
         summary['problem']['pass'] = 0
         write_summary(summary, summary_csv_file, summary_json_file)
         print('data read error - pydantic validation\n')
-        with open(problem_errors_file, 'a') as f:
-            f.write(traceback.format_exc())
+        write_error_records(problem_errors_file, e, 'pydantic')
+        if solution_file is not None:
+            solution_reader.close()
         raise e
     print('after reading problem with validation, memory info: {}'.format(utils.get_memory_info()))
     end_time = time.time()
@@ -422,13 +483,14 @@ def check_data(problem_file, solution_file, config_file, summary_csv_file, summa
     # independent data model checks
     start_time = time.time()
     try:
-        model_checks(data_model, config)
+        problem_data_array = model_checks(data_model, config, problem_data_dict)
     except ModelError as e:
         summary['problem']['pass'] = 0
         write_summary(summary, summary_csv_file, summary_json_file)
         print('model error - independent checks\n')
-        with open(problem_errors_file, 'a') as f:
-            f.write(traceback.format_exc())
+        write_error_records(problem_errors_file, e, 'model_checks')
+        if solution_file is not None:
+            solution_reader.close()
         raise e
     print('after problem model checks, memory info: {}'.format(utils.get_memory_info()))
     end_time = time.time()
@@ -442,8 +504,9 @@ def check_data(problem_file, solution_file, config_file, summary_csv_file, summa
         summary['problem']['pass'] = 0
         write_summary(summary, summary_csv_file, summary_json_file)
         print('model error - connectedness\n')
-        with open(problem_errors_file, 'a') as f:
-            f.write(traceback.format_exc())
+        write_error_records(problem_errors_file, e, 'connected')
+        if solution_file is not None:
+            solution_reader.close()
         raise e
     print('after checking problem connectedness, memory info: {}'.format(utils.get_memory_info()))
     end_time = time.time()
@@ -459,35 +522,36 @@ def check_data(problem_file, solution_file, config_file, summary_csv_file, summa
     if solution_file is not None:
 
         # read solution data file without validation (faster)
+        # the solution reader started reading it in the background before the problem checks,
+        # so here we only wait for it to finish
         start_time = time.time()
         try:
-            solution_data_dict = read_json(solution_file)
-        except Error as e:
+            solution_data_dict = solution_reader.get_data_dict()
+        except Exception as e:
             summary['solution']['pass'] = 0
             write_summary(summary, summary_csv_file, summary_json_file)
             print('solution read error - read without validation')
-            with open(solution_errors_file, 'a') as f:
-                f.write(traceback.format_exc())
+            write_error_records(solution_errors_file, e, 'read')
             raise e
         print('after read solution without validation, memory info: {}'.format(utils.get_memory_info()))
         end_time = time.time()
-        print('read solution data file without validation time: {}'.format(end_time - start_time))
+        print('read solution data file without validation time: {}, wait time: {}'.format(
+            solution_reader.times['read'], end_time - start_time))
 
         # read solution
         start_time = time.time()
         #print('solution file: {}'.format(solution_file))
         try:
-            solution_data_model = OutputDataFile.load(solution_file)
+            solution_data_model = solution_reader.get_data_model()
         except ValidationError as e:
             summary['solution']['pass'] = 0
             write_summary(summary, summary_csv_file, summary_json_file)
             print('solution read error - pydantic validation')
-            with open(solution_errors_file, 'a') as f:
-                f.write(traceback.format_exc())
+            write_error_records(solution_errors_file, e, 'pydantic')
             raise e
         print('after read solution with validation, memory info: {}'.format(utils.get_memory_info()))
         end_time = time.time()
-        print('solution load time: {}'.format(end_time - start_time))
+        print('solution load time: {}, wait time: {}'.format(solution_reader.times['load'], end_time - start_time))
         
         # solution data model checks
         start_time = time.time()
@@ -497,8 +561,7 @@ def check_data(problem_file, solution_file, config_file, summary_csv_file, summa
             summary['solution']['pass'] = 0
             write_summary(summary, summary_csv_file, summary_json_file)
             print('solution model error - independent checks\n')
-            with open(solution_errors_file, 'a') as f:
-                f.write(traceback.format_exc())
+            write_error_records(solution_errors_file, e, 'model_checks')
             raise e
         print('after solution_model_checks(), memory info: {}'.format(utils.get_memory_info()))
         end_time = time.time()
@@ -512,10 +575,11 @@ def check_data(problem_file, solution_file, config_file, summary_csv_file, summa
         summary['solution']['pass'] = 1
 
         # convert problem data to numpy arrays
+        # model_checks set up problem_data_array from the json dict already read rather than the data model
+        # - it has passed validation and is faster to walk - and built the sections used by its checks
         start_time = time.time()
-        problem_data_array = arraydata.InputData()
-        problem_data_array.set_from_data_model(data_model)
-        print('after problem_data_array.set_from_data_model(), memory info: {}'.format(utils.get_memory_info()))
+        problem_data_array.set_all_sections()
+        print('after problem_data_array.set_all_sections(), memory info: {}'.format(utils.get_memory_info()))
         end_time = time.time()
         print('convert problem data to numpy arrays time: {}'.format(end_time - start_time))
 
@@ -575,6 +639,7 @@ def check_data(problem_file, solution_file, config_file, summary_csv_file, summa
 def write_summary(summary, summary_csv_file=None, summary_json_file=None):
 
     if summary_csv_file is not None:
+        import pandas
         summary_table = pandas.json_normalize(summary)
         summary_table.to_csv(summary_csv_file, index=False)
     if summary_json_file is not None:
@@ -651,9 +716,127 @@ def get_solution_summary(problem_data, solution_data):
     solution_summary = {}
     return solution_summary
 
-def model_checks(data, config):
+class DerivedData(object):
+    '''
+    per run cache of quantities derived from the problem data model and used by several checks,
+    e.g. the startup and shutdown trajectories, the p-q linking geometry, the uid dicts.
+    each quantity is computed once, on first use, and its computation time is recorded in self.times
+    '''
+
+    def __init__(self, data, config):
 
-    checks = [
+        self.data = data
+        self.config = config
+        self.values = {}
+        self.times = {}
+        self.lock = threading.RLock()
+
+    def get(self, name, func):
+        '''
+        returns the cached value of name, computing it with func() if needed
+        '''
+
+        with self.lock:
+            if name not in self.values:
+                start_time = time.time()
+                self.values[name] = func()
+                end_time = time.time()
+                self.times[name] = end_time - start_time
+                print('derived data {} time: {}'.format(name, self.times[name]))
+            return self.values[name]
+
+    def get_sd_uid(self):
+
+        return self.get('sd_uid', lambda: [c.uid for c in self.data.network.simple_dispatchable_device])
+
+    def get_sd_ts_dict(self):
+
+        return self.get('sd_ts_dict', lambda: {c.uid: c for c in self.data.time_series_input.simple_dispatchable_device})
+
+    def get_supc(self, check_ambiguous=False):
+        '''
+        the trajectories are computed once, with the ambiguity info, as in get_supc(check_ambiguous=True)
+        '''
+
+        if check_ambiguous:
+            return self.get('sd_t_supc_ambiguous', lambda: get_supc(self.data, self.config, True, self))
+        else:
+            return self.get('sd_t_supc', lambda: [[c[0] for c in s] for s in self.get_supc(True)])
+
+    def get_sdpc(self, check_ambiguous=False):
+
+        if check_ambiguous:
+            return self.get('sd_t_sdpc_ambiguous', lambda: get_sdpc(self.data, self.config, True, self))
+        else:
+            return self.get('sd_t_sdpc', lambda: [[c[0] for c in s] for s in self.get_sdpc(True)])
+
+    def get_sd_t_cost_function_pmax(self):
+
+        return self.get('sd_t_cost_function_pmax', lambda: get_sd_t_cost_function_pmax(self.data, self))
+
+    def get_p_q_linking_geometry(self):
+
+        return self.get('p_q_linking_geometry', lambda: get_p_q_linking_geometry(self.data, self.config))
+
+    def get_sd_t_p_q_max_min(self):
+
+        return self.get('sd_t_p_q_max_min', lambda: get_sd_t_p_q_max_min(self.data, self))
+
+    def get_sd_ramping_info(self):
+
+        return self.get('sd_ramping_info', lambda: get_sd_ramping_info(self.data))
+
+    def set_all(self):
+        '''
+        compute all the quantities, e.g. before forking check processes, so that they are computed once, here,
+        rather than once in each process.
+        a quantity that raises an exception is left unset, and the check that uses it then raises the exception
+        '''
+
+        getters = [
+            self.get_sd_uid,
+            self.get_sd_ts_dict,
+            self.get_supc,
+            self.get_sdpc,
+            self.get_sd_t_cost_function_pmax,
+            self.get_p_q_linking_geometry,
+            self.get_sd_t_p_q_max_min,
+            self.get_sd_ramping_info,
+            ]
+        for g in getters:
+            try:
+                g()
+            except Exception:
+                pass
+
+def model_checks(data, config, problem_data_dict=None, num_workers=None):
+    '''
+    run the independent problem data checks, collecting the errors of all checks into one ModelError
+
+    the checks run in stages:
+    1. timestamp checks on the data model
+    2. structure checks on the data model - uid uniqueness and membership, time series lengths.
+       the time series lengths are read once into an index (get_ts_len_index) and compared as arrays.
+       the lb <= ub checks on each item's own time series also run from this index.
+       the problem arrays are only well defined if the uid and length checks pass, so if any fail,
+       the errors so far are raised, with a line saying that the later stages were skipped.
+    3. array checks on arraydata.InputData, vectorized over devices and intervals
+    4. the remaining checks on the data model.
+       these share a DerivedData, so quantities used by several checks are computed once
+
+    the InputData for stage 3 is built from problem_data_dict if given, otherwise from data,
+    with lazy sections, so only the sections the checks read are built here.
+    returns the InputData, for reuse by the caller
+
+    num_workers > 1: run the checks within a stage concurrently (see run_checks).
+      the numpy checks (time series lengths, array checks) run on threads,
+      the pure python checks on the data model run on processes.
+      the errors are reported in the same order as in serial.
+      the DerivedData is filled before the check processes fork, so each quantity is still computed once.
+    num_workers = None: take num_workers from config['check_num_workers'], default 1
+    '''
+
+    timestamp_checks = [
         timestamp_start_required,
         timestamp_stop_required,
         timestamp_start_valid,
@@ -664,6 +847,8 @@ def model_checks(data, config):
         timestamp_stop_minus_start_eq_total_horizon,
         # interval_duratations in interval_duration_schedules - distinguish between divisions - TODO
         interval_duration_in_schedules,
+        ]
+    structure_checks = [
         network_and_reliability_uids_not_repeated,
         ts_uids_not_repeated,
         ctg_dvc_uids_in_domain,
@@ -684,6 +869,8 @@ def model_checks(data, config):
         ts_prz_uids_cover_domain,
         ts_qrz_uids_in_domain,
         ts_qrz_uids_cover_domain,
+        ]
+    len_checks = [
         ts_sd_on_status_ub_len_eq_num_t,
         ts_sd_on_status_lb_len_eq_num_t,
         ts_sd_p_lb_len_eq_num_t,
@@ -705,21 +892,28 @@ def model_checks(data, config):
         ts_prz_ramping_reserve_down_len_eq_num_t,
         ts_qrz_react_up_len_eq_num_t,
         ts_qrz_react_down_len_eq_num_t,
+        ]
+    # lb <= ub for each item's own time series, with no need for valid uids or other lengths
+    value_checks = [
         ts_sd_on_status_lb_le_ub,
         ts_sd_p_lb_le_ub,
         ts_sd_q_lb_le_ub,
+        ]
+    array_checks = [
         t_d_discrete,
         sd_d_up_0_discrete,
         sd_d_dn_0_discrete,
         sd_d_up_min_discrete,
         sd_d_dn_min_discrete,
-        sd_sus_d_dn_max_discrete,
         sd_w_a_en_max_start_discrete,
         sd_w_a_en_max_end_discrete,
         sd_w_a_en_min_start_discrete,
         sd_w_a_en_min_end_discrete,
         sd_w_a_su_max_start_discrete,
         sd_w_a_su_max_end_discrete,
+        ]
+    checks = [
+        sd_sus_d_dn_max_discrete,
         supc_not_ambiguous,
         sdpc_not_ambiguous,
         ts_sd_cost_function_covers_p_max,
@@ -737,42 +931,198 @@ def model_checks(data, config):
         sd_t_q_max_min_p_q_linking_sdpc_feasible,
         sd_t_supc_sdpc_no_overlap,
         ]
+    if num_workers is None:
+        num_workers = config.get('check_num_workers', 1)
     errors = []
-    # try:
-    #     timestamp_start_ge_min(data, config)
-    # except ModelError as e:
-    #     errors.append(e)
-    # except Exception as e:
-    #     msg = (
-    #         'validation.model_checks found errors\n' + 
-    #         'number of errors: {}\n'.format(len(errors)) +
-    #         '\n'.join([str(e) for e in errors]))
-    #     if len(errors) > 0:
-    #         raise ModelError(msg)
-    #     else:
-    #         raise e
-    for c in checks:
-        try:
-            c(data, config)
-        except ModelError as e:
+    run_checks(timestamp_checks, data, config, errors)
+    num_errors = len(errors)
+    run_checks(structure_checks, data, config, errors, num_workers, 'process')
+    ts_len_index = get_ts_len_index(data)
+    run_checks(len_checks, ts_len_index, config, errors, num_workers, 'thread')
+    num_structure_errors = len(errors) - num_errors
+    run_checks(value_checks, ts_len_index, config, errors, num_workers, 'thread')
+    if num_structure_errors > 0:
+        raise_model_check_errors(
+            errors,
+            'skipped the array checks and the remaining checks, since they need the uid structure and time series lengths to pass')
+    problem = arraydata.InputData()
+    if problem_data_dict is None:
+        problem.set_from_data_model(data, lazy=True)
+    else:
+        problem.set_from_json_dict(problem_data_dict, lazy=True)
+    if num_workers > 1:
+        # build the sections before the threads read them
+        problem.set_all_sections()
+    run_checks(array_checks, problem, config, errors, num_workers, 'thread')
+    run_checks(checks, data, config, errors, num_workers, 'process', DerivedData(data, config))
+    raise_model_check_errors(errors)
+    return problem
+
+# read only data for check worker processes.
+# set before the process pool starts, so the forked workers share it with the parent
+check_process_data = None
+
+def run_checks(checks, data, config, errors, num_workers=1, mode='thread', derived=None):
+    '''
+    run each check c(data, config), or c(data, config, derived) if derived is given,
+    appending ModelErrors to errors.
+    any other exception is raised at once, as a ModelError if there are earlier errors
+
+    num_workers > 1: run the checks concurrently on a pool of num_workers workers
+      mode = 'thread': thread pool. for numpy checks, which release the GIL
+      mode = 'process': process pool. for pure python checks.
+        needs the fork start method, otherwise falls back to threads.
+      the results are then taken in the order of checks, so errors has the same content
+      and order as in serial, and the same exception is raised
+    '''
+
+    if num_workers <= 1 or len(checks) <= 1:
+        results = (get_check_result(c, data, config, derived) for c in checks)
+    else:
+        results = get_check_results_parallel(checks, data, config, num_workers, mode, derived)
+    for c, e in zip(checks, results):
+        if e is None:
+            continue
+        elif isinstance(e, ModelError):
+            e.check = c.__name__
             errors.append(e)
-        except Exception as e:
+        else:
             msg = (
                 'validation.model_checks found errors\n' + 
                 'number of errors: {}\n'.format(len(errors)) +
                 '\n'.join([str(e) for e in errors]))
             if len(errors) > 0:
-                raise ModelError(msg)
+                raise ModelError(msg, errors=errors)
             else:
                 raise e
+
+def get_check_result(check, data, config, derived=None):
+    '''
+    returns the exception raised by check(data, config), or None
+    '''
+
+    try:
+        if derived is None:
+            check(data, config)
+        else:
+            check(data, config, derived)
+    except Exception as e:
+        return e
+    return None
+
+def get_check_result_in_process(check_name, config):
+
+    data, derived = check_process_data
+    return get_check_result(globals()[check_name], data, config, derived)
+
+def get_check_results_parallel(checks, data, config, num_workers, mode, derived=None):
+    '''
+    returns the results of get_check_result for checks, in order
+    '''
+
+    global check_process_data
+    num_workers = min(num_workers, len(checks))
+    if mode == 'process' and 'fork' in multiprocessing.get_all_start_methods():
+        if derived is not None:
+            derived.set_all()
+        check_process_data = (data, derived)
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=num_workers, mp_context=multiprocessing.get_context('fork')) as executor:
+                futures = [executor.submit(get_check_result_in_process, c.__name__, config) for c in checks]
+                results = []
+                for f in futures:
+                    try:
+                        results.append(f.result())
+                    except Exception as e:
+                        # e.g. the exception could not be sent back from the worker
+                        results.append(e)
+        finally:
+            check_process_data = None
+    elif mode in ['thread', 'process']:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+            results = list(executor.map(lambda c: get_check_result(c, data, config, derived), checks))
+    else:
+        raise ValueError('unknown mode: {}'.format(mode))
+    return results
+
+def raise_model_check_errors(errors, skipped=None):
+    '''
+    skipped = description of checks that were not run, if any
+    '''
+
     if len(errors) > 0:
         msg = (
             'validation.model_checks found errors\n' + 
             'number of errors: {}\n'.format(len(errors)) +
+            ('' if skipped is None else '{}\n'.format(skipped)) +
             '\n'.join([str(r) for r in errors]))
-        raise ModelError(msg)
+        raise ModelError(msg, errors=errors)
+
+def get_check_error(msg, failures, config, num_failures=None):
+    '''
+    returns a ModelError for a check that found failures
+
+    msg = description of the check and of the failure records
+    failures = list of failure records, e.g. tuples of indices, uids, and values
+    num_failures = number of failures found, if failures was already cut short by the check, default len(failures)
+
+    only the first config['max_errors_per_check'] failure records are kept, and formatted into the message,
+    so that a badly broken file does not produce a huge error message.
+    max_errors_per_check = None keeps all of them
+    '''
+
+    if num_failures is None:
+        num_failures = len(failures)
+    max_num = config.get('max_errors_per_check')
+    if max_num is not None and len(failures) > max_num:
+        failures = failures[:max_num]
+    if num_failures > len(failures):
+        text = '{} (first {} of {}): {}'.format(msg, len(failures), num_failures, failures)
+    else:
+        text = '{}: {}'.format(msg, failures)
+    return ModelError(text, description=msg, failures=failures, num_failures=num_failures)
+
+def get_error_records(e, stage):
+    '''
+    returns a list of json serializable records of exception e, raised in stage of check_data
+
+    a ModelError collecting the errors of several checks gives one record per check.
+    a ModelError from get_check_error keeps its failure records,
+    other exceptions keep their traceback
+    '''
+
+    errors = e.errors if isinstance(e, ModelError) and e.errors is not None else [e]
+    records = []
+    for r in errors:
+        record = {'stage': stage, 'error': type(r).__name__}
+        if isinstance(r, ModelError):
+            record['check'] = r.check
+            record['description'] = str(r) if r.description is None else r.description
+            record['num_failures'] = r.num_failures
+            record['failures'] = r.failures
+        else:
+            record['description'] = str(r)
+            record['traceback'] = ''.join(traceback.format_exception(type(r), r, r.__traceback__))
+        records.append(record)
+    return records
+
+def write_error_records(file_name, e, stage):
+    '''
+    append the records of exception e to file_name, as json lines
+    '''
+
+    with open(file_name, 'a') as f:
+        for r in get_error_records(e, stage):
+            f.write(json.dumps(r, cls=utils.NpEncoder) + '\n')
 
 def solution_model_checks(data, solution_data, config):
+    '''
+    run the solution data checks, collecting the errors of all checks into one ModelError
+
+    the checks read the uids and time series lengths from one scan of each time_series_output section
+    (get_output_ts_index), so the cost of the checks is about one read of the solution data
+    '''
 
     checks = [
         output_ts_uids_not_repeated,
@@ -812,11 +1162,13 @@ def solution_model_checks(data, solution_data, config):
         output_ts_two_winding_transformer_tm_len_eq_num_t,
         output_ts_two_winding_transformer_ta_len_eq_num_t,
     ]
+    index = get_output_ts_index(data, solution_data)
     errors = []
     for c in checks:
         try:
-            c(data, solution_data, config)
+            c(index, config)
         except ModelError as e:
+            e.check = c.__name__
             errors.append(e)
         except Exception as e:
             msg = (
@@ -824,7 +1176,7 @@ def solution_model_checks(data, solution_data, config):
                 'number of errors: {}\n'.format(len(errors)) +
                 '\n'.join([str(e) for e in errors]))
             if len(errors) > 0:
-                raise ModelError(msg)
+                raise ModelError(msg, errors=errors)
             else:
                 raise e
     if len(errors) > 0:
@@ -832,7 +1184,7 @@ def solution_model_checks(data, solution_data, config):
             'validation.solution_model_checks found errors\n' + 
             'number of errors: {}\n'.format(len(errors)) +
             '\n'.join([str(r) for r in errors]))
-        raise ModelError(msg)
+        raise ModelError(msg, errors=errors)
 
 def valid_timestamp_str(timestamp_pattern_str, data):
     '''
@@ -862,6 +1214,7 @@ def timestamp_stop_required(data, config):
 
 def timestamp_start_valid(data, config):
 
+    import pandas
     start = data.network.general.timestamp_start
     if start is not None:
         if not valid_timestamp_str(config['timestamp_pattern_str'], start):
@@ -876,6 +1229,7 @@ def timestamp_start_valid(data, config):
 
 def timestamp_stop_valid(data, config):
 
+    import pandas
     end = data.network.general.timestamp_stop
     if end is not None:
         if not valid_timestamp_str(config['timestamp_pattern_str'], end):
@@ -890,6 +1244,7 @@ def timestamp_stop_valid(data, config):
 
 def timestamp_start_ge_min(data, config):
 
+    import pandas
     start = data.network.general.timestamp_start
     if start is not None:
         min_time = config['timestamp_min']
@@ -901,6 +1256,7 @@ def timestamp_start_ge_min(data, config):
 
 def total_horizon_le_timestamp_max_minus_start(data, config):
 
+    import pandas
     start = data.network.general.timestamp_start
     if start is not None:
         max_time = config['timestamp_max']
@@ -913,6 +1269,7 @@ def total_horizon_le_timestamp_max_minus_start(data, config):
 
 def timestamp_stop_le_max(data, config):
 
+    import pandas
     stop = data.network.general.timestamp_stop
     if stop is not None:
         max_time = config['timestamp_max']
@@ -926,6 +1283,7 @@ def timestamp_stop_le_max(data, config):
 
 def timestamp_stop_minus_start_eq_total_horizon(data, config):
 
+    import pandas
     start = data.network.general.timestamp_start
     stop = data.network.general.timestamp_stop
     if (start is not None) and (stop is not None):
@@ -952,19 +1310,12 @@ def interval_duration_in_schedules(data, config):
             interval_durations, schedules)
         raise ModelError(msg)
 
-def output_ts_uids_not_repeated(data, output_data, config):
+def output_ts_uids_not_repeated(index, config):
 
-    uids = output_data.time_series_output.get_uids()
-    uids_sorted = sorted(uids)
-    uids_set = set(uids_sorted)
-    uids_num = {i:0 for i in uids_set}
-    for i in uids:
-        uids_num[i] += 1
-    uids_num_max = max([0] + list(uids_num.values()))
-    if uids_num_max > 1:
-        msg = "fails uid uniqueness in time_series_output section. repeated uids (uid, number of occurrences): {}".format(
-            [(k, v) for k, v in uids_num.items() if v > 1])
-        raise ModelError(msg)
+    uids_repeated = index['uid_repeated']
+    if len(uids_repeated) > 0:
+        msg = "fails uid uniqueness in time_series_output section. repeated uids (uid, number of occurrences)"
+        raise get_check_error(msg, uids_repeated, config)
 
 def ts_uids_not_repeated(data, config):
 
@@ -976,9 +1327,8 @@ def ts_uids_not_repeated(data, config):
         uids_num[i] += 1
     uids_num_max = max([0] + list(uids_num.values()))
     if uids_num_max > 1:
-        msg = "fails uid uniqueness in time_series_input section. repeated uids (uid, number of occurrences): {}".format(
-            [(k, v) for k, v in uids_num.items() if v > 1])
-        raise ModelError(msg)
+        msg = "fails uid uniqueness in time_series_input section. repeated uids (uid, number of occurrences)"
+        raise get_check_error(msg, [(k, v) for k, v in uids_num.items() if v > 1], config)
 
 def network_and_reliability_uids_not_repeated(data, config):
     
@@ -990,9 +1340,8 @@ def network_and_reliability_uids_not_repeated(data, config):
         uids_num[i] += 1
     uids_num_max = max([0] + list(uids_num.values()))
     if uids_num_max > 1:
-        msg = "fails uid uniqueness in network and reliability sections. repeated uids (uid, number of occurrences): {}".format(
-            [(k, v) for k, v in uids_num.items() if v > 1])
-        raise ModelError(msg)
+        msg = "fails uid uniqueness in network and reliability sections. repeated uids (uid, number of occurrences)"
+        raise get_check_error(msg, [(k, v) for k, v in uids_num.items() if v > 1], config)
 
 def ctg_dvc_uids_in_domain(data, config):
 
@@ -1013,11 +1362,10 @@ def ctg_dvc_uids_in_domain(data, config):
         (i, data.reliability.contingency[i].uid, ctg_comp_not_in_domain[i])
         for i in ctg_idx_comp_not_in_domain]
     if len(ctg_idx_comp_not_in_domain) > 0:
-        msg = "fails contingency outaged devices in branches. failing contingencies (index, uid, failing devices): {}".format(
-            ctg_comp_not_in_domain)
-        raise ModelError(msg)
+        msg = "fails contingency outaged devices in branches. failing contingencies (index, uid, failing devices)"
+        raise get_check_error(msg, ctg_comp_not_in_domain, config)
 
-def items_field_in_domain(items, field, domain, items_name, domain_name):
+def items_field_in_domain(items, field, domain, items_name, domain_name, config):
     # todo - use this - more efficient than set membership in a loop
 
     domain_set = set(domain)
@@ -1028,126 +1376,86 @@ def items_field_in_domain(items, field, domain, items_name, domain_name):
     all_values_map = {all_values[i]:i for i in range(len(all_values))}
     failures = [(i, items[i].uid, values[i]) for i in range(len(items)) if all_values_map[values[i]] >= domain_size]
     if len(failures) > 0:
-        msg = "fails items field in domain. items: {}, field: {}, domain: {}, failing items (index, uid, field value): {}".format(items_name, field, domain_name, failures)
-        raise ModelError(msg)
+        msg = "fails items field in domain. items: {}, field: {}, domain: {}, failing items (index, uid, field value)".format(items_name, field, domain_name)
+        raise get_check_error(msg, failures, config)
 
-def items_field_cover_domain(items, field, domain, items_name, domain_name):
+def items_field_cover_domain(items, field, domain, items_name, domain_name, config):
     # todo - use this - more efficient than set membership in a loop
 
     values = [getattr(i, field) for i in items]
     values = set(values)
     failures = list(set(domain).difference(values))
     if len(failures) > 0:
-        msg = "fails items field cover domain. items: {}, field: {}, domain: {}, failing domain elements: {}".format(items_name, field, domain_name, failures)
-        raise ModelError(msg)
+        msg = "fails items field cover domain. items: {}, field: {}, domain: {}, failing domain elements".format(items_name, field, domain_name)
+        raise get_check_error(msg, failures, config)
 
-def output_ts_bus_uids_in_domain(data, solution, config):
+def output_ts_component_uids_in_domain(index, config, component):
 
-    items = solution.time_series_output.bus
-    field = 'uid'
-    domain = data.network.get_bus_uids()
-    items_name = 'time_series_output.bus'
-    domain_name = 'network.bus.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    uids = index[component]['uid']
+    idx = index[component]['uid_not_in_domain']
+    if idx.size > 0:
+        failures = [(i, uids[i], uids[i]) for i in idx[:config.get('max_errors_per_check')].tolist()]
+        msg = "fails items field in domain. items: time_series_output.{}, field: uid, domain: network.{}.uid, failing items (index, uid, field value)".format(
+            component, component)
+        raise get_check_error(msg, failures, config, idx.size)
 
-def output_ts_bus_uids_cover_domain(data, solution, config):
+def output_ts_component_uids_cover_domain(index, config, component):
 
-    items = solution.time_series_output.bus
-    field = 'uid'
-    domain = data.network.get_bus_uids()
-    items_name = 'time_series_output.bus'
-    domain_name = 'network.bus.uid'
-    items_field_cover_domain(items, field, domain, items_name, domain_name)
+    domain = index[component]['domain']
+    idx = index[component]['domain_not_covered']
+    if idx.size > 0:
+        failures = [domain[i] for i in idx[:config.get('max_errors_per_check')].tolist()]
+        msg = "fails items field cover domain. items: time_series_output.{}, field: uid, domain: network.{}.uid, failing domain elements".format(
+            component, component)
+        raise get_check_error(msg, failures, config, idx.size)
 
-def output_ts_shunt_uids_in_domain(data, solution, config):
+def output_ts_bus_uids_in_domain(index, config):
 
-    items = solution.time_series_output.shunt
-    field = 'uid'
-    domain = data.network.get_shunt_uids()
-    items_name = 'time_series_output.shunt'
-    domain_name = 'network.shunt.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    output_ts_component_uids_in_domain(index, config, 'bus')
 
-def output_ts_shunt_uids_cover_domain(data, solution, config):
+def output_ts_bus_uids_cover_domain(index, config):
 
-    items = solution.time_series_output.shunt
-    field = 'uid'
-    domain = data.network.get_shunt_uids()
-    items_name = 'time_series_output.shunt'
-    domain_name = 'network.shunt.uid'
-    items_field_cover_domain(items, field, domain, items_name, domain_name)
+    output_ts_component_uids_cover_domain(index, config, 'bus')
 
-def output_ts_simple_dispatchable_device_uids_in_domain(data, solution, config):
+def output_ts_shunt_uids_in_domain(index, config):
 
-    items = solution.time_series_output.simple_dispatchable_device
-    field = 'uid'
-    domain = data.network.get_simple_dispatchable_device_uids()
-    items_name = 'time_series_output.simple_dispatchable_device'
-    domain_name = 'network.simple_dispatchable_device.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    output_ts_component_uids_in_domain(index, config, 'shunt')
 
-def output_ts_simple_dispatchable_device_uids_cover_domain(data, solution, config):
+def output_ts_shunt_uids_cover_domain(index, config):
 
-    items = solution.time_series_output.simple_dispatchable_device
-    field = 'uid'
-    domain = data.network.get_simple_dispatchable_device_uids()
-    items_name = 'time_series_output.simple_dispatchable_device'
-    domain_name = 'network.simple_dispatchable_device.uid'
-    items_field_cover_domain(items, field, domain, items_name, domain_name)
+    output_ts_component_uids_cover_domain(index, config, 'shunt')
 
-def output_ts_ac_line_uids_in_domain(data, solution, config):
+def output_ts_simple_dispatchable_device_uids_in_domain(index, config):
 
-    items = solution.time_series_output.ac_line
-    field = 'uid'
-    domain = data.network.get_ac_line_uids()
-    items_name = 'time_series_output.ac_line'
-    domain_name = 'network.ac_line.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    output_ts_component_uids_in_domain(index, config, 'simple_dispatchable_device')
 
-def output_ts_ac_line_uids_cover_domain(data, solution, config):
+def output_ts_simple_dispatchable_device_uids_cover_domain(index, config):
 
-    items = solution.time_series_output.ac_line
-    field = 'uid'
-    domain = data.network.get_ac_line_uids()
-    items_name = 'time_series_output.ac_line'
-    domain_name = 'network.ac_line.uid'
-    items_field_cover_domain(items, field, domain, items_name, domain_name)
+    output_ts_component_uids_cover_domain(index, config, 'simple_dispatchable_device')
 
-def output_ts_dc_line_uids_in_domain(data, solution, config):
+def output_ts_ac_line_uids_in_domain(index, config):
 
-    items = solution.time_series_output.dc_line
-    field = 'uid'
-    domain = data.network.get_dc_line_uids()
-    items_name = 'time_series_output.dc_line'
-    domain_name = 'network.dc_line.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    output_ts_component_uids_in_domain(index, config, 'ac_line')
 
-def output_ts_dc_line_uids_cover_domain(data, solution, config):
+def output_ts_ac_line_uids_cover_domain(index, config):
 
-    items = solution.time_series_output.dc_line
-    field = 'uid'
-    domain = data.network.get_dc_line_uids()
-    items_name = 'time_series_output.dc_line'
-    domain_name = 'network.dc_line.uid'
-    items_field_cover_domain(items, field, domain, items_name, domain_name)
+    output_ts_component_uids_cover_domain(index, config, 'ac_line')
 
-def output_ts_two_winding_transformer_uids_in_domain(data, solution, config):
+def output_ts_dc_line_uids_in_domain(index, config):
 
-    items = solution.time_series_output.two_winding_transformer
-    field = 'uid'
-    domain = data.network.get_two_winding_transformer_uids()
-    items_name = 'time_series_output.two_winding_transformer'
-    domain_name = 'network.two_winding_transformer.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    output_ts_component_uids_in_domain(index, config, 'dc_line')
 
-def output_ts_two_winding_transformer_uids_cover_domain(data, solution, config):
+def output_ts_dc_line_uids_cover_domain(index, config):
 
-    items = solution.time_series_output.two_winding_transformer
-    field = 'uid'
-    domain = data.network.get_two_winding_transformer_uids()
-    items_name = 'time_series_output.two_winding_transformer'
-    domain_name = 'network.two_winding_transformer.uid'
-    items_field_cover_domain(items, field, domain, items_name, domain_name)
+    output_ts_component_uids_cover_domain(index, config, 'dc_line')
+
+def output_ts_two_winding_transformer_uids_in_domain(index, config):
+
+    output_ts_component_uids_in_domain(index, config, 'two_winding_transformer')
+
+def output_ts_two_winding_transformer_uids_cover_domain(index, config):
+
+    output_ts_component_uids_cover_domain(index, config, 'two_winding_transformer')
 
 def bus_prz_uids_in_domain(data, config):
 
@@ -1167,9 +1475,8 @@ def bus_prz_uids_in_domain(data, config):
         (i, data.network.bus[i].uid, bus_prz_not_in_domain[i])
         for i in bus_idx_prz_not_in_domain]
     if len(bus_idx_prz_not_in_domain) > 0:
-        msg = "fails bus real power reserve zones in real power reserve zones. failing buses (index, uid, failing zones): {}".format(
-            bus_prz_not_in_domain)
-        raise ModelError(msg)
+        msg = "fails bus real power reserve zones in real power reserve zones. failing buses (index, uid, failing zones)"
+        raise get_check_error(msg, bus_prz_not_in_domain, config)
 
 def bus_qrz_uids_in_domain(data, config):
 
@@ -1187,9 +1494,8 @@ def bus_qrz_uids_in_domain(data, config):
         (i, data.network.bus[i].uid, bus_qrz_not_in_domain[i])
         for i in bus_idx_qrz_not_in_domain]
     if len(bus_idx_qrz_not_in_domain) > 0:
-        msg = "fails bus reactive power reserve zones in reactive power reserve zones. failing buses (index, uid, failing zones): {}".format(
-            bus_qrz_not_in_domain)
-        raise ModelError(msg)
+        msg = "fails bus reactive power reserve zones in reactive power reserve zones. failing buses (index, uid, failing zones)"
+        raise get_check_error(msg, bus_qrz_not_in_domain, config)
 
 def shunt_bus_uids_in_domain(data, config):
 
@@ -1198,7 +1504,7 @@ def shunt_bus_uids_in_domain(data, config):
     domain = data.network.get_bus_uids()
     items_name = 'network.shunt'
     domain_name = 'network.bus.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    items_field_in_domain(items, field, domain, items_name, domain_name, config)
 
 def sd_bus_uids_in_domain(data, config):
 
@@ -1207,7 +1513,7 @@ def sd_bus_uids_in_domain(data, config):
     domain = data.network.get_bus_uids()
     items_name = 'network.simple_dispatchable_device'
     domain_name = 'network.bus.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    items_field_in_domain(items, field, domain, items_name, domain_name, config)
 
 def sd_type_in_domain(data, config):
 
@@ -1216,7 +1522,7 @@ def sd_type_in_domain(data, config):
     domain = ['producer', 'consumer']
     items_name = 'network.simple_dispatchable_device'
     domain_name = str(domain)
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    items_field_in_domain(items, field, domain, items_name, domain_name, config)
 
 def acl_fr_bus_uids_in_domain(data, config):
 
@@ -1228,7 +1534,7 @@ def acl_fr_bus_uids_in_domain(data, config):
     domain = data.network.get_bus_uids()
     items_name = 'network.ac_line'
     domain_name = 'network.bus.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    items_field_in_domain(items, field, domain, items_name, domain_name, config)
 
     ### might be slower - no difference though on 6000 bus case on constance
     # domain = data.network.get_bus_uids()
@@ -1255,7 +1561,7 @@ def acl_to_bus_uids_in_domain(data, config):
     domain = data.network.get_bus_uids()
     items_name = 'network.ac_line'
     domain_name = 'network.bus.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    items_field_in_domain(items, field, domain, items_name, domain_name, config)
 
 def xfr_fr_bus_uids_in_domain(data, config):
 
@@ -1264,7 +1570,7 @@ def xfr_fr_bus_uids_in_domain(data, config):
     domain = data.network.get_bus_uids()
     items_name = 'network.two_winding_transformer'
     domain_name = 'network.bus.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    items_field_in_domain(items, field, domain, items_name, domain_name, config)
 
 def xfr_to_bus_uids_in_domain(data, config):
 
@@ -1273,7 +1579,7 @@ def xfr_to_bus_uids_in_domain(data, config):
     domain = data.network.get_bus_uids()
     items_name = 'network.two_winding_transformer'
     domain_name = 'network.bus.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    items_field_in_domain(items, field, domain, items_name, domain_name, config)
 
 def dcl_fr_bus_uids_in_domain(data, config):
 
@@ -1282,7 +1588,7 @@ def dcl_fr_bus_uids_in_domain(data, config):
     domain = data.network.get_bus_uids()
     items_name = 'network.dc_line'
     domain_name = 'network.bus.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    items_field_in_domain(items, field, domain, items_name, domain_name, config)
 
 def dcl_to_bus_uids_in_domain(data, config):
 
@@ -1291,7 +1597,7 @@ def dcl_to_bus_uids_in_domain(data, config):
     domain = data.network.get_bus_uids()
     items_name = 'network.dc_line'
     domain_name = 'network.bus.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    items_field_in_domain(items, field, domain, items_name, domain_name, config)
 
 def ts_sd_uids_in_domain(data, config):
 
@@ -1300,7 +1606,7 @@ def ts_sd_uids_in_domain(data, config):
     domain = data.network.get_simple_dispatchable_device_uids()
     items_name = 'time_series_input.simple_dispatchable_device'
     domain_name = 'network.simple_dispatchable_device.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    items_field_in_domain(items, field, domain, items_name, domain_name, config)
 
 def ts_sd_uids_cover_domain(data, config):
 
@@ -1309,7 +1615,7 @@ def ts_sd_uids_cover_domain(data, config):
     domain = data.network.get_simple_dispatchable_device_uids()
     items_name = 'time_series_input.simple_dispatchable_device'
     domain_name = 'network.simple_dispatchable_device.uid'
-    items_field_cover_domain(items, field, domain, items_name, domain_name)
+    items_field_cover_domain(items, field, domain, items_name, domain_name, config)
 
 def ts_prz_uids_in_domain(data, config):
 
@@ -1318,7 +1624,7 @@ def ts_prz_uids_in_domain(data, config):
     domain = data.network.get_active_zonal_reserve_uids()
     items_name = 'time_series_input.active_zonal_reserve'
     domain_name = 'network.active_zonal_reserve.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    items_field_in_domain(items, field, domain, items_name, domain_name, config)
 
 def ts_prz_uids_cover_domain(data, config):
 
@@ -1327,7 +1633,7 @@ def ts_prz_uids_cover_domain(data, config):
     domain = data.network.get_active_zonal_reserve_uids()
     items_name = 'time_series_input.active_zonal_reserve'
     domain_name = 'network.active_zonal_reserve.uid'
-    items_field_cover_domain(items, field, domain, items_name, domain_name)
+    items_field_cover_domain(items, field, domain, items_name, domain_name, config)
 
 def ts_qrz_uids_in_domain(data, config):
 
@@ -1336,7 +1642,7 @@ def ts_qrz_uids_in_domain(data, config):
     domain = data.network.get_reactive_zonal_reserve_uids()
     items_name = 'time_series_input.reactive_zonal_reserve'
     domain_name = 'network.reactive_zonal_reserve.uid'
-    items_field_in_domain(items, field, domain, items_name, domain_name)
+    items_field_in_domain(items, field, domain, items_name, domain_name, config)
 
 def ts_qrz_uids_cover_domain(data, config):
     
@@ -1345,225 +1651,352 @@ def ts_qrz_uids_cover_domain(data, config):
     domain = data.network.get_reactive_zonal_reserve_uids()
     items_name = 'time_series_input.reactive_zonal_reserve'
     domain_name = 'network.reactive_zonal_reserve.uid'
-    items_field_cover_domain(items, field, domain, items_name, domain_name)
+    items_field_cover_domain(items, field, domain, items_name, domain_name, config)
 
-def ts_sd_on_status_ub_len_eq_num_t(data, config):
+def ts_sd_on_status_ub_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'on_status_ub')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'on_status_ub')
 
-def ts_sd_on_status_lb_len_eq_num_t(data, config):
+def ts_sd_on_status_lb_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'on_status_lb')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'on_status_lb')
 
-def ts_sd_p_lb_len_eq_num_t(data, config):
+def ts_sd_p_lb_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'p_lb')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_lb')
 
-def ts_sd_p_ub_len_eq_num_t(data, config):
+def ts_sd_p_ub_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'p_ub')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_ub')
 
-def ts_sd_q_lb_len_eq_num_t(data, config):
+def ts_sd_q_lb_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'q_lb')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'q_lb')
 
-def ts_sd_q_ub_len_eq_num_t(data, config):
+def ts_sd_q_ub_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'q_ub')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'q_ub')
 
-def ts_sd_cost_len_eq_num_t(data, config):
+def ts_sd_cost_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'cost')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'cost')
 
-def ts_sd_p_reg_res_up_cost_len_eq_num_t(data, config):
+def ts_sd_p_reg_res_up_cost_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'p_reg_res_up_cost')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_reg_res_up_cost')
 
-def ts_sd_p_reg_res_down_cost_len_eq_num_t(data, config):
+def ts_sd_p_reg_res_down_cost_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'p_reg_res_down_cost')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_reg_res_down_cost')
 
-def ts_sd_p_syn_res_cost_len_eq_num_t(data, config):
+def ts_sd_p_syn_res_cost_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'p_syn_res_cost')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_syn_res_cost')
 
-def ts_sd_p_nsyn_res_cost_len_eq_num_t(data, config):
+def ts_sd_p_nsyn_res_cost_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'p_nsyn_res_cost')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_nsyn_res_cost')
 
-def ts_sd_p_ramp_res_up_online_cost_len_eq_num_t(data, config):
+def ts_sd_p_ramp_res_up_online_cost_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'p_ramp_res_up_online_cost')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_ramp_res_up_online_cost')
 
-def ts_sd_p_ramp_res_down_online_cost_len_eq_num_t(data, config):
+def ts_sd_p_ramp_res_down_online_cost_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'p_ramp_res_down_online_cost')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_ramp_res_down_online_cost')
 
-def ts_sd_p_ramp_res_down_offline_cost_len_eq_num_t(data, config):
+def ts_sd_p_ramp_res_down_offline_cost_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'p_ramp_res_down_offline_cost')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_ramp_res_down_offline_cost')
 
-def ts_sd_p_ramp_res_up_offline_cost_len_eq_num_t(data, config):
+def ts_sd_p_ramp_res_up_offline_cost_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'p_ramp_res_up_offline_cost')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_ramp_res_up_offline_cost')
 
-def ts_sd_q_res_up_cost_len_eq_num_t(data, config):
+def ts_sd_q_res_up_cost_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'q_res_up_cost')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'q_res_up_cost')
 
-def ts_sd_q_res_down_cost_len_eq_num_t(data, config):
+def ts_sd_q_res_down_cost_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'simple_dispatchable_device', 'q_res_down_cost')
+    ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'q_res_down_cost')
 
-def ts_prz_ramping_reserve_up_len_eq_num_t(data, config):
+def ts_prz_ramping_reserve_up_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'active_zonal_reserve', 'RAMPING_RESERVE_UP')
+    ts_component_field_len_eq_num_t(index, config, 'active_zonal_reserve', 'RAMPING_RESERVE_UP')
 
-def ts_prz_ramping_reserve_down_len_eq_num_t(data, config):
+def ts_prz_ramping_reserve_down_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'active_zonal_reserve', 'RAMPING_RESERVE_DOWN')
+    ts_component_field_len_eq_num_t(index, config, 'active_zonal_reserve', 'RAMPING_RESERVE_DOWN')
 
-def ts_qrz_react_up_len_eq_num_t(data, config):
+def ts_qrz_react_up_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'reactive_zonal_reserve', 'REACT_UP')
+    ts_component_field_len_eq_num_t(index, config, 'reactive_zonal_reserve', 'REACT_UP')
 
-def ts_qrz_react_down_len_eq_num_t(data, config):
+def ts_qrz_react_down_len_eq_num_t(index, config):
     
-    ts_component_field_len_eq_num_t(data, 'reactive_zonal_reserve', 'REACT_DOWN')
+    ts_component_field_len_eq_num_t(index, config, 'reactive_zonal_reserve', 'REACT_DOWN')
 
-def ts_component_field_len_eq_num_t(data, component, field):
+# time series fields with one entry per interval, for each time_series_input component
+ts_len_fields = {
+    'simple_dispatchable_device': [
+        'on_status_ub', 'on_status_lb', 'p_lb', 'p_ub', 'q_lb', 'q_ub', 'cost',
+        'p_reg_res_up_cost', 'p_reg_res_down_cost', 'p_syn_res_cost', 'p_nsyn_res_cost',
+        'p_ramp_res_up_online_cost', 'p_ramp_res_down_online_cost',
+        'p_ramp_res_down_offline_cost', 'p_ramp_res_up_offline_cost',
+        'q_res_up_cost', 'q_res_down_cost'],
+    'active_zonal_reserve': ['RAMPING_RESERVE_UP', 'RAMPING_RESERVE_DOWN'],
+    'reactive_zonal_reserve': ['REACT_UP', 'REACT_DOWN'],
+    }
 
-    num_t = len(data.time_series_input.general.interval_duration)
-    component_uids = [c.uid for c in getattr(data.time_series_input, component)]
-    component_lens = [len(getattr(c, field)) for c in getattr(data.time_series_input, component)]
-    idx_err = [
-        (i, component_uids[i], component_lens[i])
-        for i in range(len(component_lens))
-        if component_lens[i] != num_t]
-    if len(idx_err) > 0:
-        msg = "fails time_series_input {} len({}) == len(intervals). len(intervals): {}. failing items (idx, uid, len({})): {}".format(
-            component, field, num_t, field, idx_err)
-        raise ModelError(msg)
+# time series fields whose values are checked from the ts len index, i.e. before the problem arrays are built
+ts_value_fields = {
+    'simple_dispatchable_device': ['on_status_lb', 'on_status_ub', 'p_lb', 'p_ub', 'q_lb', 'q_ub'],
+    }
 
-def output_ts_component_field_len_eq_num_t(data, solution, component, field):
+def get_ts_len_index(data):
+    '''
+    index of the lengths of the time series fields, built in one pass over each time_series_input component
+    index['num_t'] is the number of intervals
+    index[component]['uid'] is the list of item uids
+    index[component]['len'][field] is the int array of the lengths of field over the items
+    index[component]['value'][field] is the list of the values of field over the items, for the fields in ts_value_fields
+    '''
 
-    num_t = len(data.time_series_input.general.interval_duration)
-    component_uids = [c.uid for c in getattr(solution.time_series_output, component)]
-    component_lens = [len(getattr(c, field)) for c in getattr(solution.time_series_output, component)]
-    idx_err = [
-        (i, component_uids[i], component_lens[i])
-        for i in range(len(component_lens))
-        if component_lens[i] != num_t]
-    if len(idx_err) > 0:
-        msg = "fails time_series_output {} len({}) == len(time_series_input.intervals). len(intervals): {}. failing items (idx, uid, len({})): {}".format(
-            component, field, num_t, field, idx_err)
-        raise ModelError(msg)
+    index = {'num_t': len(data.time_series_input.general.interval_duration)}
+    for component, fields in ts_len_fields.items():
+        items = getattr(data.time_series_input, component)
+        lens = numpy.array([[len(getattr(c, f)) for f in fields] for c in items], dtype=int)
+        lens = numpy.reshape(lens, newshape=(len(items), len(fields)))
+        index[component] = {
+            'uid': [c.uid for c in items],
+            'len': {fields[j]: lens[:, j] for j in range(len(fields))},
+            'value': {f: [getattr(c, f) for c in items] for f in ts_value_fields.get(component, [])}}
+    return index
+
+output_ts_len_fields = {
+    'bus': ['vm', 'va'],
+    'shunt': ['step'],
+    'simple_dispatchable_device': [
+        'on_status', 'p_on', 'q', 'p_reg_res_up', 'p_reg_res_down', 'p_syn_res', 'p_nsyn_res',
+        'p_ramp_res_up_online', 'p_ramp_res_down_online', 'p_ramp_res_up_offline', 'p_ramp_res_down_offline',
+        'q_res_up', 'q_res_down'],
+    'ac_line': ['on_status'],
+    'dc_line': ['pdc_fr', 'qdc_fr', 'qdc_to'],
+    'two_winding_transformer': ['on_status', 'tm', 'ta'],
+    }
+
+def get_output_ts_index(data, solution):
+    '''
+    index of the time_series_output uids and time series lengths, built in one pass over each section,
+    for the solution_model_checks
+    index['num_t'] is the number of intervals
+    index[component]['uid'] is the list of item uids
+    index[component]['len'][field] is the int array of the lengths of field over the items
+    index[component]['domain'] is the list of uids of the component in the network section of data
+    index[component]['uid_not_in_domain'] is the int array of the indices of the items with uid not in domain
+    index[component]['domain_not_covered'] is the int array of the indices in domain of the uids not in the items
+    index['uid_repeated'] is the list of (uid, number of occurrences) for uids repeated in time_series_output
+
+    the uids are compared as int codes, taken from one numpy.unique over all the solution and domain uids
+    '''
 
-def output_ts_bus_vm_len_eq_num_t(data, solution, config):
+    index = {'num_t': len(data.time_series_input.general.interval_duration)}
+    uids = []
+    for component, fields in output_ts_len_fields.items():
+        items = getattr(solution.time_series_output, component)
+        lens = numpy.array([[len(getattr(c, f)) for f in fields] for c in items], dtype=int)
+        lens = numpy.reshape(lens, newshape=(len(items), len(fields)))
+        index[component] = {
+            'uid': [c.uid for c in items],
+            'len': {fields[j]: lens[:, j] for j in range(len(fields))},
+            'domain': getattr(data.network, 'get_{}_uids'.format(component))()}
+        uids += index[component]['uid']
+    num_item_uids = len(uids)
+    for component in output_ts_len_fields.keys():
+        uids += index[component]['domain']
+    uids_unique, codes = numpy.unique(numpy.array(uids, dtype=str), return_inverse=True)
+
+    # codes[:num_item_uids] are the item uids, then the domain uids, in the order of the components
+    item_ptr = 0
+    domain_ptr = num_item_uids
+    for component in output_ts_len_fields.keys():
+        num_items = len(index[component]['uid'])
+        num_domain = len(index[component]['domain'])
+        item_codes = codes[item_ptr:(item_ptr + num_items)]
+        domain_codes = codes[domain_ptr:(domain_ptr + num_domain)]
+        index[component]['uid_not_in_domain'] = numpy.flatnonzero(numpy.isin(item_codes, domain_codes, invert=True))
+        index[component]['domain_not_covered'] = numpy.flatnonzero(numpy.isin(domain_codes, item_codes, invert=True))
+        item_ptr += num_items
+        domain_ptr += num_domain
+
+    uid_num = numpy.bincount(codes[:num_item_uids], minlength=uids_unique.size)
+    index['uid_repeated'] = [(uids_unique[k].item(), uid_num[k].item()) for k in numpy.flatnonzero(uid_num > 1).tolist()]
+    return index
+
+def ts_component_field_len_eq_num_t(index, config, component, field):
+
+    num_t = index['num_t']
+    component_uids = index[component]['uid']
+    component_lens = index[component]['len'][field]
+    idx = numpy.flatnonzero(component_lens != num_t)
+    if idx.size > 0:
+        idx_err = [
+            (i, component_uids[i], component_lens[i].item())
+            for i in idx[:config.get('max_errors_per_check')].tolist()]
+        msg = "fails time_series_input {} len({}) == len(intervals). len(intervals): {}. failing items (idx, uid, len({}))".format(
+            component, field, num_t, field)
+        raise get_check_error(msg, idx_err, config, idx.size)
+
+def output_ts_component_field_len_eq_num_t(index, config, component, field):
+
+    num_t = index['num_t']
+    component_uids = index[component]['uid']
+    component_lens = index[component]['len'][field]
+    idx = numpy.flatnonzero(component_lens != num_t)
+    if idx.size > 0:
+        idx_err = [
+            (i, component_uids[i], component_lens[i].item())
+            for i in idx[:config.get('max_errors_per_check')].tolist()]
+        msg = "fails time_series_output {} len({}) == len(time_series_input.intervals). len(intervals): {}. failing items (idx, uid, len({}))".format(
+            component, field, num_t, field)
+        raise get_check_error(msg, idx_err, config, idx.size)
+
+def output_ts_bus_vm_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'bus', 'vm')
+    output_ts_component_field_len_eq_num_t(index, config, 'bus', 'vm')
 
-def output_ts_bus_va_len_eq_num_t(data, solution, config):
+def output_ts_bus_va_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'bus', 'va')
+    output_ts_component_field_len_eq_num_t(index, config, 'bus', 'va')
     
-def output_ts_shunt_step_len_eq_num_t(data, solution, config):
+def output_ts_shunt_step_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'shunt', 'step')
+    output_ts_component_field_len_eq_num_t(index, config, 'shunt', 'step')
 
-def output_ts_simple_dispatchable_device_on_status_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_on_status_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'on_status')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'on_status')
 
-def output_ts_simple_dispatchable_device_p_on_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_p_on_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'p_on')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_on')
 
-def output_ts_simple_dispatchable_device_q_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_q_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'q')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'q')
 
-def output_ts_simple_dispatchable_device_p_reg_res_up_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_p_reg_res_up_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'p_reg_res_up')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_reg_res_up')
 
-def output_ts_simple_dispatchable_device_p_reg_res_down_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_p_reg_res_down_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'p_reg_res_down')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_reg_res_down')
 
-def output_ts_simple_dispatchable_device_p_syn_res_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_p_syn_res_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'p_syn_res')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_syn_res')
 
-def output_ts_simple_dispatchable_device_p_nsyn_res_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_p_nsyn_res_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'p_nsyn_res')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_nsyn_res')
 
-def output_ts_simple_dispatchable_device_p_ramp_res_up_online_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_p_ramp_res_up_online_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'p_ramp_res_up_online')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_ramp_res_up_online')
 
-def output_ts_simple_dispatchable_device_p_ramp_res_down_online_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_p_ramp_res_down_online_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'p_ramp_res_down_online')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_ramp_res_down_online')
 
-def output_ts_simple_dispatchable_device_p_ramp_res_up_offline_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_p_ramp_res_up_offline_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'p_ramp_res_up_offline')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_ramp_res_up_offline')
 
-def output_ts_simple_dispatchable_device_p_ramp_res_down_offline_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_p_ramp_res_down_offline_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'p_ramp_res_down_offline')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'p_ramp_res_down_offline')
 
-def output_ts_simple_dispatchable_device_q_res_up_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_q_res_up_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'q_res_up')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'q_res_up')
 
-def output_ts_simple_dispatchable_device_q_res_down_len_eq_num_t(data, solution, config):
+def output_ts_simple_dispatchable_device_q_res_down_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'simple_dispatchable_device', 'q_res_down')
+    output_ts_component_field_len_eq_num_t(index, config, 'simple_dispatchable_device', 'q_res_down')
 
-def output_ts_ac_line_on_status_len_eq_num_t(data, solution, config):
+def output_ts_ac_line_on_status_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'ac_line', 'on_status')
+    output_ts_component_field_len_eq_num_t(index, config, 'ac_line', 'on_status')
 
-def output_ts_dc_line_pdc_fr_len_eq_num_t(data, solution, config):
+def output_ts_dc_line_pdc_fr_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'dc_line', 'pdc_fr')
+    output_ts_component_field_len_eq_num_t(index, config, 'dc_line', 'pdc_fr')
 
-def output_ts_dc_line_qdc_fr_len_eq_num_t(data, solution, config):
+def output_ts_dc_line_qdc_fr_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'dc_line', 'qdc_fr')
+    output_ts_component_field_len_eq_num_t(index, config, 'dc_line', 'qdc_fr')
 
-def output_ts_dc_line_qdc_to_len_eq_num_t(data, solution, config):
+def output_ts_dc_line_qdc_to_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'dc_line', 'qdc_to')
+    output_ts_component_field_len_eq_num_t(index, config, 'dc_line', 'qdc_to')
 
-def output_ts_two_winding_transformer_on_status_len_eq_num_t(data, solution, config):
+def output_ts_two_winding_transformer_on_status_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'two_winding_transformer', 'on_status')
+    output_ts_component_field_len_eq_num_t(index, config, 'two_winding_transformer', 'on_status')
 
-def output_ts_two_winding_transformer_tm_len_eq_num_t(data, solution, config):
+def output_ts_two_winding_transformer_tm_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'two_winding_transformer', 'tm')
+    output_ts_component_field_len_eq_num_t(index, config, 'two_winding_transformer', 'tm')
 
-def output_ts_two_winding_transformer_ta_len_eq_num_t(data, solution, config):
+def output_ts_two_winding_transformer_ta_len_eq_num_t(index, config):
     
-    output_ts_component_field_len_eq_num_t(data, solution, 'two_winding_transformer', 'ta')
+    output_ts_component_field_len_eq_num_t(index, config, 'two_winding_transformer', 'ta')
 
-def ts_sd_on_status_lb_le_ub(data, config):
+def get_ts_value_array(index, component, field):
+    '''
+    (item, t) float array of the values of field from the ts len index.
+    an item with len(field) != len(intervals) has its first min(len(field), len(intervals)) values, then nan
+    '''
 
-    num_t = len(data.time_series_input.general.interval_duration)
-    num_sd = len(data.time_series_input.simple_dispatchable_device)
-    uid = [c.uid for c in data.time_series_input.simple_dispatchable_device]
-    lb = [c.on_status_lb for c in data.time_series_input.simple_dispatchable_device]
-    ub = [c.on_status_ub for c in data.time_series_input.simple_dispatchable_device]
-    idx_err = [(i, uid[i], j, lb[i][j], ub[i][j]) for i in range(num_sd) for j in range(num_t) if lb[i][j] > ub[i][j]]
-    if len(idx_err) > 0:
-        msg = "fails time_series_input simple_dispatchable_device on_status_lb <= on_status_ub. failures (device index, device uid, interval index, on_status_lb, on_status_ub): {}".format(idx_err)
-        raise ModelError(msg)
+    num_t = index['num_t']
+    values = index[component]['value'][field]
+    lens = index[component]['len'][field]
+    array = numpy.full(shape=(len(values), num_t), fill_value=numpy.nan, dtype=float)
+    rows = numpy.flatnonzero(lens == num_t)
+    if rows.size > 0:
+        array[rows, :] = numpy.array([values[i] for i in rows.tolist()], dtype=float)
+    for i in numpy.flatnonzero(lens != num_t).tolist():
+        n = min(lens[i].item(), num_t)
+        array[i, :n] = values[i][:n]
+    return array
+
+def ts_sd_lb_le_ub(index, config, field):
+    '''
+    check field_lb <= field_ub from the ts len index, in each interval where both are given.
+    the device index is the index in time_series_input.simple_dispatchable_device
+    '''
 
-def supc_not_ambiguous(data, config):
+    sd = index['simple_dispatchable_device']
+    lb = get_ts_value_array(index, 'simple_dispatchable_device', field + '_lb')
+    ub = get_ts_value_array(index, 'simple_dispatchable_device', field + '_ub')
+    idx = numpy.nonzero(lb > ub)
+    if idx[0].size > 0:
+        lb_values = sd['value'][field + '_lb']
+        ub_values = sd['value'][field + '_ub']
+        idx_err = [
+            (i, sd['uid'][i], j, lb_values[i][j], ub_values[i][j])
+            for i, j in zip(*[k[:config.get('max_errors_per_check')].tolist() for k in idx])]
+        msg = "fails time_series_input simple_dispatchable_device {}_lb <= {}_ub. failures (device index, device uid, interval index, {}_lb, {}_ub)".format(
+            field, field, field, field)
+        raise get_check_error(msg, idx_err, config, idx[0].size)
+
+def ts_sd_on_status_lb_le_ub(index, config):
+
+    ts_sd_lb_le_ub(index, config, 'on_status')
+
+def supc_not_ambiguous(data, config, derived=None):
     '''
     check that:
 
@@ -1583,83 +2016,87 @@ def supc_not_ambiguous(data, config):
     The data needs to be set up so that no such ambiguity occurs.
     '''
 
+    if derived is None:
+        derived = DerivedData(data, config)
     num_t = len(data.time_series_input.general.interval_duration)
     num_sd = len(data.network.simple_dispatchable_device)
-    sd_uid = [c.uid for c in data.network.simple_dispatchable_device]
-
-    # time it here. If this is expensive we might need to re-think the organization of the code
-    # so as to only get the su/sd trajectories once.
-    start_time = time.time()
-    sd_t_supc = get_supc(data, config, check_ambiguous=True)
-    end_time = time.time()
-    print('get_supc time: {}'.format(end_time - start_time))
+    sd_uid = derived.get_sd_uid()
+    sd_t_supc = derived.get_supc(check_ambiguous=True)
 
     idx_err = [(i, t) for i in range(num_sd) for t in range(num_t) if sd_t_supc[i][t][1] is not None]
     if len(idx_err) > 0:
         errors = [(sd_uid[i[0]], i[1], sd_t_supc[i[0]][i[1]][0], sd_t_supc[i[0]][i[1]][1]) for i in idx_err]
-        msg = 'fails startup trajectory unambiguous, i.e. p-value too close to 0.0. tolerance: {}. failures (device uid, startup interval index, startup trajectory list of (t, p), ambiguous (t, p)): {}'.format(config['su_sd_pc_zero_tol'], errors)
-        raise ModelError(msg)
+        msg = 'fails startup trajectory unambiguous, i.e. p-value too close to 0.0. tolerance: {}. failures (device uid, startup interval index, startup trajectory list of (t, p), ambiguous (t, p))'.format(config['su_sd_pc_zero_tol'])
+        raise get_check_error(msg, errors, config)
 
-def sdpc_not_ambiguous(data, config):
+def sdpc_not_ambiguous(data, config, derived=None):
 
+    if derived is None:
+        derived = DerivedData(data, config)
     num_t = len(data.time_series_input.general.interval_duration)
     num_sd = len(data.network.simple_dispatchable_device)
-    sd_uid = [c.uid for c in data.network.simple_dispatchable_device]
-    sd_t_sdpc = get_sdpc(data, config, check_ambiguous=True)
+    sd_uid = derived.get_sd_uid()
+    sd_t_sdpc = derived.get_sdpc(check_ambiguous=True)
     idx_err = [(i, t) for i in range(num_sd) for t in range(num_t) if sd_t_sdpc[i][t][1] is not None]
     if len(idx_err) > 0:
         errors = [(sd_uid[i[0]], i[1], sd_t_sdpc[i[0]][i[1]][0], sd_t_sdpc[i[0]][i[1]][1]) for i in idx_err]
-        msg = 'fails shutdown trajectory unambiguous, i.e. p-value too close to 0.0. tolerance: {}. failures (device uid, shutdown interval index, shutdown trajectory list of (t, p), ambiguous (t, p)): {}'.format(config['su_sd_pc_zero_tol'], errors)
-        raise ModelError(msg)
+        msg = 'fails shutdown trajectory unambiguous, i.e. p-value too close to 0.0. tolerance: {}. failures (device uid, shutdown interval index, shutdown trajectory list of (t, p), ambiguous (t, p))'.format(config['su_sd_pc_zero_tol'])
+        raise get_check_error(msg, errors, config)
 
-def sd_t_cost_function_covers_supc(data, config):
+def sd_t_cost_function_covers_supc(data, config, derived=None):
 
+    if derived is None:
+        derived = DerivedData(data, config)
     num_t = len(data.time_series_input.general.interval_duration)
     num_sd = len(data.network.simple_dispatchable_device)
-    sd_uid = [c.uid for c in data.network.simple_dispatchable_device]
-    sd_t_supc = get_supc(data, config, check_ambiguous=False)
-    sd_t_cpmax = get_sd_t_cost_function_pmax(data)
+    sd_uid = derived.get_sd_uid()
+    sd_t_supc = derived.get_supc(check_ambiguous=False)
+    sd_t_cpmax = derived.get_sd_t_cost_function_pmax()
     idx_err = [
         (sd_uid[i], t, c[0], c[1], sd_t_cpmax[i][c[0]])
         for i in range(num_sd) for t in range(num_t) for c in sd_t_supc[i][t]
         if c[1] > sd_t_cpmax[i][c[0]]]
     if len(idx_err) > 0:
-        msg = 'fails startup trajectory covered by energy cost function. failures (device uid, startup interval index, uncovered interval index, uncovered trajectory p value, cost function p max): {}'.format(idx_err)
-        raise ModelError(msg)
+        msg = 'fails startup trajectory covered by energy cost function. failures (device uid, startup interval index, uncovered interval index, uncovered trajectory p value, cost function p max)'
+        raise get_check_error(msg, idx_err, config)
 
-def sd_t_cost_function_covers_sdpc(data, config):
+def sd_t_cost_function_covers_sdpc(data, config, derived=None):
 
+    if derived is None:
+        derived = DerivedData(data, config)
     num_t = len(data.time_series_input.general.interval_duration)
     num_sd = len(data.network.simple_dispatchable_device)
-    sd_uid = [c.uid for c in data.network.simple_dispatchable_device]
-    sd_t_sdpc = get_sdpc(data, config, check_ambiguous=False)
-    sd_t_cpmax = get_sd_t_cost_function_pmax(data)
+    sd_uid = derived.get_sd_uid()
+    sd_t_sdpc = derived.get_sdpc(check_ambiguous=False)
+    sd_t_cpmax = derived.get_sd_t_cost_function_pmax()
     idx_err = [
         (sd_uid[i], t, c[0], c[1], sd_t_cpmax[i][c[0]])
         for i in range(num_sd) for t in range(num_t) for c in sd_t_sdpc[i][t]
         if c[1] > sd_t_cpmax[i][c[0]]]
     if len(idx_err) > 0:
-        msg = 'fails shutdown trajectory covered by energy cost function. failures (device uid, shutdown interval index, uncovered interval index, uncovered trajectory p value, cost function p max): {}'.format(idx_err)
-        raise ModelError(msg)
+        msg = 'fails shutdown trajectory covered by energy cost function. failures (device uid, shutdown interval index, uncovered interval index, uncovered trajectory p value, cost function p max)'
+        raise get_check_error(msg, idx_err, config)
 
-def sd_t_q_max_min_p_q_linking_supc_feasible(data, config):
+def sd_t_q_max_min_p_q_linking_supc_feasible(data, config, derived=None):
 
     pass # todo
 
-def sd_t_q_max_min_p_q_linking_sdpc_feasible(data, config):
+def sd_t_q_max_min_p_q_linking_sdpc_feasible(data, config, derived=None):
 
     pass # todo
 
-def sd_t_supc_sdpc_no_overlap(data, config):
+def sd_t_supc_sdpc_no_overlap(data, config, derived=None):
 
     pass # todo
 
-def get_supc(data, config, check_ambiguous=False):
+def get_supc(data, config, check_ambiguous=False, derived=None):
 
+    if derived is None:
+        derived = DerivedData(data, config)
     num_t = len(data.time_series_input.general.interval_duration)
     num_sd = len(data.network.simple_dispatchable_device)
-    sd_uid = [c.uid for c in data.network.simple_dispatchable_device]
-    sd_ts_dict = {c.uid:c for c in data.time_series_input.simple_dispatchable_device}
+    sd_uid = derived.get_sd_uid()
+    sd_ts_dict = derived.get_sd_ts_dict()
     sd_t_p_min = [sd_ts_dict[i].p_lb for i in sd_uid]
     sd_p_0 = [c.initial_status.p for c in data.network.simple_dispatchable_device]
     sd_p_ru_su = [c.p_startup_ramp_ub for c in data.network.simple_dispatchable_device]
@@ -1682,12 +2119,14 @@ def get_supc(data, config, check_ambiguous=False):
 
     return sd_t_supc
 
-def get_sdpc(data, config, check_ambiguous=False):
+def get_sdpc(data, config, check_ambiguous=False, derived=None):
 
+    if derived is None:
+        derived = DerivedData(data, config)
     num_t = len(data.time_series_input.general.interval_duration)
     num_sd = len(data.network.simple_dispatchable_device)
-    sd_uid = [c.uid for c in data.network.simple_dispatchable_device]
-    sd_ts_dict = {c.uid:c for c in data.time_series_input.simple_dispatchable_device}
+    sd_uid = derived.get_sd_uid()
+    sd_ts_dict = derived.get_sd_ts_dict()
     sd_t_p_min = [sd_ts_dict[i].p_lb for i in sd_uid]
     sd_p_0 = [c.initial_status.p for c in data.network.simple_dispatchable_device]
     sd_p_rd_sd = [c.p_shutdown_ramp_ub for c in data.network.simple_dispatchable_device]
@@ -1814,34 +2253,38 @@ def sd_t_get_sdpc(p_min, p_0, p_rd_sd, t, num_t, t_a_end, t_a_start, config):
     
     return sdpc, sdpc_ambiguous # todo - check
 
-def get_sd_t_cost_function_pmax(data):
+def get_sd_t_cost_function_pmax(data, derived=None):
 
+    if derived is None:
+        derived = DerivedData(data, None)
     num_t = len(data.time_series_input.general.interval_duration)
     num_sd = len(data.network.simple_dispatchable_device)
-    sd_uid = [c.uid for c in data.network.simple_dispatchable_device]
-    sd_ts_dict = {c.uid: c for c in data.time_series_input.simple_dispatchable_device}
+    sd_uid = derived.get_sd_uid()
+    sd_ts_dict = derived.get_sd_ts_dict()
     sd_t_sum_cpmax = [
             [numpy.sum([p[1] for p in sd_ts_dict[sd_uid[i]].cost[t]]) for t in range(num_t)]
         for i in range(num_sd)]
     return sd_t_sum_cpmax
 
-def ts_sd_cost_function_covers_p_max(data, config):
+def ts_sd_cost_function_covers_p_max(data, config, derived=None):
     '''
     check that for each t, the cost function covers pmax
     note - here we are not necessarily covering the startup or shutdown trajectories
     this needs to be checked in some other way
     '''
 
+    if derived is None:
+        derived = DerivedData(data, config)
     num_t = len(data.time_series_input.general.interval_duration)
     num_sd = len(data.network.simple_dispatchable_device)
-    sd_uid = [c.uid for c in data.network.simple_dispatchable_device]
+    sd_uid = derived.get_sd_uid()
     sd_p0 = [c.initial_status.p for c in data.network.simple_dispatchable_device]
     #sd_p0 = [0.05 for c in data.network.simple_dispatchable_device]
-    sd_ts_dict = {c.uid: c for c in data.time_series_input.simple_dispatchable_device}
+    sd_ts_dict = derived.get_sd_ts_dict()
     sd_t_pmax = [
             sd_ts_dict[sd_uid[i]].p_ub
         for i in range(num_sd)]
-    sd_t_cpmax = get_sd_t_cost_function_pmax(data)
+    sd_t_cpmax = derived.get_sd_t_cost_function_pmax()
     idx_err = [
         (i, sd_uid[i], t, sd_t_pmax[i][t], sd_t_cpmax[i][t])
         for i in range(num_sd) for t in range(num_t) if sd_t_cpmax[i][t] < sd_t_pmax[i][t]]
@@ -1850,8 +2293,8 @@ def ts_sd_cost_function_covers_p_max(data, config):
         (idx_err[i][0], idx_err[i][1], idx_err[i][2], idx_err[i][3], idx_err[i][4], pmax_err[i])
         for i in range(len(idx_err))]
     if len(idx_err) > 0:
-        msg = "fails cost function covers p_max for each time. failures (device index, device uid, interval index, p_max, cost_pmax, cost_block_pmax): {}".format(idx_err)
-        raise ModelError(msg)
+        msg = "fails cost function covers p_max for each time. failures (device index, device uid, interval index, p_max, cost_pmax, cost_block_pmax)"
+        raise get_check_error(msg, idx_err, config)
 
 # def ts_sd_cost_function_covers_p_init(data, config):
 #     '''
@@ -1912,130 +2355,174 @@ def ts_sd_cost_function_covers_p_max(data, config):
 #         msg = "fails cost function for each time (t1) covers p_max for each time (t2). failures worst (t1, t2) for each device (device index, device uid, interval index t1, interval index t2, p_max, cost_total_pmax, cost_pmax): {}".format(idx_err)
 #         raise ModelError(msg)
 
-def sd_p_q_linking_set_nonempty(data, config):
+def get_p_q_linking_geometry_errors(derived, flags, fields):
+    '''
+    returns [(uid, field values)] for the devices with flags True
+    '''
+
+    geometry = derived.get_p_q_linking_geometry()
+    sd_uid = derived.get_sd_uid()
+    values = [geometry[f].tolist() for f in fields]
+    return [tuple([sd_uid[i]] + [v[i] for v in values]) for i in numpy.flatnonzero(flags)]
+
+def sd_p_q_linking_set_nonempty(data, config, derived=None):
 
-    sd_p_q_linking_geometry = get_p_q_linking_geometry(data, config)
+    if derived is None:
+        derived = DerivedData(data, config)
+    sd_p_q_linking_geometry = derived.get_p_q_linking_geometry()
     # print('geometry:')
     # print(sd_p_q_linking_geometry)
-    idx_err = [(k, v['qmax0'], v['qmin0'], v['bmax'], v['bmin']) for k, v in sd_p_q_linking_geometry.items() if v['empty']]
+    idx_err = get_p_q_linking_geometry_errors(
+        derived, sd_p_q_linking_geometry['code'] == p_q_linking_empty, ['qmax0', 'qmin0', 'bmax', 'bmin'])
     if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device q_bound_cap either q_0_lb <= q_0_ub or beta_max != beta_min. failures (uid, q_0_ub, q_0_lb, beta_ub, beta_lb): {}".format(idx_err)
-        raise ModelError(msg)
+        msg = "fails network simple_dispatchable_device q_bound_cap either q_0_lb <= q_0_ub or beta_max != beta_min. failures (uid, q_0_ub, q_0_lb, beta_ub, beta_lb)"
+        raise get_check_error(msg, idx_err, config)
 
-def sd_p_q_beta_not_too_small(data, config):
+def sd_p_q_beta_not_too_small(data, config, derived=None):
 
-    sd_p_q_linking_geometry = get_p_q_linking_geometry(data, config)
-    idx_err = [(k, v['b']) for k, v in sd_p_q_linking_geometry.items() if v['b_too_small']]
+    if derived is None:
+        derived = DerivedData(data, config)
+    sd_p_q_linking_geometry = derived.get_p_q_linking_geometry()
+    idx_err = get_p_q_linking_geometry_errors(derived, sd_p_q_linking_geometry['b_too_small'], ['b'])
     if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device q_linear_cap either beta == 0.0 or abs(beta) >= tol. tol = {}. failures (uid, beta): {}".format(config['beta_zero_tol'], idx_err)
-        raise ModelError(msg)
+        msg = "fails network simple_dispatchable_device q_linear_cap either beta == 0.0 or abs(beta) >= tol. tol = {}. failures (uid, beta)".format(config['beta_zero_tol'])
+        raise get_check_error(msg, idx_err, config)
 
-def sd_p_q_beta_max_not_too_small(data, config):
+def sd_p_q_beta_max_not_too_small(data, config, derived=None):
 
-    sd_p_q_linking_geometry = get_p_q_linking_geometry(data, config)
-    idx_err = [(k, v['bmax']) for k, v in sd_p_q_linking_geometry.items() if v['bmax_too_small']]
+    if derived is None:
+        derived = DerivedData(data, config)
+    sd_p_q_linking_geometry = derived.get_p_q_linking_geometry()
+    idx_err = get_p_q_linking_geometry_errors(derived, sd_p_q_linking_geometry['bmax_too_small'], ['bmax'])
     if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device q_bound_cap either beta_max == 0.0 or abs(beta_max) >= tol. tol = {}. failures (uid, beta_max): {}".format(config['beta_zero_tol'], idx_err)
-        raise ModelError(msg)
+        msg = "fails network simple_dispatchable_device q_bound_cap either beta_max == 0.0 or abs(beta_max) >= tol. tol = {}. failures (uid, beta_max)".format(config['beta_zero_tol'])
+        raise get_check_error(msg, idx_err, config)
 
-def sd_p_q_beta_min_not_too_small(data, config):
+def sd_p_q_beta_min_not_too_small(data, config, derived=None):
 
-    sd_p_q_linking_geometry = get_p_q_linking_geometry(data, config)
-    idx_err = [(k, v['bmin']) for k, v in sd_p_q_linking_geometry.items() if v['bmin_too_small']]
+    if derived is None:
+        derived = DerivedData(data, config)
+    sd_p_q_linking_geometry = derived.get_p_q_linking_geometry()
+    idx_err = get_p_q_linking_geometry_errors(derived, sd_p_q_linking_geometry['bmin_too_small'], ['bmin'])
     if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device q_bound_cap either beta_min == 0.0 or abs(beta_min) >= tol. tol = {}. failures (uid, beta_min): {}".format(config['beta_zero_tol'], idx_err)
-        raise ModelError(msg)
+        msg = "fails network simple_dispatchable_device q_bound_cap either beta_min == 0.0 or abs(beta_min) >= tol. tol = {}. failures (uid, beta_min)".format(config['beta_zero_tol'])
+        raise get_check_error(msg, idx_err, config)
 
-def sd_p_q_beta_diff_not_too_small(data, config):
+def sd_p_q_beta_diff_not_too_small(data, config, derived=None):
 
-    sd_p_q_linking_geometry = get_p_q_linking_geometry(data, config)
-    idx_err = [(k, v['bmax'], v['bmin']) for k, v in sd_p_q_linking_geometry.items() if v['bdiff_too_small']]
+    if derived is None:
+        derived = DerivedData(data, config)
+    sd_p_q_linking_geometry = derived.get_p_q_linking_geometry()
+    idx_err = get_p_q_linking_geometry_errors(derived, sd_p_q_linking_geometry['bdiff_too_small'], ['bmax', 'bmin'])
     if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device q_bound_cap either beta_max == beta_min or abs(beta_max - beta_min) >= tol. tol = {}. failures (uid, beta_max, beta_min): {}".format(config['beta_zero_tol'], idx_err)
-        raise ModelError(msg)
+        msg = "fails network simple_dispatchable_device q_bound_cap either beta_max == beta_min or abs(beta_max - beta_min) >= tol. tol = {}. failures (uid, beta_max, beta_min)".format(config['beta_zero_tol'])
+        raise get_check_error(msg, idx_err, config)
 
 def check_p_q_linking_ramping_feas(
-        # float t-arrays
-        d, # interval duration
+        # float (num_sd, num_t)-arrays
+        d, # interval duration, (num_t, )-array
         p_max, p_min, q_max, q_min, # max/min p/q (input)
         y_max, y_min, # max and min real power (output)
-        # bool t-arrays
+        # bool (num_sd, num_t)-arrays
         feas, # feasibility (output)
-        # dicts
-        p_q_linking_geometry=None,
-        ramping_info=None,
-        debug=False,
+        # (num_sd, )-arrays
+        p_q_linking_geometry=None, # p_q_linking_geometry_dtype
+        ramping_info=None, # dict with float arrays 'p0', 'pru', 'prd'
 ):
+    '''
+    for each device (row) and interval (column), compute the max and min real power y_max, y_min
+    implied by the p max/min bounds, the p/q linking constraints applied to the p/q max/min rectangle if p_q_linking_geometry is given,
+    and the p ramping constraints from p0 through the earlier intervals if ramping_info is given.
+    feas = (y_min <= y_max)
+
+    without ramping_info, the intervals are independent and are computed in one pass.
+    with ramping_info, each interval depends on the one before, so the intervals are computed in order,
+    each in one pass over the devices.
+    '''
 
-    if debug:
-        print('d: ', d)
-        print('p_max: ', p_max)
-        print('p_min: ', p_min)
-        print('q_max: ', q_max)
-        print('q_min: ', q_min)
-        print('y_max: ', y_max)
-        print('y_min: ', y_min)
-        print('feas: ', feas)
-        print('p_q_linking_geometry: ', p_q_linking_geometry)
-        print('ramping_info: ', ramping_info)
-
-    feas[:] = False
-    y_max[:] = 0.0
-    y_min[:] = 0.0
-    feas_scalar = False
-    feas_scalar_2 = False
-    y_max_scalar = 0.0
-    y_min_scalar = 0.0
-    num_t = p_max.size
-
-    y_max[:] = p_max
-    y_min[:] = p_min
-    numpy.less_equal(y_min, y_max, out=feas)
-
-    if p_q_linking_geometry is not None or ramping_info is not None:
-        if ramping_info is not None:
-            y_max_scalar = ramping_info['p0']
-            y_min_scalar = ramping_info['p0']
-            if debug:
-                print('y_max_scalar: ', y_max_scalar)
-                print('y_min_scalar: ', y_min_scalar)
-        for i in range(num_t):
-            if debug:
-                print('t: ', i)
-            if ramping_info is not None:
-                y_max_scalar = y_max_scalar + d[i] * ramping_info['pru']
-                y_min_scalar = y_min_scalar - d[i] * ramping_info['prd']
-                y_max_scalar = min(y_max_scalar, p_max[i])
-                y_min_scalar = max(y_min_scalar, p_min[i])
-            else:
-                y_max_scalar = p_max[i]
-                y_min_scalar = p_min[i]
-            feas_scalar = (y_min_scalar <= y_max_scalar)
-            if debug:
-                print('t: ', i)
-                print('y_max_scalar: ', y_max_scalar)
-                print('y_min_scalar: ', y_min_scalar)
-                print('feas_scalar: ', feas_scalar)
-            if p_q_linking_geometry is not None:
-                feas_scalar_2, y_max_scalar, y_min_scalar = compute_max_min_p_from_max_min_p_q_and_linking(
-                    y_max_scalar, y_min_scalar, q_max[i], q_min[i], p_q_linking_geometry)
-                feas_scalar = (feas_scalar and feas_scalar_2)
-                if debug:
-                    print('y_max_scalar: ', y_max_scalar)
-                    print('y_min_scalar: ', y_min_scalar)
-                    print('feas_scalar: ', feas_scalar)
-                    print('feas_scalar_2: ', feas_scalar_2)
-            y_max[i] = y_max_scalar
-            y_min[i] = y_min_scalar
-            feas[i] = feas_scalar
-            if debug:
-                print('y_max: ', y_max)
-                print('y_min: ', y_min)
-                print('feas: ', feas)
-                if not feas_scalar:
-                    debug = False
-
-def ts_sd_p_q_linking_feas(data, config):
+    num_t = d.size
+
+    if ramping_info is None:
+        y_max[:] = p_max
+        y_min[:] = p_min
+        if p_q_linking_geometry is None:
+            numpy.less_equal(y_min, y_max, out=feas)
+        else:
+            feas[:], y_max[:], y_min[:] = compute_max_min_p_from_max_min_p_q_and_linking(
+                p_max, p_min, q_max, q_min, numpy.reshape(p_q_linking_geometry, (-1, 1)))
+        return
+
+    y_max_t = numpy.array(ramping_info['p0'], dtype=float)
+    y_min_t = numpy.array(ramping_info['p0'], dtype=float)
+    for t in range(num_t):
+        y_max_t = y_max_t + d[t] * ramping_info['pru']
+        y_min_t = y_min_t - d[t] * ramping_info['prd']
+        y_max_t = numpy.where(p_max[:, t] < y_max_t, p_max[:, t], y_max_t)
+        y_min_t = numpy.where(p_min[:, t] > y_min_t, p_min[:, t], y_min_t)
+        feas_t = (y_min_t <= y_max_t)
+        if p_q_linking_geometry is not None:
+            feas_t_2, y_max_t, y_min_t = compute_max_min_p_from_max_min_p_q_and_linking(
+                y_max_t, y_min_t, q_max[:, t], q_min[:, t], p_q_linking_geometry)
+            feas_t &= feas_t_2
+        y_max[:, t] = y_max_t
+        y_min[:, t] = y_min_t
+        feas[:, t] = feas_t
+
+def get_sd_t_p_q_max_min(data, derived=None):
+    '''
+    returns p_max, p_min, q_max, q_min as (num_sd, num_t) arrays,
+    in the order of data.network.simple_dispatchable_device
+    '''
+
+    if derived is None:
+        derived = DerivedData(data, None)
+    num_t = len(data.time_series_input.general.interval_duration)
+    num_sd = len(data.network.simple_dispatchable_device)
+    sd_uid = derived.get_sd_uid()
+    sd_ts_dict = derived.get_sd_ts_dict()
+    p_max = numpy.array([sd_ts_dict[i].p_ub for i in sd_uid], dtype=float).reshape((num_sd, num_t))
+    p_min = numpy.array([sd_ts_dict[i].p_lb for i in sd_uid], dtype=float).reshape((num_sd, num_t))
+    q_max = numpy.array([sd_ts_dict[i].q_ub for i in sd_uid], dtype=float).reshape((num_sd, num_t))
+    q_min = numpy.array([sd_ts_dict[i].q_lb for i in sd_uid], dtype=float).reshape((num_sd, num_t))
+    return p_max, p_min, q_max, q_min
+
+def get_sd_ramping_info(data):
+    '''
+    ramping_info for check_p_q_linking_ramping_feas, in the order of data.network.simple_dispatchable_device
+    '''
+
+    sds = data.network.simple_dispatchable_device
+    num_sd = len(sds)
+    return {
+        'p0': numpy.array([c.initial_status.p for c in sds], dtype=float).reshape((num_sd, )),
+        'pru': numpy.array([c.p_ramp_up_ub for c in sds], dtype=float).reshape((num_sd, )),
+        'prd': numpy.array([c.p_ramp_down_ub for c in sds], dtype=float).reshape((num_sd, ))}
+
+def get_sd_p_q_linking_ramping_feas(data, derived, sd_idx, use_linking, use_ramping):
+    '''
+    returns y_max, y_min, feas from check_p_q_linking_ramping_feas for the devices sd_idx
+    '''
+
+    num_t = len(data.time_series_input.general.interval_duration)
+    d = numpy.array(data.time_series_input.general.interval_duration, dtype=float)
+    p_max, p_min, q_max, q_min = derived.get_sd_t_p_q_max_min()
+    y_max = numpy.zeros(shape=(sd_idx.size, num_t), dtype=float)
+    y_min = numpy.zeros(shape=(sd_idx.size, num_t), dtype=float)
+    feas = numpy.zeros(shape=(sd_idx.size, num_t), dtype=bool)
+    ramping_info = None
+    if use_ramping:
+        ramping_info = {k: v[sd_idx] for k, v in derived.get_sd_ramping_info().items()}
+    p_q_linking_geometry = None
+    if use_linking:
+        p_q_linking_geometry = derived.get_p_q_linking_geometry()[sd_idx]
+    check_p_q_linking_ramping_feas(
+        d, p_max[sd_idx], p_min[sd_idx], q_max[sd_idx], q_min[sd_idx], y_max, y_min,
+        feas,
+        p_q_linking_geometry=p_q_linking_geometry,
+        ramping_info=ramping_info)
+    return y_max, y_min, feas
+
+def ts_sd_p_q_linking_feas(data, config, derived=None):
     '''
     check that the intersection of the p/q max/min rectangle and the p/q linking constraints is nonempty
 
@@ -2050,106 +2537,49 @@ def ts_sd_p_q_linking_feas(data, config):
     beta_lb
     '''
 
+    if derived is None:
+        derived = DerivedData(data, config)
+    uid_sd_ts_map = derived.get_sd_ts_dict()
+    sd_idx = numpy.flatnonzero(derived.get_p_q_linking_geometry()['code'] != p_q_linking_plane)
+    ymax, ymin, feas = get_sd_p_q_linking_ramping_feas(data, derived, sd_idx, True, False)
     idx_err = []
-    uid_sd_ts_map = {c.uid:c for c in data.time_series_input.simple_dispatchable_device}
-    num_t = len(data.time_series_input.general.interval_duration)
-    num_sd = len(data.time_series_input.simple_dispatchable_device)
-    d = numpy.array(data.time_series_input.general.interval_duration, dtype=float)
-    pmax = numpy.zeros(shape=(num_t, ), dtype=float)
-    pmin = numpy.zeros(shape=(num_t, ), dtype=float)
-    qmax = numpy.zeros(shape=(num_t, ), dtype=float)
-    qmin = numpy.zeros(shape=(num_t, ), dtype=float)
-    ymax = numpy.zeros(shape=(num_t, ), dtype=float)
-    ymin = numpy.zeros(shape=(num_t, ), dtype=float)
-    feas = numpy.zeros(shape=(num_t, ), dtype=bool)
-    bool1 = numpy.zeros(shape=(num_t, ), dtype=bool)
-    sd_p_q_linking_geometry = get_p_q_linking_geometry(data, config)
-    for j in range(num_sd):
-        sd = data.network.simple_dispatchable_device[j]
-        if sd.q_bound_cap == 1 or sd.q_linear_cap == 1:
-            sd_ts = uid_sd_ts_map[sd.uid]
-            pmax[:] = sd_ts.p_ub
-            pmin[:] = sd_ts.p_lb
-            qmax[:] = sd_ts.q_ub
-            qmin[:] = sd_ts.q_lb
-            feas[:] = False
-            ymax[:] = 0.0
-            ymin[:] = 0.0
-            p_q_linking_geometry = sd_p_q_linking_geometry[sd.uid]
-            check_p_q_linking_ramping_feas(
-                d, pmax, pmin, qmax, qmin, ymax, ymin,
-                feas,
-                p_q_linking_geometry=p_q_linking_geometry,
-                ramping_info=None)
-            numpy.logical_not(feas, out=bool1)
-            infeas_t = numpy.flatnonzero(bool1)
-            idx_err += [
-                (sd.uid, t, sd_ts.p_ub[t], sd_ts.p_lb[t], sd_ts.q_ub[t], sd_ts.q_lb[t],
-                 sd.q_linear_cap, sd.q_bound_cap, sd.q_0, sd.q_0_ub, sd.q_0_lb, sd.beta, sd.beta_ub, sd.beta_lb,
-                 ymax[t], ymin[t])
-                for t in infeas_t]
+    for i, t in zip(*numpy.nonzero(~feas)):
+        sd = data.network.simple_dispatchable_device[sd_idx[i]]
+        sd_ts = uid_sd_ts_map[sd.uid]
+        idx_err.append(
+            (sd.uid, t, sd_ts.p_ub[t], sd_ts.p_lb[t], sd_ts.q_ub[t], sd_ts.q_lb[t],
+             sd.q_linear_cap, sd.q_bound_cap, sd.q_0, sd.q_0_ub, sd.q_0_lb, sd.beta, sd.beta_ub, sd.beta_lb,
+             ymax[i, t], ymin[i, t]))
     if len(idx_err) > 0:
-        msg = "fails simple_dispatchable_device p/q max/min time series constraints and p/q linking constraints have nonempty intersection. failures (device uid, interval index, pmax, pmin, qmax, qmin, q_linear_cap, q_bound_cap, q_0, q_0_ub, q_0_lb, beta, beta_ub, beta_lb, pmax_implied, pmin_implied): {}".format(idx_err)
-        raise ModelError(msg)    
+        msg = "fails simple_dispatchable_device p/q max/min time series constraints and p/q linking constraints have nonempty intersection. failures (device uid, interval index, pmax, pmin, qmax, qmin, q_linear_cap, q_bound_cap, q_0, q_0_ub, q_0_lb, beta, beta_ub, beta_lb, pmax_implied, pmin_implied)"
+        raise get_check_error(msg, idx_err, config)    
 
-def ts_sd_p_q_ramping_feas(data, config):
+def ts_sd_p_q_ramping_feas(data, config, derived=None):
     '''
     check that the intersection of the p max/min interval and the p ramping constraints is nonempty
     '''
 
-    idx_err = []
-    uid_sd_ts_map = {c.uid:c for c in data.time_series_input.simple_dispatchable_device}
-    num_t = len(data.time_series_input.general.interval_duration)
-    num_sd = len(data.time_series_input.simple_dispatchable_device)
+    if derived is None:
+        derived = DerivedData(data, config)
+    uid_sd_ts_map = derived.get_sd_ts_dict()
     d = numpy.array(data.time_series_input.general.interval_duration, dtype=float)
-    pmax = numpy.zeros(shape=(num_t, ), dtype=float)
-    pmin = numpy.zeros(shape=(num_t, ), dtype=float)
-    qmax = numpy.zeros(shape=(num_t, ), dtype=float)
-    qmin = numpy.zeros(shape=(num_t, ), dtype=float)
-    ymax = numpy.zeros(shape=(num_t, ), dtype=float)
-    ymin = numpy.zeros(shape=(num_t, ), dtype=float)
-    feas = numpy.zeros(shape=(num_t, ), dtype=bool)
-    bool1 = numpy.zeros(shape=(num_t, ), dtype=bool)
-    #sd_p_q_linking_geometry = get_p_q_linking_geometry(data, config)
-    found_err = False
-    first_err = None
-    for j in range(num_sd):
-        sd = data.network.simple_dispatchable_device[j]
-        if sd.initial_status.on_status == 1:
-            sd_ts = uid_sd_ts_map[sd.uid]
-            pmax[:] = sd_ts.p_ub
-            pmin[:] = sd_ts.p_lb
-            qmax[:] = sd_ts.q_ub
-            qmin[:] = sd_ts.q_lb
-            feas[:] = False
-            ymax[:] = 0.0
-            ymin[:] = 0.0
-            # if sd.q_bound_cap == 1 or sd.q_linear_cap == 1:
-            #     p_q_linking_geometry = sd_p_q_linking_geometry[sd.uid]
-            # else:
-            #     p_q_linking_geometry = None
-            #p_q_linking_geometry = None
-            check_p_q_linking_ramping_feas(
-                d, pmax, pmin, qmax, qmin, ymax, ymin,
-                feas,
-                p_q_linking_geometry=None,
-                ramping_info={'p0': sd.initial_status.p, 'pru': sd.p_ramp_up_ub, 'prd': sd.p_ramp_down_ub},
-                #debug=(sd.uid == '')
-            )
-            numpy.logical_not(feas, out=bool1)
-            infeas_t = numpy.flatnonzero(bool1)
-            if infeas_t.size > 0:
-                t = infeas_t[0]
-                idx_err.append(
-                    (sd.uid, t, sd.initial_status.on_status, d[0:(t+1)].tolist(),
-                     sd_ts.p_ub[0:(t+1)], sd_ts.p_lb[0:(t+1)],
-                     sd.initial_status.p, sd.p_ramp_up_ub, sd.p_ramp_down_ub,
-                     ymax[0:(t+1)].tolist(), ymin[0:(t+1)].tolist()))
+    sd_idx = numpy.flatnonzero([sd.initial_status.on_status == 1 for sd in data.network.simple_dispatchable_device])
+    ymax, ymin, feas = get_sd_p_q_linking_ramping_feas(data, derived, sd_idx, False, True)
+    idx_err = []
+    for i in numpy.flatnonzero(~numpy.all(feas, axis=1)):
+        sd = data.network.simple_dispatchable_device[sd_idx[i]]
+        sd_ts = uid_sd_ts_map[sd.uid]
+        t = numpy.flatnonzero(~feas[i])[0]
+        idx_err.append(
+            (sd.uid, t, sd.initial_status.on_status, d[0:(t+1)].tolist(),
+             sd_ts.p_ub[0:(t+1)], sd_ts.p_lb[0:(t+1)],
+             sd.initial_status.p, sd.p_ramp_up_ub, sd.p_ramp_down_ub,
+             ymax[i, 0:(t+1)].tolist(), ymin[i, 0:(t+1)].tolist()))
     if len(idx_err) > 0:
-        msg = "fails simple_dispatchable_device p max/min time series constraints and p ramping constraints have nonempty intersection. failures (device uid, interval index - first interval per device, u_init, d, pmax, pmin, p_init, pru, prd, pmax_implied, pmin_implied): {}".format(idx_err)
-        raise ModelError(msg)    
+        msg = "fails simple_dispatchable_device p max/min time series constraints and p ramping constraints have nonempty intersection. failures (device uid, interval index - first interval per device, u_init, d, pmax, pmin, p_init, pru, prd, pmax_implied, pmin_implied)"
+        raise get_check_error(msg, idx_err, config)    
 
-def ts_sd_p_q_linking_ramping_feas(data, config):
+def ts_sd_p_q_linking_ramping_feas(data, config, derived=None):
     '''
     check that the intersection of the p/q max/min rectangle and the p/q linking constraints and the p ramping constraints is nonempty
 
@@ -2164,151 +2594,87 @@ def ts_sd_p_q_linking_ramping_feas(data, config):
     beta_lb
     '''
 
-    idx_err = []
-    uid_sd_ts_map = {c.uid:c for c in data.time_series_input.simple_dispatchable_device}
-    num_t = len(data.time_series_input.general.interval_duration)
-    num_sd = len(data.time_series_input.simple_dispatchable_device)
+    if derived is None:
+        derived = DerivedData(data, config)
+    uid_sd_ts_map = derived.get_sd_ts_dict()
     d = numpy.array(data.time_series_input.general.interval_duration, dtype=float)
-    pmax = numpy.zeros(shape=(num_t, ), dtype=float)
-    pmin = numpy.zeros(shape=(num_t, ), dtype=float)
-    qmax = numpy.zeros(shape=(num_t, ), dtype=float)
-    qmin = numpy.zeros(shape=(num_t, ), dtype=float)
-    ymax = numpy.zeros(shape=(num_t, ), dtype=float)
-    ymin = numpy.zeros(shape=(num_t, ), dtype=float)
-    feas = numpy.zeros(shape=(num_t, ), dtype=bool)
-    bool1 = numpy.zeros(shape=(num_t, ), dtype=bool)
-    sd_p_q_linking_geometry = get_p_q_linking_geometry(data, config)
-    found_err = False
-    first_err = None
-    for j in range(num_sd):
-        sd = data.network.simple_dispatchable_device[j]
-        if sd.initial_status.on_status == 1:
-            sd_ts = uid_sd_ts_map[sd.uid]
-            pmax[:] = sd_ts.p_ub
-            pmin[:] = sd_ts.p_lb
-            qmax[:] = sd_ts.q_ub
-            qmin[:] = sd_ts.q_lb
-            feas[:] = False
-            ymax[:] = 0.0
-            ymin[:] = 0.0
-            if sd.q_bound_cap == 1 or sd.q_linear_cap == 1:
-                p_q_linking_geometry = sd_p_q_linking_geometry[sd.uid]
-            else:
-                p_q_linking_geometry = None
-            check_p_q_linking_ramping_feas(
-                d, pmax, pmin, qmax, qmin, ymax, ymin,
-                feas,
-                p_q_linking_geometry=p_q_linking_geometry,
-                ramping_info={'p0': sd.initial_status.p, 'pru': sd.p_ramp_up_ub, 'prd': sd.p_ramp_down_ub})
-            numpy.logical_not(feas, out=bool1)
-            infeas_t = numpy.flatnonzero(bool1)
-            if infeas_t.size > 0:
-                t = infeas_t[0]
-                idx_err.append(
-                    (sd.uid, t, sd.initial_status.on_status, d[0:(t+1)].tolist(),
-                     sd_ts.p_ub[0:(t+1)], sd_ts.p_lb[0:(t+1)], sd_ts.q_ub[0:(t+1)], sd_ts.q_lb[0:(t+1)],
-                     sd.q_linear_cap, sd.q_bound_cap, sd.q_0, sd.q_0_ub, sd.q_0_lb,
-                     sd.beta, sd.beta_ub, sd.beta_lb,
-                     sd.initial_status.p, sd.p_ramp_up_ub, sd.p_ramp_down_ub,
-                     ymax[0:(t+1)].tolist(), ymin[0:(t+1)].tolist()))
+    sd_idx = numpy.flatnonzero([sd.initial_status.on_status == 1 for sd in data.network.simple_dispatchable_device])
+    # devices without linking constraints have geometry p_q_linking_plane, which does not cut p
+    ymax, ymin, feas = get_sd_p_q_linking_ramping_feas(data, derived, sd_idx, True, True)
+    idx_err = []
+    for i in numpy.flatnonzero(~numpy.all(feas, axis=1)):
+        sd = data.network.simple_dispatchable_device[sd_idx[i]]
+        sd_ts = uid_sd_ts_map[sd.uid]
+        t = numpy.flatnonzero(~feas[i])[0]
+        idx_err.append(
+            (sd.uid, t, sd.initial_status.on_status, d[0:(t+1)].tolist(),
+             sd_ts.p_ub[0:(t+1)], sd_ts.p_lb[0:(t+1)], sd_ts.q_ub[0:(t+1)], sd_ts.q_lb[0:(t+1)],
+             sd.q_linear_cap, sd.q_bound_cap, sd.q_0, sd.q_0_ub, sd.q_0_lb,
+             sd.beta, sd.beta_ub, sd.beta_lb,
+             sd.initial_status.p, sd.p_ramp_up_ub, sd.p_ramp_down_ub,
+             ymax[i, 0:(t+1)].tolist(), ymin[i, 0:(t+1)].tolist()))
     if len(idx_err) > 0:
-        msg = "fails simple_dispatchable_device p/q max/min time series constraints and p/q linking constraints and p ramping constraints have nonempty intersection. failures (device uid, interval index - first interval per device, u_init, d, pmax, pmin, qmax, qmin, q_linear_cap, q_bound_cap, q_0, q_0_ub, q_0_lb, beta, beta_ub, beta_lb, p_init, pru, prd, pmax_implied, pmin_implied): {}".format(idx_err)
-        raise ModelError(msg)    
+        msg = "fails simple_dispatchable_device p/q max/min time series constraints and p/q linking constraints and p ramping constraints have nonempty intersection. failures (device uid, interval index - first interval per device, u_init, d, pmax, pmin, qmax, qmin, q_linear_cap, q_bound_cap, q_0, q_0_ub, q_0_lb, beta, beta_ub, beta_lb, p_init, pru, prd, pmax_implied, pmin_implied)"
+        raise get_check_error(msg, idx_err, config)    
 
-def ts_sd_p_lb_le_ub(data, config):
+def ts_sd_p_lb_le_ub(index, config):
 
-    num_t = len(data.time_series_input.general.interval_duration)
-    num_sd = len(data.time_series_input.simple_dispatchable_device)
-    uid = [c.uid for c in data.time_series_input.simple_dispatchable_device]
-    lb = [c.p_lb for c in data.time_series_input.simple_dispatchable_device]
-    ub = [c.p_ub for c in data.time_series_input.simple_dispatchable_device]
-    idx_err = [(i, uid[i], j, lb[i][j], ub[i][j]) for i in range(num_sd) for j in range(num_t) if lb[i][j] > ub[i][j]]
-    if len(idx_err) > 0:
-        msg = "fails time_series_input simple_dispatchable_device p_lb <= p_ub. failures (device index, device uid, interval index, p_lb, p_ub): {}".format(idx_err)
-        raise ModelError(msg)
+    ts_sd_lb_le_ub(index, config, 'p')
 
-def ts_sd_q_lb_le_ub(data, config):
+def ts_sd_q_lb_le_ub(index, config):
 
-    num_t = len(data.time_series_input.general.interval_duration)
-    num_sd = len(data.time_series_input.simple_dispatchable_device)
-    uid = [c.uid for c in data.time_series_input.simple_dispatchable_device]
-    lb = [c.q_lb for c in data.time_series_input.simple_dispatchable_device]
-    ub = [c.q_ub for c in data.time_series_input.simple_dispatchable_device]
-    idx_err = [(i, uid[i], j, lb[i][j], ub[i][j]) for i in range(num_sd) for j in range(num_t) if lb[i][j] > ub[i][j]]
-    if len(idx_err) > 0:
-        msg = "fails time_series_input simple_dispatchable_device q_lb <= q_ub. failures (device index, device uid, interval index, q_lb, q_ub): {}".format(idx_err)
-        raise ModelError(msg)
+    ts_sd_lb_le_ub(index, config, 'q')
 
-def t_d_discrete(data, config):
+def get_not_discrete(values, config, scale=1.0):
     '''
+    indices of values with scale * value / TU not within TOL of an integer
     '''
 
-    t = data.time_series_input.general.interval_duration
-    tu = config['minimum_time_unit']
-    te = config['float_int_tol']
-    num_t = len(t)
-    idx_err = [(i, t[i]) for i in range(num_t) if abs(0.5 * t[i] / tu - round(0.5 * t[i] / tu)) > te]
-    if len(idx_err) > 0:
-        msg = "fails time_series_input general interval_duration 0.5 * d / TU within TOL of an integer. TU: {}, TOL: {}, failures (t num, d): {}".format(tu, te, idx_err)
-        raise ModelError(msg)
+    x = scale * values / config['minimum_time_unit']
+    return numpy.flatnonzero(numpy.absolute(x - numpy.round(x)) > config['float_int_tol'])
 
-def sd_d_up_0_discrete(data, config):
+def t_d_discrete(problem, config):
     '''
     '''
 
-    uid = [i.uid for i in data.network.simple_dispatchable_device]
-    t = [i.initial_status.accu_up_time for i in data.network.simple_dispatchable_device]
     tu = config['minimum_time_unit']
     te = config['float_int_tol']
-    num_sd = len(uid)
-    idx_err = [(uid[i], t[i]) for i in range(num_sd) if abs(t[i] / tu - round(t[i] / tu)) > te]
-    if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device initial_status accu_up_time d / TU within TOL of an integer. TU: {}, TOL: failures (sd uid, d): {}".format(tu, te, idx_err)
-        raise ModelError(msg)
+    idx = get_not_discrete(problem.t_d, config, scale=0.5)
+    if idx.size > 0:
+        idx_err = [(i, problem.t_d[i].item()) for i in idx[:config.get('max_errors_per_check')].tolist()]
+        msg = "fails time_series_input general interval_duration 0.5 * d / TU within TOL of an integer. TU: {}, TOL: {}, failures (t num, d)".format(tu, te)
+        raise get_check_error(msg, idx_err, config, idx.size)
 
-def sd_d_dn_0_discrete(data, config):
+def sd_discrete(problem, config, values, desc):
     '''
+    values is an array over sd
     '''
 
-    uid = [i.uid for i in data.network.simple_dispatchable_device]
-    t = [i.initial_status.accu_down_time for i in data.network.simple_dispatchable_device]
     tu = config['minimum_time_unit']
     te = config['float_int_tol']
-    num_sd = len(uid)
-    idx_err = [(uid[i], t[i]) for i in range(num_sd) if abs(t[i] / tu - round(t[i] / tu)) > te]
-    if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device initial_status accu_down_time d / TU within TOL of an integer. TU: {}, TOL: failures (sd uid, d): {}".format(tu, te, idx_err)
-        raise ModelError(msg)
+    idx = get_not_discrete(values, config)
+    if idx.size > 0:
+        idx_err = [(problem.sd_uid[i], values[i].item()) for i in idx[:config.get('max_errors_per_check')].tolist()]
+        msg = "fails network simple_dispatchable_device {} d / TU within TOL of an integer. TU: {}, TOL: {}, failures (sd uid, d)".format(desc, tu, te)
+        raise get_check_error(msg, idx_err, config, idx.size)
 
-def sd_d_up_min_discrete(data, config):
-    '''
-    '''
+def sd_d_up_0_discrete(problem, config):
 
-    uid = [i.uid for i in data.network.simple_dispatchable_device]
-    t = [i.in_service_time_lb for i in data.network.simple_dispatchable_device]
-    tu = config['minimum_time_unit']
-    te = config['float_int_tol']
-    num_sd = len(uid)
-    idx_err = [(uid[i], t[i]) for i in range(num_sd) if abs(t[i] / tu - round(t[i] / tu)) > te]
-    if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device in_service_time_lb d / TU within TOL of an integer. TU: {}, TOL: failures (sd uid, d): {}".format(tu, te, idx_err)
-        raise ModelError(msg)
+    sd_discrete(problem, config, problem.sd_d_up_0, 'initial_status accu_up_time')
 
-def sd_d_dn_min_discrete(data, config):
-    '''
-    '''
+def sd_d_dn_0_discrete(problem, config):
 
-    uid = [i.uid for i in data.network.simple_dispatchable_device]
-    t = [i.down_time_lb for i in data.network.simple_dispatchable_device]
-    tu = config['minimum_time_unit']
-    te = config['float_int_tol']
-    num_sd = len(uid)
-    idx_err = [(uid[i], t[i]) for i in range(num_sd) if abs(t[i] / tu - round(t[i] / tu)) > te]
-    if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device down_time_lb d / TU within TOL of an integer. TU: {}, TOL: failures (sd uid, d): {}".format(tu, te, idx_err)
-        raise ModelError(msg)
+    sd_discrete(problem, config, problem.sd_d_dn_0, 'initial_status accu_down_time')
+
+def sd_d_up_min_discrete(problem, config):
+
+    sd_discrete(problem, config, problem.sd_d_up_min, 'in_service_time_lb')
+
+def sd_d_dn_min_discrete(problem, config):
+
+    sd_discrete(problem, config, problem.sd_d_dn_min, 'down_time_lb')
 
-def sd_sus_d_dn_max_discrete(data, config):
+def sd_sus_d_dn_max_discrete(data, config, derived=None):
     '''
     '''
 
@@ -2320,98 +2686,54 @@ def sd_sus_d_dn_max_discrete(data, config):
         for j in range(len(i.startup_states))
         if abs(i.startup_states[j][1] / tu - round(i.startup_states[j][1] / tu)) > te]
     if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device startup_states max_down_time d / TU within TOL of an integer. TU: {}, TOL: failures (sd uid, state num, d): {}".format(tu, te, idx_err)
-        raise ModelError(msg)
+        msg = "fails network simple_dispatchable_device startup_states max_down_time d / TU within TOL of an integer. TU: {}, TOL: {}, failures (sd uid, state num, d)".format(tu, te)
+        raise get_check_error(msg, idx_err, config)
 
-def sd_w_a_en_max_start_discrete(data, config):
+def sd_constr_discrete(problem, config, values_list, desc):
     '''
+    values_list[i] is the array of values over the multi-interval constraints of sd i
     '''
 
     tu = config['minimum_time_unit']
     te = config['float_int_tol']
-    idx_err = [
-        (i.uid, j, i.energy_req_ub[j][0])
-        for i in data.network.simple_dispatchable_device
-        for j in range(len(i.energy_req_ub))
-        if abs(i.energy_req_ub[j][0] / tu - round(i.energy_req_ub[j][0] / tu)) > te]
-    if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device energy_req_ub start_time d / TU within TOL of an integer. TU: {}, TOL: failures (sd uid, constr num, d): {}".format(tu, te, idx_err)
-        raise ModelError(msg)
+    num = [i.size for i in values_list]
+    if sum(num) == 0:
+        return
+    ptr = numpy.zeros(shape=(len(num) + 1, ), dtype=int)
+    numpy.cumsum(num, out=ptr[1:])
+    values = numpy.concatenate(values_list)
+    sd = numpy.repeat(numpy.arange(len(num)), num)
+    idx = get_not_discrete(values, config)
+    if idx.size > 0:
+        idx_err = [
+            (problem.sd_uid[sd[k]], k - ptr[sd[k]].item(), values[k].item())
+            for k in idx[:config.get('max_errors_per_check')].tolist()]
+        msg = "fails network simple_dispatchable_device {} d / TU within TOL of an integer. TU: {}, TOL: {}, failures (sd uid, constr num, d)".format(desc, tu, te)
+        raise get_check_error(msg, idx_err, config, idx.size)
 
-def sd_w_a_en_max_end_discrete(data, config):
-    '''
-    '''
+def sd_w_a_en_max_start_discrete(problem, config):
 
-    tu = config['minimum_time_unit']
-    te = config['float_int_tol']
-    idx_err = [
-        (i.uid, j, i.energy_req_ub[j][1])
-        for i in data.network.simple_dispatchable_device
-        for j in range(len(i.energy_req_ub))
-        if abs(i.energy_req_ub[j][1] / tu - round(i.energy_req_ub[j][1] / tu)) > te]
-    if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device energy_req_ub end_time d / TU within TOL of an integer. TU: {}, TOL: failures (sd uid, constr num, d): {}".format(tu, te, idx_err)
-        raise ModelError(msg)
+    sd_constr_discrete(problem, config, problem.sd_max_energy_constr_a_start_list, 'energy_req_ub start_time')
 
-def sd_w_a_en_min_start_discrete(data, config):
-    '''
-    '''
+def sd_w_a_en_max_end_discrete(problem, config):
 
-    tu = config['minimum_time_unit']
-    te = config['float_int_tol']
-    idx_err = [
-        (i.uid, j, i.energy_req_lb[j][0])
-        for i in data.network.simple_dispatchable_device
-        for j in range(len(i.energy_req_lb))
-        if abs(i.energy_req_lb[j][0] / tu - round(i.energy_req_lb[j][0] / tu)) > te]
-    if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device energy_req_lb start_time d / TU within TOL of an integer. TU: {}, TOL: failures (sd uid, constr num, d): {}".format(tu, te, idx_err)
-        raise ModelError(msg)
+    sd_constr_discrete(problem, config, problem.sd_max_energy_constr_a_end_list, 'energy_req_ub end_time')
 
-def sd_w_a_en_min_end_discrete(data, config):
-    '''
-    '''
+def sd_w_a_en_min_start_discrete(problem, config):
 
-    tu = config['minimum_time_unit']
-    te = config['float_int_tol']
-    idx_err = [
-        (i.uid, j, i.energy_req_lb[j][1])
-        for i in data.network.simple_dispatchable_device
-        for j in range(len(i.energy_req_lb))
-        if abs(i.energy_req_lb[j][1] / tu - round(i.energy_req_lb[j][1] / tu)) > te]
-    if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device energy_req_lb end_time d / TU within TOL of an integer. TU: {}, TOL: failures (sd uid, constr num, d): {}".format(tu, te, idx_err)
-        raise ModelError(msg)
+    sd_constr_discrete(problem, config, problem.sd_min_energy_constr_a_start_list, 'energy_req_lb start_time')
 
-def sd_w_a_su_max_start_discrete(data, config):
-    '''
-    '''
+def sd_w_a_en_min_end_discrete(problem, config):
 
-    tu = config['minimum_time_unit']
-    te = config['float_int_tol']
-    idx_err = [
-        (i.uid, j, i.startups_ub[j][0])
-        for i in data.network.simple_dispatchable_device
-        for j in range(len(i.startups_ub))
-        if abs(i.startups_ub[j][0] / tu - round(i.startups_ub[j][0] / tu)) > te]
-    if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device startups_ub start_time d / TU within TOL of an integer. TU: {}, TOL: failures (sd uid, constr num, d): {}".format(tu, te, idx_err)
-        raise ModelError(msg)
+    sd_constr_discrete(problem, config, problem.sd_min_energy_constr_a_end_list, 'energy_req_lb end_time')
 
-def sd_w_a_su_max_end_discrete(data, config):
-    '''
-    '''
+def sd_w_a_su_max_start_discrete(problem, config):
 
-    tu = config['minimum_time_unit']
-    te = config['float_int_tol']
-    idx_err = [
-        (i.uid, j, i.startups_ub[j][1])
-        for i in data.network.simple_dispatchable_device
-        for j in range(len(i.startups_ub))
-        if abs(i.startups_ub[j][1] / tu - round(i.startups_ub[j][1] / tu)) > te]
-    if len(idx_err) > 0:
-        msg = "fails network simple_dispatchable_device startups_ub end_time d / TU within TOL of an integer. TU: {}, TOL: failures (sd uid, constr num, d): {}".format(tu, te, idx_err)
-        raise ModelError(msg)
+    sd_constr_discrete(problem, config, problem.sd_max_startup_constr_a_start_list, 'startups_ub start_time')
+
+def sd_w_a_su_max_end_discrete(problem, config):
+
+    sd_constr_discrete(problem, config, problem.sd_max_startup_constr_a_end_list, 'startups_ub end_time')
 
 def connected(data, config):
     '''
@@ -2419,6 +2741,7 @@ def connected(data, config):
     '''
     # todo could use the cleaner interface in utils.get_connected_components and utils.get_bridges
 
+    import networkx
     msg = ""
 
     # get buses, branches, and contingencies that are relavant to this check
@@ -0,0 +1,44 @@
+'''
+eval_server.py
+
+python eval_server.py [-h, --help]
+* display help
+
+python eval_server.py [-c, --configuration] <config_file_name> [-a, --host] <host> [-o, --port] <port> [-n, --cache_size] <num_problems>
+* run a local evaluation server
+* problems are loaded and checked once and kept in memory
+* POST /evaluate with JSON body {"problem": <problem_file_name>, "solution": <solution_file_name>}
+* or {"problem": <problem_file_name>, "solution_data": <solution data>}
+* response body is the summary.json content that check_data.py would write
+'''
+
+import argparse, pathlib
+from datautilities import server, utils
+
+config_file = 'config.json'
+
+if __name__ == '__main__':
+
+    msg = '\n'.join([
+            'run a local evaluation server.',
+            'requests',
+            '  POST /evaluate',
+            '  {"problem": <problem file>, "solution": <solution file>}',
+            'response',
+            '  summary json',
+            ])
+    parser = argparse.ArgumentParser(description=msg, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "-c", "--configuration",
+        default=str(pathlib.Path(utils.get_C3DataUtilities_dir(), config_file)),
+        help="Configuration file")
+    parser.add_argument("-a", "--host", default="127.0.0.1", help="Host to listen on")
+    parser.add_argument("-o", "--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("-n", "--cache_size", type=int, default=4, help="Number of problems to keep in memory")
+
+    args = parser.parse_args()
+
+    print('args:')
+    print(args)
+
+    server.serve(args.configuration, args.host, args.port, args.cache_size)
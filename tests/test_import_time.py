@@ -0,0 +1,64 @@
+'''
+test_import_time.py
+
+guards the deferred imports that keep check_data.py startup fast.
+pandas, networkx, scipy, pydantic, and datamodel should only be imported by the functions that use them,
+so check_data.py --help and importing the datautilities modules used at startup should not load them.
+
+python tests/test_import_time.py
+or
+python -m pytest tests/test_import_time.py
+
+the time budget for check_data.py --help can be set with the environment variable
+C3DATAUTILITIES_IMPORT_TIME_BUDGET, in seconds
+'''
+
+import os, sys, json, time, subprocess
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+heavy_modules = ['pandas', 'networkx', 'scipy', 'pydantic', 'datamodel']
+time_budget = float(os.environ.get('C3DATAUTILITIES_IMPORT_TIME_BUDGET', 1.0))
+
+def get_heavy_modules_loaded(code):
+    '''
+    run code in a new python process in the repo directory,
+    and return the heavy modules in its sys.modules at the end
+    '''
+
+    code = code + '\nimport sys, json\nprint(json.dumps([m for m in {} if m in sys.modules]))'.format(heavy_modules)
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=repo_dir, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_startup_modules_do_not_import_heavy_modules():
+
+    loaded = get_heavy_modules_loaded('import datautilities.validation, datautilities.batchcheck, datautilities.utils')
+    assert loaded == [], 'heavy modules imported at startup: {}'.format(loaded)
+
+def test_check_data_help_does_not_import_heavy_modules():
+
+    code = '\n'.join([
+        'import sys, runpy',
+        'sys.argv = ["check_data.py", "--help"]',
+        'try:',
+        '    runpy.run_path("check_data.py", run_name="__main__")',
+        'except SystemExit:',
+        '    pass'])
+    loaded = get_heavy_modules_loaded(code)
+    assert loaded == [], 'heavy modules imported by check_data.py --help: {}'.format(loaded)
+
+def test_check_data_help_time():
+
+    start_time = time.time()
+    subprocess.run(
+        [sys.executable, 'check_data.py', '--help'], cwd=repo_dir, capture_output=True, check=True)
+    end_time = time.time()
+    assert end_time - start_time <= time_budget, 'check_data.py --help time: {}, budget: {}'.format(
+        end_time - start_time, time_budget)
+
+if __name__ == '__main__':
+
+    test_startup_modules_do_not_import_heavy_modules()
+    test_check_data_help_does_not_import_heavy_modules()
+    test_check_data_help_time()
+    print('pass')